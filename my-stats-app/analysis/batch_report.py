@@ -0,0 +1,82 @@
+import argparse
+import json
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.image as mpimg
+from matplotlib.backends.backend_pdf import PdfPages
+from stats_loader import load_stats_code
+
+##############################################################################
+#     MANY TESTS INTO ONE MULTI-PAGE PDF OR ONE TILED IMAGE
+##############################################################################
+# A spec is {"test": "<TESTS name>", "params": {...}}. Figures come from the
+# unwrapped test functions (same names as the TESTS keys), so nothing goes
+# through the PNG/base64 step; each page is written to the PDF as soon as
+# it is drawn. The figures are plain Figure + FigureCanvasAgg objects that
+# pyplot does not track, so each is cleared once written rather than closed.
+
+
+def load_specs(path):
+    with open(path) as f:
+        text = f.read().strip()
+    if text.startswith('['):
+        return json.loads(text)
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+def _figures(specs):
+    sc = load_stats_code()
+    for spec in specs:
+        name = spec['test']
+        if name not in sc.TESTS:
+            raise ValueError(f'Unknown test {name!r}.')
+        fig, _, _ = getattr(sc, name)(**spec.get('params', {}))
+        yield fig
+
+
+def render_pdf(specs, out_path, title='Hypothesis Test Report'):
+    pages = 0
+    with PdfPages(out_path, metadata={'Title': title}) as pdf:
+        for fig in _figures(specs):
+            pdf.savefig(fig)
+            fig.clear()
+            pages += 1
+    return pages
+
+
+def render_grid(specs, out_path, cols=2, dpi=100):
+    specs = list(specs)
+    rows = -(-len(specs) // cols)
+    grid = None
+    for i, fig in enumerate(_figures(specs)):
+        fig.set_dpi(dpi)
+        fig.canvas.draw()
+        tile = np.array(fig.canvas.buffer_rgba())
+        fig.clear()
+        if grid is None:
+            h, w = tile.shape[:2]
+            grid = np.full((rows * h, cols * w, 4), 255, dtype=np.uint8)
+        r, c = divmod(i, cols)
+        th, tw = min(h, tile.shape[0]), min(w, tile.shape[1])
+        grid[r * h:r * h + th, c * w:c * w + tw] = tile[:th, :tw]
+    if grid is not None:
+        mpimg.imsave(out_path, grid)
+    return len(specs)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Render many TESTS into one report.')
+    parser.add_argument('specs', help='JSON list or JSONL file of {"test": ..., "params": {...}}')
+    parser.add_argument('out', help='output .pdf, or an image path with --grid')
+    parser.add_argument('--grid', action='store_true', help='tile the figures into one image')
+    parser.add_argument('--cols', type=int, default=2)
+    parser.add_argument('--dpi', type=int, default=100)
+    args = parser.parse_args()
+
+    specs = load_specs(args.specs)
+    if args.grid:
+        n = render_grid(specs, args.out, cols=args.cols, dpi=args.dpi)
+    else:
+        n = render_pdf(specs, args.out)
+    print(f'Wrote {n} test(s) to {args.out}')
@@ -0,0 +1,204 @@
+import argparse
+import base64
+import csv
+import hashlib
+import io
+import json
+import os
+import sys
+import time
+from multiprocessing import Pool
+
+import matplotlib
+matplotlib.use('Agg')
+from stats_loader import load_stats_code
+from result_store import ResultStore, run_test
+
+##############################################################################
+#     COMMAND-LINE BATCH RUNNER FOR THE TESTS REGISTRY
+##############################################################################
+# Jobs come from a JSONL file ({"test": ..., "params": {...}} or the params
+# inline next to "test") or a CSV file (a "test" column plus one column per
+# parameter; list-valued cells such as observed=[10, 20, 30] are JSON). Each
+# job gets the "id" it was given or a hash of its test and parameters, and
+# one line per finished job is appended to the output as soon as it arrives,
+# so --resume can skip every id already written; it first drops the lines of
+# failed jobs, which are run again, so each id keeps a single line. With --store, jobs already
+# computed (in this or any earlier run) are read back from the result store.
+#
+#     python analysis/batch_run.py jobs.csv results.jsonl --workers 8 --figures figs/
+
+SUMMARY_FIELDS = ['id', 'test', 'statistic', 'df', 'p_value', 'critical_value',
+                  'alpha', 'tail_type', 'reject', 'figure', 'error']
+_figures_dir = None
+_default_alpha = None
+_store = None
+
+
+def _cell(value):
+    value = value.strip()
+    if value == '':
+        return None
+    try:
+        return json.loads(value)
+    except ValueError:
+        return value
+
+
+def _job(record):
+    record = dict(record)
+    test = record.pop('test')
+    job_id = record.pop('id', None)
+    params = record.pop('params', None)
+    if params is None:
+        params = {k: v for k, v in record.items() if v is not None}
+    if job_id in (None, ''):
+        key = json.dumps([test, params], sort_keys=True)
+        job_id = hashlib.sha1(key.encode()).hexdigest()[:16]
+    return {'id': str(job_id), 'test': test, 'params': params}
+
+
+def iter_jobs(path):
+    with open(path, newline='') as f:
+        if path.endswith('.csv'):
+            for row in csv.DictReader(f):
+                yield _job({k: _cell(v) if k not in ('test', 'id') else v for k, v in row.items()})
+        else:
+            for line in f:
+                if line.strip():
+                    yield _job(json.loads(line))
+
+
+def _read_rows(out_path):
+    # a run killed mid-write can leave a partial last line; it is skipped
+    # (compact then drops it from the file) and that job runs again
+    with open(out_path, newline='') as f:
+        text = f.read()
+    if not text.endswith('\n'):
+        text = text[:text.rfind('\n') + 1]
+    if out_path.endswith('.csv'):
+        return list(csv.DictReader(io.StringIO(text, newline='')))
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+def compact(out_path):
+    # rewrite the output with one line per completed id, dropping the lines
+    # of failed jobs so their retries do not leave a second line behind;
+    # returns the completed ids
+    if not os.path.exists(out_path):
+        return set()
+    root, ext = os.path.splitext(out_path)
+    done, tmp = set(), f'{root}.compact{ext}'
+    writer = _Writer(tmp, append=False)
+    try:
+        for row in _read_rows(out_path):
+            if not row.get('error') and row['id'] not in done:
+                done.add(row['id'])
+                writer.write(row)
+    finally:
+        writer.close()
+    os.replace(tmp, out_path)
+    return done
+
+
+def _init_worker(figures_dir, memory_ceiling, default_alpha=None, store_path=None):
+    global _figures_dir, _default_alpha, _store
+    _figures_dir = figures_dir
+    _default_alpha = default_alpha
+    _store = ResultStore(store_path) if store_path else None
+    sc = load_stats_code()
+    sc.set_memory_ceiling(memory_ceiling)
+
+
+def run_job(job):
+    sc = load_stats_code()
+    out = {'id': job['id'], 'test': job['test']}
+    try:
+        if job['test'] not in sc.TEST_STATS:
+            raise ValueError(f'Unknown test {job["test"]!r}.')
+        params = dict(job['params'])
+        if _default_alpha is not None:
+            params.setdefault('alpha', _default_alpha)
+        res = run_test(job['test'], params, render=bool(_figures_dir), store=_store)
+        out.update(res['result'])
+        if _figures_dir:
+            path = os.path.join(_figures_dir, f'{job["id"]}_{job["test"]}.png')
+            with open(path, 'wb') as f:
+                f.write(base64.b64decode(res['image']))
+            out['figure'] = path
+    except Exception as e:
+        out['error'] = f'{type(e).__name__}: {e}'
+    return out
+
+
+class _Writer:
+    def __init__(self, path, append):
+        new = not (append and os.path.exists(path) and os.path.getsize(path) > 0)
+        self.f = open(path, 'a' if append else 'w', newline='')
+        self.csv = None
+        if path.endswith('.csv'):
+            self.csv = csv.DictWriter(self.f, SUMMARY_FIELDS, extrasaction='ignore')
+            if new:
+                self.csv.writeheader()
+
+    def write(self, row):
+        if self.csv:
+            self.csv.writerow({k: row.get(k) for k in SUMMARY_FIELDS})
+        else:
+            self.f.write(json.dumps(row) + '\n')
+        self.f.flush()
+
+    def close(self):
+        self.f.close()
+
+
+def run(jobs_path, out_path, workers=1, figures_dir=None, resume=False,
+        memory_ceiling=None, alpha=None, chunksize=4, progress_every=100, store=None):
+    if figures_dir:
+        os.makedirs(figures_dir, exist_ok=True)
+    done = compact(out_path) if resume else set()
+    jobs = (job for job in iter_jobs(jobs_path) if job['id'] not in done)
+    writer = _Writer(out_path, append=resume)
+    counts = {'ok': 0, 'error': 0, 'skipped': len(done)}
+    start = time.perf_counter()
+
+    def record(row):
+        writer.write(row)
+        counts['error' if row.get('error') else 'ok'] += 1
+        n = counts['ok'] + counts['error']
+        if progress_every and n % progress_every == 0:
+            rate = n / (time.perf_counter() - start)
+            print(f'{n} jobs ({rate:.1f}/s)', file=sys.stderr)
+
+    try:
+        if workers <= 1:
+            _init_worker(figures_dir, memory_ceiling, alpha, store)
+            for job in jobs:
+                record(run_job(job))
+        else:
+            with Pool(workers, initializer=_init_worker,
+                      initargs=(figures_dir, memory_ceiling, alpha, store)) as pool:
+                for row in pool.imap_unordered(run_job, jobs, chunksize=chunksize):
+                    record(row)
+    finally:
+        writer.close()
+    return counts
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Run TESTS jobs from a CSV or JSONL file.')
+    parser.add_argument('jobs', help='.csv or .jsonl file of test jobs')
+    parser.add_argument('out', help='results file: .csv for the summary columns, otherwise JSONL')
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--figures', metavar='DIR', help='also render each job to DIR/<id>_<test>.png')
+    parser.add_argument('--resume', action='store_true', help='skip jobs already written to OUT')
+    parser.add_argument('--alpha', type=float, default=None, help='alpha for jobs that do not set one')
+    parser.add_argument('--memory-ceiling', type=int, default=None, metavar='MB')
+    parser.add_argument('--chunksize', type=int, default=4)
+    parser.add_argument('--store', metavar='PATH', help='reuse and keep results in this result store')
+    args = parser.parse_args()
+
+    counts = run(args.jobs, args.out, workers=args.workers, figures_dir=args.figures,
+                 resume=args.resume, memory_ceiling=args.memory_ceiling, alpha=args.alpha,
+                 chunksize=args.chunksize, store=args.store)
+    print(f'{counts["ok"]} ok, {counts["error"]} failed, {counts["skipped"]} skipped -> {args.out}')
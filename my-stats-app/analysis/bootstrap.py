@@ -0,0 +1,125 @@
+import functools
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+##############################################################################
+#     VECTORIZED BOOTSTRAP OF SLOPE, INTERCEPT AND r FOR MANY COLUMN PAIRS
+##############################################################################
+# Every replicate resamples whole rows, so one set of resampled row indices
+# serves all pairs. A block of replicates is turned into a count matrix
+# W (replicates x rows, W[b, k] = times row k was drawn), and per pair the
+# columns [m, m*x, m*y, m*x^2, m*y^2, m*x*y] (m = both present and kept) are
+# stacked side by side into Z, so one product W @ Z gives the six weighted
+# sums for every replicate and every pair. slope, intercept and r follow from
+# those sums exactly as in a least-squares fit.
+#
+# Blocks get their own child of one SeedSequence, so the result depends only
+# on the seed, never on how blocks are spread over worker processes.
+
+BLOCK = 1000
+
+
+@functools.lru_cache(maxsize=None)
+def code_version():
+    # content hash of this file, for result-store specs of bootstrap tables
+    with open(os.path.abspath(__file__), 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()[:16]
+
+
+def _design(data, pairs, masks=None):
+    cols = []
+    for pair in pairs:
+        x, y = (np.asarray(data[c], dtype=float) for c in pair)
+        m = ~(np.isnan(x) | np.isnan(y))
+        if masks is not None and pair in masks:
+            m &= np.asarray(masks[pair], dtype=bool)
+        x, y = np.where(m, x, 0.0), np.where(m, y, 0.0)
+        m = m.astype(float)
+        cols.append(np.column_stack([m, x, y, x * x, y * y, x * y]))
+    return np.hstack(cols)
+
+
+def _fit(sums):
+    # sums[..., 6] -> slope, intercept, r (NaN where x or y has no spread)
+    n, sx, sy, sxx, syy, sxy = np.moveaxis(sums, -1, 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        vx = n * sxx - sx * sx
+        vy = n * syy - sy * sy
+        cov = n * sxy - sx * sy
+        slope = cov / vx
+        intercept = (sy - slope * sx) / n
+        r = np.clip(cov / np.sqrt(vx * vy), -1.0, 1.0)
+    ok = (vx > 1e-12 * n * n) & (vy > 1e-12 * n * n) & (n >= 3)
+    return np.stack([np.where(ok, slope, np.nan), np.where(ok, intercept, np.nan),
+                     np.where(ok, r, np.nan)], axis=-1)
+
+
+def _replicate_block(Z, reps, seed):
+    rng = np.random.default_rng(seed)
+    n_rows = Z.shape[0]
+    idx = rng.integers(0, n_rows, size=(reps, n_rows))
+    W = np.bincount((idx + n_rows * np.arange(reps)[:, None]).ravel(),
+                    minlength=reps * n_rows).reshape(reps, n_rows).astype(float)
+    return _fit((W @ Z).reshape(reps, -1, 6))
+
+
+def bootstrap_replicates(data, pairs, reps=10000, seed=0, masks=None, workers=1, block=BLOCK):
+    # (reps, pairs, 3) array of slope, intercept, r
+    Z = _design(data, pairs, masks)
+    sizes = [min(block, reps - start) for start in range(0, reps, block)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    if workers == 1 or len(sizes) == 1:
+        parts = [_replicate_block(Z, size, s) for size, s in zip(sizes, seeds)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(_replicate_block, [Z] * len(sizes), sizes, seeds))
+    return np.concatenate(parts), _fit(Z.sum(axis=0).reshape(-1, 6)), Z[:, ::6].sum(axis=0)
+
+
+def bootstrap_pairs(data, pairs, reps=10000, alpha=0.05, seed=0, masks=None, workers=1):
+    # one row per (x, y) pair: estimate, bootstrap SE and percentile interval
+    # for slope, intercept, r and R^2
+    pairs = [tuple(p) for p in pairs]
+    boot, point, n = bootstrap_replicates(data, pairs, reps, seed, masks, workers)
+    boot = np.concatenate([boot, boot[..., 2:3] ** 2], axis=-1)
+    point = np.concatenate([point, point[:, 2:3] ** 2], axis=-1)
+    with np.errstate(invalid='ignore'):
+        lo, hi = np.nanpercentile(boot, [100 * alpha / 2, 100 * (1 - alpha / 2)], axis=0)
+        se = np.nanstd(boot, axis=0, ddof=1)
+    table = {'x': [p[0] for p in pairs], 'y': [p[1] for p in pairs], 'n': n.astype(int)}
+    for i, stat in enumerate(('slope', 'intercept', 'r', 'r2')):
+        table[stat] = point[:, i]
+        table[f'{stat}_se'] = se[:, i]
+        table[f'{stat}_low'] = lo[:, i]
+        table[f'{stat}_high'] = hi[:, i]
+    table['valid_reps'] = np.sum(~np.isnan(boot[..., 0]), axis=0)
+    return pd.DataFrame(table).set_index(['x', 'y'])
+
+
+def ci_text(row, stat, digits=2):
+    return f'[{row[f"{stat}_low"]:.{digits}f}, {row[f"{stat}_high"]:.{digits}f}]'
+
+
+if __name__ == '__main__':
+    import argparse
+    import itertools
+    import time
+
+    parser = argparse.ArgumentParser(description='Bootstrap slope/intercept/r for every numeric column pair.')
+    parser.add_argument('csv', nargs='?', default='public/survey.csv')
+    parser.add_argument('--reps', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    num = pd.read_csv(args.csv).apply(pd.to_numeric, errors='coerce').select_dtypes('number')
+    num = num.loc[:, num.std() > 0]
+    pairs = list(itertools.combinations(num.columns, 2))
+    t0 = time.perf_counter()
+    table = bootstrap_pairs(num, pairs, args.reps, seed=args.seed, workers=args.workers)
+    print(f'{len(pairs)} pairs x {args.reps} replicates in {time.perf_counter() - t0:.1f}s')
+    print(table[['n', 'slope', 'slope_low', 'slope_high', 'r', 'r_low', 'r_high']].head(15).to_string())
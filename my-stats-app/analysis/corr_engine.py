@@ -0,0 +1,184 @@
+import hashlib
+import numpy as np
+import pandas as pd
+from scipy.stats import t as t_dist, norm, rankdata
+
+##############################################################################
+#     PAIRWISE-COMPLETE CORRELATION MATRICES WITH SIGNIFICANCE
+##############################################################################
+# Every matrix is derived from the same pairwise-complete co-moments:
+#   n   = M'M          (rows where both columns are present)
+#   sx  = X0'M         (sum of column i over rows where j is present)
+#   sxx = (X0*X0)'M
+#   sxy = X0'X0
+# with M the not-NaN mask and X0 the data with NaN filled by 0, so a whole
+# matrix costs a handful of matrix products instead of a per-cell loop.
+
+_cache = {}
+
+
+def dataset_key(df):
+    h = hashlib.sha1()
+    h.update('\x1f'.join(map(str, df.columns)).encode())
+    h.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    return h.hexdigest()
+
+
+def comoments(X):
+    X = np.asarray(X, dtype=float)
+    M = (~np.isnan(X)).astype(float)
+    X0 = np.where(M > 0, X, 0.0)
+    n = M.T @ M
+    sx = X0.T @ M
+    sxx = (X0 * X0).T @ M
+    sxy = X0.T @ X0
+    return n, sx, sxx, sxy
+
+
+def corr_from_moments(n, sx, sxx, sxy):
+    # sx[..., i, j] is the sum of column i over the rows shared with j, so the
+    # partner sums are the transpose over the last two axes
+    sy = np.swapaxes(sx, -1, -2)
+    syy = np.swapaxes(sxx, -1, -2)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cov = n * sxy - sx * sy
+        vx = n * sxx - sx * sx
+        vy = n * syy - sy * sy
+        r = cov / np.sqrt(vx * vy)
+    r = np.where((vx > 0) & (vy > 0) & (n >= 2), r, np.nan)
+    return np.clip(r, -1.0, 1.0)
+
+
+def corr_pvalues(r, n):
+    dof = n - 2
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t_stat = r * np.sqrt(dof / (1 - r * r))
+        p = 2 * t_dist.sf(np.abs(t_stat), dof)
+    p = np.where(np.abs(r) >= 1, 0.0, p)
+    return np.where(dof > 0, p, np.nan)
+
+
+def fisher_ci(r, n, alpha=0.05, method='pearson'):
+    # Spearman uses the Fieller et al. (1957) variance 1.06 / (n - 3)
+    var = 1.06 if method == 'spearman' else 1.0
+    z_crit = norm.ppf(1 - alpha / 2)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        z = np.arctanh(np.clip(r, -1 + 1e-12, 1 - 1e-12))
+        se = np.sqrt(var / (n - 3))
+        lo, hi = np.tanh(z - z_crit * se), np.tanh(z + z_crit * se)
+    ok = n > 3
+    return np.where(ok, lo, np.nan), np.where(ok, hi, np.nan)
+
+
+def adjust_pvalue_batches(P, method='fdr_bh'):
+    # each row of P is one family of tests; NaN marks a missing test and
+    # does not count towards that row's m
+    P = np.atleast_2d(np.asarray(P, dtype=float))
+    if method in (None, 'none'):
+        return P.copy()
+    missing = np.isnan(P)
+    m = (~missing).sum(1, keepdims=True)
+    order = np.argsort(P, axis=1)  # NaN sorts last
+    ps = np.take_along_axis(P, order, 1)
+    k = np.arange(1, P.shape[1] + 1)
+    with np.errstate(invalid='ignore'):
+        if method == 'bonferroni':
+            adj = ps * m
+        elif method == 'holm':
+            adj = np.fmax.accumulate((m - k + 1) * ps, axis=1)
+        elif method == 'fdr_bh':
+            adj = np.fmin.accumulate((ps * m / k)[:, ::-1], axis=1)[:, ::-1]
+        else:
+            raise ValueError("method must be 'bonferroni', 'holm', 'fdr_bh' or 'none'.")
+    adj = np.minimum(adj, 1.0)
+    adj[np.isnan(ps)] = np.nan
+    out = np.empty_like(adj)
+    np.put_along_axis(out, order, adj, 1)
+    return out
+
+
+def adjust_pvalues(p, method='fdr_bh'):
+    p = np.asarray(p, dtype=float)
+    if p.size == 0:
+        return np.full(p.shape, np.nan)
+    return adjust_pvalue_batches(p.reshape(1, -1), method).reshape(p.shape)
+
+
+def _rank_columns(X):
+    R = np.full(X.shape, np.nan)
+    for j in range(X.shape[1]):
+        ok = ~np.isnan(X[:, j])
+        R[ok, j] = rankdata(X[ok, j])
+    return R
+
+
+def _spearman(X):
+    # Ranking every column once is exact for pairs that share the same
+    # missing rows; only pairs with differing masks are re-ranked on their
+    # common rows.
+    R = _rank_columns(X)
+    r = corr_from_moments(*comoments(R))
+    M = ~np.isnan(X)
+    Mf = M.astype(float)
+    differ = (Mf.T @ (1 - Mf)) + ((1 - Mf).T @ Mf) > 0
+    for i, j in zip(*np.nonzero(np.triu(differ, 1))):
+        both = M[:, i] & M[:, j]
+        if both.sum() < 2:
+            continue
+        ri, rj = rankdata(X[both, i]), rankdata(X[both, j])
+        r[i, j] = r[j, i] = np.corrcoef(ri, rj)[0, 1]
+    return r
+
+
+def corr_result(cols, r, n, method, alpha, correction):
+    np.fill_diagonal(r, np.where(np.diag(n) >= 2, 1.0, np.nan))
+
+    p = corr_pvalues(r, n)
+    np.fill_diagonal(p, np.nan)
+    lo, hi = fisher_ci(r, n, alpha, method)
+
+    # correct over the distinct off-diagonal pairs only
+    iu = np.triu_indices(len(cols), 1)
+    p_adj = np.full(p.shape, np.nan)
+    p_adj[iu] = adjust_pvalues(p[iu], correction)
+    p_adj.T[iu] = p_adj[iu]
+
+    frame = lambda a: pd.DataFrame(a, index=cols, columns=cols)
+    return {
+        'r': frame(r), 'n': frame(n.astype(int)), 'p': frame(p),
+        'p_adj': frame(p_adj), 'ci_low': frame(lo), 'ci_high': frame(hi),
+        'method': method, 'alpha': alpha, 'correction': correction,
+    }
+
+
+def corr_matrices_from_moments(cols, moments, alpha=0.05, correction='fdr_bh'):
+    # Pearson matrices from (n, sx, sxx, sxy); co-moments of disjoint row sets
+    # add, so merged partial moments give the matrices of their union
+    n = moments[0]
+    return corr_result(list(cols), corr_from_moments(*moments), n, 'pearson', alpha, correction)
+
+
+def corr_matrices(df, cols=None, method='pearson', alpha=0.05, correction='fdr_bh'):
+    cols = list(df.columns) if cols is None else list(cols)
+    sub = df[cols].apply(pd.to_numeric, errors='coerce')
+    key = (dataset_key(sub), method, alpha, correction)
+    if key in _cache:
+        return _cache[key]
+
+    X = sub.to_numpy(dtype=float)
+    if method == 'pearson':
+        res = corr_matrices_from_moments(cols, comoments(X), alpha, correction)
+    elif method == 'spearman':
+        res = corr_result(cols, _spearman(X), comoments(X)[0], method, alpha, correction)
+    else:
+        raise ValueError("method must be 'pearson' or 'spearman'.")
+    _cache[key] = res
+    return res
+
+
+def significance_marks(p, levels=(0.05, 0.01, 0.001)):
+    p = np.asarray(p, dtype=float)
+    marks = np.full(p.shape, '', dtype=object)
+    for i, lvl in enumerate(levels, 1):
+        marks[p < lvl] = '*' * i
+    return marks
@@ -0,0 +1,149 @@
+import argparse
+import json
+import os
+import numpy as np
+from scipy.stats import norm, t, chi2
+
+##############################################################################
+#     PRECOMPUTED CRITICAL-VALUE TABLES (PYTHON + FRONTEND)
+##############################################################################
+# Upper-tail quantiles ppf(1 - a) of z, t and chi-square over a dense alpha
+# grid, written to public/critical_values.json so the React forms can show
+# critical values (src/lib/criticalValues.ts) before Pyodide has loaded.
+#
+# Every row is interpolated against the z row rather than against alpha (t and
+# chi-square quantiles are close to linear in z_alpha); t rows interpolate in
+# 1/df, in asinh space, towards the z row (df = inf) and chi-square rows in
+# df, falling back to Wilson-Hilferty beyond the last tabulated df. Tail
+# probabilities invert the same rows and map back through the normal tail.
+
+TABLES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                           '..', 'public', 'critical_values.json')
+SIG_DIGITS = 6
+
+ALPHAS = np.unique(np.round(np.concatenate([
+    np.geomspace(1e-4, 0.5, 90),
+    [0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.15, 0.2, 0.25],
+]), 8))
+# fractional small df show up as Welch df for tiny samples, where t tails
+# change fastest
+T_DFS = np.array([1, 1.25, 1.5, 1.75, 2, 2.25, 2.5, 2.75, 3, 3.5, 4, 4.5]
+                 + list(range(5, 31)) + list(range(32, 62, 2)) + list(range(70, 110, 10))
+                 + [120, 150, 200, 300, 500, 1000])
+CHI2_DFS = np.array(list(range(1, 51)) + list(range(55, 105, 5)))
+
+
+def _round(a):
+    return [float(f'{v:.{SIG_DIGITS}g}') for v in np.ravel(a)]
+
+
+def build_tables():
+    q = 1 - ALPHAS
+    return {
+        'alphas': _round(ALPHAS),
+        'z': _round(norm.ppf(q)),
+        't': {'df': _round(T_DFS),
+              'upper': [_round(row) for row in t.ppf(q[None, :], T_DFS[:, None])]},
+        'chi2': {'df': CHI2_DFS.tolist(),
+                 'upper': [_round(row) for row in chi2.ppf(q[None, :], CHI2_DFS[:, None])]},
+    }
+
+
+def write_tables(path=TABLES_PATH):
+    with open(path, 'w') as f:
+        json.dump(build_tables(), f, separators=(',', ':'))
+    return path
+
+
+class CriticalTables:
+    def __init__(self, tables=None, path=TABLES_PATH):
+        if tables is None:
+            with open(path) as f:
+                tables = json.load(f)
+        self.z = np.asarray(tables['z'])
+        self.t_inv_df = 1.0 / np.asarray(tables['t']['df'], dtype=float)
+        self.t = np.asarray(tables['t']['upper'])
+        self.chi2_df = np.asarray(tables['chi2']['df'], dtype=float)
+        self.chi2 = np.asarray(tables['chi2']['upper'])
+
+    def _row(self, dist, df=None):
+        # upper-tail quantiles for every tabulated alpha at this df
+        if dist == 'z' or (dist == 't' and (df is None or np.isinf(df))):
+            return self.z
+        if dist == 't':
+            # rows ordered by decreasing 1/df; z is the 1/df = 0 end
+            x = np.append(self.t_inv_df, 0.0)[::-1]
+            rows = np.arcsinh(np.vstack([self.t, self.z])[::-1])
+            return np.sinh(_interp_rows(1.0 / df, x, rows))
+        if dist == 'chi2':
+            if df > self.chi2_df[-1]:
+                return _wilson_hilferty(df, self.z)
+            return _interp_rows(df, self.chi2_df, self.chi2)
+        raise ValueError("dist must be 'z', 't' or 'chi2'.")
+
+    def upper(self, dist, alpha, df=None):
+        row = self._row(dist, df)
+        return np.interp(norm.isf(alpha), self.z[::-1], row[::-1])
+
+    def critical(self, dist, alpha, tail_type=3, df=None):
+        # same convention as _tail_result in stats_code.py; the chi-square
+        # tests are right-tailed and only upper quantiles are tabulated
+        if tail_type == 1:
+            if dist == 'chi2':
+                raise ValueError('chi-square critical values are right-tailed only (tail_type 2 or 3).')
+            return -self.upper(dist, alpha, df)
+        if tail_type == 2 or dist == 'chi2':
+            return self.upper(dist, alpha, df)
+        return self.upper(dist, np.asarray(alpha) / 2, df)
+
+    def tail_probability(self, dist, stat, df=None):
+        # P(X > stat); clipped to the alpha grid at the extremes
+        row = self._row(dist, df)
+        stat = np.asarray(stat, dtype=float)
+        if dist != 'chi2':
+            p = norm.sf(np.interp(np.abs(stat), row[::-1], self.z[::-1]))
+            return np.where(stat < 0, 1 - p, p)
+        return norm.sf(np.interp(stat, row[::-1], self.z[::-1]))
+
+
+def _interp_rows(x, xs, rows):
+    i = np.clip(np.searchsorted(xs, x) - 1, 0, len(xs) - 2)
+    w = np.clip((x - xs[i]) / (xs[i + 1] - xs[i]), 0.0, 1.0)
+    return rows[i] * (1 - w) + rows[i + 1] * w
+
+
+def _wilson_hilferty(df, z):
+    return df * (1 - 2 / (9 * df) + z * np.sqrt(2 / (9 * df)))**3
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Write the critical-value tables used by the frontend.')
+    parser.add_argument('--out', default=TABLES_PATH)
+    parser.add_argument('--check', action='store_true', help='report interpolation error against scipy')
+    args = parser.parse_args()
+
+    path = write_tables(args.out)
+    print(f'Wrote {path} ({os.path.getsize(path) // 1024} KiB)')
+    if args.check:
+        ct = CriticalTables(path=path)
+        alphas = np.geomspace(2e-4, 0.4, 200)
+        worst = {}
+        for df in [1, 1.6, 2.5, 7, 31, 45, 65, 85, 110, 250, 700, 5000]:
+            ref = t.ppf(1 - alphas, df)
+            worst[f't df={df} (rel)'] = np.max(np.abs(ct.upper('t', alphas, df) - ref) / ref)
+        for df in [1, 3, 17, 52, 73, 99, 150, 400]:
+            err = np.abs(ct.upper('chi2', alphas, df) - chi2.ppf(1 - alphas, df)) / chi2.ppf(1 - alphas, df)
+            worst[f'chi2 df={df} (rel)'] = np.max(err)
+        for df in [3, 40, 150]:
+            stats = t.isf(alphas, df)
+            worst[f't p df={df} (rel)'] = np.max(np.abs(ct.tail_probability('t', stats, df) - alphas) / alphas)
+        for name, err in worst.items():
+            print(f'{name:>20}: {err:.2e}')
+        for tail_type in (2, 3):
+            err = abs(ct.critical('chi2', 0.05, tail_type, df=5) - chi2.isf(0.05, 5)) / chi2.isf(0.05, 5)
+            print(f'{f"chi2 tail_type={tail_type}":>20}: {err:.2e}')
+        try:
+            ct.critical('chi2', 0.05, tail_type=1, df=5)
+            raise AssertionError('chi2 tail_type=1 returned a value instead of raising.')
+        except ValueError:
+            print(f'{"chi2 tail_type=1":>20}: ValueError')
@@ -0,0 +1,162 @@
+import os
+
+import numpy as np
+import pandas as pd
+from corr_engine import corr_matrices
+from sketches import Moments, anova_params
+from stats_loader import load_stats_code
+
+##############################################################################
+#     ONE SURVEY TABLE WITH SOURCE-TAGGED VIEWS
+##############################################################################
+# public/survey.csv holds every response once, with a "source" column
+# (students, residents). Rows are kept grouped by source, so each source is a
+# contiguous row range and every view (students, residents, combined) is a
+# positional slice of the one parsed table rather than a second copy (only
+# columns whose type differs within the view are re-parsed for it).
+#
+# Each source is reduced once per column set to a mergeable Moments sketch,
+# and a view's correlations come from merging its sources' sketches instead
+# of another pass over the rows, and source_anova compares a column across
+# sources from the same sketches.
+#
+#     python analysis/dataset.py --build students=students.csv residents=residents.csv
+#     python analysis/dataset.py --export exports/
+
+SURVEY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'public', 'survey.csv')
+SOURCE_COL = 'source'
+SOURCES = ['students', 'residents']
+VIEWS = {
+    'students': ['students'],
+    'residents': ['residents'],
+    'combined': SOURCES,
+}
+
+
+class Survey:
+    def __init__(self, table, source_col=SOURCE_COL):
+        order = SOURCES + sorted(set(table[source_col].dropna()) - set(SOURCES))
+        codes = pd.Categorical(table[source_col], categories=order).codes
+        if np.any(np.diff(codes) < 0):
+            rows = np.argsort(codes, kind='stable')
+            table, codes = table.iloc[rows].reset_index(drop=True), codes[rows]
+        self.table = table
+        self.source_col = source_col
+        self.sources = [s for i, s in enumerate(order) if np.any(codes == i)]
+        bounds = np.searchsorted(codes, np.arange(len(order) + 1)).tolist()
+        self._bounds = {s: (bounds[i], bounds[i + 1]) for i, s in enumerate(order) if s in self.sources}
+        self._partials = {}
+
+    @classmethod
+    def load(cls, path=SURVEY_PATH):
+        return cls(pd.read_csv(path))
+
+    def _names(self, view):
+        names = VIEWS.get(view, [view]) if isinstance(view, str) else list(view)
+        unknown = [s for s in names if s not in self._bounds]
+        if unknown:
+            raise ValueError(f'Unknown source(s) {unknown}; have {self.sources}.')
+        return names
+
+    def rows(self, view):
+        # a slice when the view's sources are adjacent, else a boolean mask
+        idx = sorted(self.sources.index(s) for s in self._names(view))
+        if idx == list(range(idx[0], idx[-1] + 1)):
+            return slice(self._bounds[self.sources[idx[0]]][0], self._bounds[self.sources[idx[-1]]][1])
+        return self.mask(view)
+
+    def mask(self, view):
+        return self.table[self.source_col].isin(self._names(view)).to_numpy()
+
+    def view(self, view):
+        # typed as the view's own CSV would be read: a column that is only
+        # non-numeric in another source ('-' placeholders) is numeric here
+        part = self.table.iloc[self.rows(view)]
+        parsed = {}
+        for c in part.columns:
+            if c != self.source_col and not pd.api.types.is_numeric_dtype(part[c]):
+                try:
+                    parsed[c] = pd.to_numeric(part[c])
+                except (TypeError, ValueError):
+                    pass
+        return part.assign(**parsed) if parsed else part
+
+    def _partial(self, source, cols):
+        key = (source, tuple(cols))
+        if key not in self._partials:
+            start, stop = self._bounds[source]
+            X = self.table.iloc[start:stop][list(cols)].apply(pd.to_numeric, errors='coerce')
+            self._partials[key] = Moments(cols).update(X)
+        return self._partials[key]
+
+    def moments(self, view, cols):
+        merged = Moments(cols)
+        for s in self._names(view):
+            merged.merge(self._partial(s, cols))
+        return merged
+
+    def corr_matrices(self, view, cols, method='pearson', alpha=0.05, correction='fdr_bh'):
+        # Spearman ranks are not additive, so it is computed on the view itself
+        if method != 'pearson':
+            return corr_matrices(self.view(view), cols, method, alpha, correction)
+        return self.moments(view, cols).corr_matrices(alpha, correction)
+
+    def source_anova(self, col, view='combined', alpha=0.05):
+        # one_way_anova_test of col across the view's sources, from the same
+        # per-source sketches rather than the rows
+        groups = {s: self._partial(s, [col]) for s in self._names(view)}
+        return load_stats_code().TEST_STATS['one_way_anova_test'](alpha, **anova_params(groups, col))
+
+    def export(self, directory, views=('students', 'residents', 'combined')):
+        # one CSV per view in the layout of the original per-source exports
+        os.makedirs(directory, exist_ok=True)
+        paths = []
+        for view in views:
+            path = os.path.join(directory, f'{view}.csv')
+            self.view(view).drop(columns=self.source_col).to_csv(path, index=False)
+            paths.append(path)
+        return paths
+
+
+def build(frames, path=SURVEY_PATH, source_col=SOURCE_COL):
+    # frames: {source: DataFrame read with dtype=str} -> the canonical table,
+    # cells kept as written in the exports
+    table = pd.concat([df.assign(**{source_col: name}) for name, df in frames.items()],
+                      ignore_index=True)
+    table.to_csv(path, index=False)
+    return table
+
+
+_surveys = {}
+
+
+def load_survey(path=SURVEY_PATH):
+    path = os.path.abspath(path)
+    if path not in _surveys:
+        _surveys[path] = Survey.load(path)
+    return _surveys[path]
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Build or export the source-tagged survey table.')
+    parser.add_argument('--build', nargs='+', metavar='SOURCE=CSV',
+                        help='replace public/survey.csv with these per-source exports')
+    parser.add_argument('--export', metavar='DIR', help='write students/residents/combined CSVs to DIR')
+    parser.add_argument('--anova', metavar='COL', help='one-way ANOVA of COL across sources')
+    args = parser.parse_args()
+
+    if args.build:
+        frames = dict(spec.split('=', 1) for spec in args.build)
+        frames = {name: pd.read_csv(p, dtype=str, keep_default_na=False) for name, p in frames.items()}
+        table = build(frames)
+        print(f'{len(table)} rows from {", ".join(frames)} -> {SURVEY_PATH}')
+    survey = load_survey()
+    if args.export:
+        for path in survey.export(args.export):
+            print(path)
+    print({s: int(survey.mask(s).sum()) for s in survey.sources})
+    if args.anova:
+        res = survey.source_anova(args.anova)
+        print(f"ANOVA {args.anova} across sources: F={res['statistic']:.3f}, p={res['p_value']:.4f}")
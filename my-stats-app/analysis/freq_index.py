@@ -0,0 +1,99 @@
+import itertools
+from collections import namedtuple
+import numpy as np
+import pandas as pd
+from scipy.stats import t as t_dist
+from corr_engine import dataset_key
+
+##############################################################################
+#     JOINT FREQUENCY TABLES FOR LOW-CARDINALITY RATING COLUMNS
+##############################################################################
+# Each column is encoded once to level codes; every pair (i, j) gets its own
+# block of k_i * k_j cells, and a single np.bincount over the concatenated
+# pair codes fills all joint tables at once. Frequency-scatter points and
+# weighted regressions are then read straight from the tables.
+
+Regression = namedtuple('Regression', 'slope intercept rvalue pvalue stderr n')
+
+_cache = {}
+
+
+class FreqIndex:
+    def __init__(self, df, cols, max_levels=20):
+        X = df[list(cols)].apply(pd.to_numeric, errors='coerce')
+        self.cols = list(cols)
+        self.levels = {}
+        codes = {}
+        for c in self.cols:
+            v = X[c].to_numpy(dtype=float)
+            ok = ~np.isnan(v)
+            lv, inv = np.unique(v[ok], return_inverse=True)
+            if len(lv) > max_levels:
+                raise ValueError(f"'{c}' has {len(lv)} levels; raise max_levels to index it.")
+            code = np.full(len(v), -1)
+            code[ok] = inv
+            self.levels[c] = lv
+            codes[c] = code
+
+        self.blocks = {}
+        encoded, offset = [], 0
+        for a, b in itertools.combinations(self.cols, 2):
+            ka, kb = len(self.levels[a]), len(self.levels[b])
+            ca, cb = codes[a], codes[b]
+            both = (ca >= 0) & (cb >= 0)
+            encoded.append(offset + ca[both] * kb + cb[both])
+            self.blocks[(a, b)] = (offset, ka, kb)
+            offset += ka * kb
+        flat = np.concatenate(encoded) if encoded else np.empty(0, dtype=int)
+        self.counts = np.bincount(flat, minlength=offset)
+
+    def _block(self, x, y):
+        if (x, y) in self.blocks:
+            off, kx, ky = self.blocks[(x, y)]
+            return self.counts[off:off + kx * ky].reshape(kx, ky)
+        off, ky, kx = self.blocks[(y, x)]
+        return self.counts[off:off + kx * ky].reshape(ky, kx).T
+
+    def table(self, x, y):
+        return pd.DataFrame(self._block(x, y), index=pd.Index(self.levels[x], name=x),
+                            columns=pd.Index(self.levels[y], name=y))
+
+    def points(self, x, y):
+        tab = self._block(x, y)
+        i, j = np.nonzero(tab)
+        return pd.DataFrame({x: self.levels[x][i], y: self.levels[y][j], 'count': tab[i, j]})
+
+    def max_count(self, pairs):
+        return max(int(self._block(x, y).max(initial=0)) for x, y in pairs)
+
+    def regress(self, x, y):
+        w = self._block(x, y).astype(float)
+        xv, yv = self.levels[x][:, None], self.levels[y][None, :]
+        n = w.sum()
+        if n < 2:
+            return Regression(np.nan, np.nan, np.nan, np.nan, np.nan, int(n))
+        mx, my = (w * xv).sum() / n, (w * yv).sum() / n
+        sxx = (w * (xv - mx) ** 2).sum()
+        syy = (w * (yv - my) ** 2).sum()
+        sxy = (w * (xv - mx) * (yv - my)).sum()
+        if sxx <= 0 or syy <= 0:
+            # a constant column has no fitted line or correlation
+            return Regression(np.nan, np.nan, np.nan, np.nan, np.nan, int(n))
+        slope = sxy / sxx
+        intercept = my - slope * mx
+        r = min(max(sxy / np.sqrt(sxx * syy), -1.0), 1.0)
+        dof = n - 2
+        if dof > 0 and abs(r) < 1:
+            t_stat = r * np.sqrt(dof / (1 - r * r))
+            p = 2 * t_dist.sf(abs(t_stat), dof)
+            stderr = np.sqrt((1 - r * r) * syy / sxx / dof)
+        else:
+            p, stderr = (0.0 if dof > 0 else np.nan), 0.0
+        return Regression(slope, intercept, r, p, stderr, int(n))
+
+
+def freq_index(df, cols, max_levels=20):
+    key = (dataset_key(df[list(cols)]), tuple(cols), max_levels)
+    if key not in _cache:
+        _cache[key] = FreqIndex(df, cols, max_levels)
+    return _cache[key]
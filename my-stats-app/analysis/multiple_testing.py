@@ -0,0 +1,88 @@
+import argparse
+import base64
+import os
+import numpy as np
+import pandas as pd
+from stats_loader import load_stats_code
+from corr_engine import adjust_pvalue_batches
+from batch_report import load_specs, render_pdf
+
+##############################################################################
+#     RUN A BATCH OF TESTS, CORRECT FOR MULTIPLICITY, RENDER THE HITS
+##############################################################################
+# A spec is {"test": "<TESTS name>", "params": {...}, "batch": "<family>"};
+# tests sharing a batch (e.g. one survey wave) form one family. Every test is
+# computed with the compute-only TEST_STATS function, the p-values are laid
+# out as a (batch, test) matrix and each correction is one vectorized call
+# over all batches. Only tests that stay significant are rendered.
+
+METHODS = ('bonferroni', 'holm', 'fdr_bh')
+
+
+def run_batch(specs, alpha=0.05, methods=METHODS, decide_by='fdr_bh'):
+    sc = load_stats_code()
+    rows = []
+    for spec in specs:
+        name = spec['test']
+        if name not in sc.TEST_STATS:
+            raise ValueError(f'Unknown test {name!r}.')
+        params = dict(spec.get('params', {}))
+        params.setdefault('alpha', alpha)
+        res = sc.TEST_STATS[name](**params)
+        rows.append({'batch': spec.get('batch', 'all'), 'test': name,
+                     'statistic': res['statistic'], 'df': res['df'],
+                     'p_value': res['p_value'], 'params': params})
+    table = pd.DataFrame(rows, columns=['batch', 'test', 'statistic', 'df', 'p_value', 'params'])
+    if table.empty:
+        return table
+
+    codes, batches = pd.factorize(table['batch'])
+    pos = table.groupby(codes).cumcount().to_numpy()
+    P = np.full((len(batches), pos.max() + 1), np.nan)
+    P[codes, pos] = table['p_value'].to_numpy(dtype=float)
+
+    methods = list(methods)
+    if decide_by not in methods:
+        methods.append(decide_by)
+    for method in methods:
+        table[f'p_{method}'] = adjust_pvalue_batches(P, method)[codes, pos]
+    table['significant'] = table[f'p_{decide_by}'] < alpha
+    return table
+
+
+def significant_specs(table):
+    hits = table[table['significant']]
+    return [{'test': row.test, 'params': row.params} for row in hits.itertuples()]
+
+
+def render_significant(table, out_path):
+    # a .pdf path gets one page per hit, anything else is a directory of PNGs
+    specs = significant_specs(table)
+    if out_path.endswith('.pdf'):
+        return render_pdf(specs, out_path, title='Significant Results')
+    sc = load_stats_code()
+    os.makedirs(out_path, exist_ok=True)
+    for i, spec in zip(table.index[table['significant']], specs):
+        with open(os.path.join(out_path, f'{i:04d}_{spec["test"]}.png'), 'wb') as f:
+            f.write(base64.b64decode(sc.TESTS[spec['test']](**spec['params'])))
+    return len(specs)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Run many TESTS with multiple-testing correction.')
+    parser.add_argument('specs', help='JSON list or JSONL file of {"test": ..., "params": {...}, "batch": ...}')
+    parser.add_argument('--alpha', type=float, default=0.05, help='family-wise / FDR level')
+    parser.add_argument('--by', default='fdr_bh', choices=METHODS + ('none',),
+                        help='correction that decides significance')
+    parser.add_argument('--summary', help='write the summary table to this CSV')
+    parser.add_argument('--render', help='render significant tests to a .pdf or a directory of PNGs')
+    args = parser.parse_args()
+
+    table = run_batch(load_specs(args.specs), alpha=args.alpha, decide_by=args.by)
+    cols = [c for c in table.columns if c != 'params']
+    print(table[cols].to_string())
+    if args.summary:
+        table.to_csv(args.summary, index=False)
+    if args.render:
+        n = render_significant(table, args.render)
+        print(f'Rendered {n} significant test(s) to {args.render}')
@@ -1,19 +1,12 @@
 import os, textwrap, pandas as pd, matplotlib.pyplot as plt
 from scipy.stats import linregress
+from corr_engine import significance_marks
+from dataset import load_survey
 
 datasets = {
-    'students': (
-        'public/students.csv',
-        "Oak Park High School Students:\nSophomore, Junior, Senior of 2024-2025"
-    ),
-    'residents': (
-        'public/residents.csv',
-        "Oak Park Residents"
-    ),
-    'combined': (
-        'public/res+stu.csv',
-        "Combination of Oak Park Residents\nand Oak Park High School Students:\nSophomore, Junior, Senior of 2024-2025"
-    )
+    'students': "Oak Park High School Students:\nSophomore, Junior, Senior of 2024-2025",
+    'residents': "Oak Park Residents",
+    'combined': "Combination of Oak Park Residents\nand Oak Park High School Students:\nSophomore, Junior, Senior of 2024-2025"
 }
 
 heat_cols = [
@@ -53,16 +46,19 @@ q3 = ['Q3: asthma family history','Q3: cancer history','Q3: diabetes history',
       'Q3: heart disease history','Q3: high blood pressure history','Q3: no history','Q3: other history']
 
 os.makedirs('plots', exist_ok=True)
+survey = load_survey()
 
-for key, (csv_path, title) in datasets.items():
-    df = pd.read_csv(csv_path)
-    df.drop(columns=drop_t, inplace=True, errors='ignore')
+corr_mats = {}
+for key, title in datasets.items():
+    df = survey.view(key).drop(columns=drop_t, errors='ignore')
     df['Q2_sum'] = df[q2].sum(axis=1)
     df['Q3_sum'] = df[q3].sum(axis=1)
     df.drop(columns=q2+q3, inplace=True, errors='ignore')
 
-    sub = df[heat_cols].apply(pd.to_numeric, errors='coerce').dropna()
-    corr = sub.corr(method='pearson')
+    # the combined matrix is merged from the per-source moments
+    corr_mats[key] = survey.corr_matrices(key, heat_cols, method='pearson')
+    corr = corr_mats[key]['r']
+    marks = significance_marks(corr_mats[key]['p_adj'].values)
 
     fig, ax = plt.subplots(figsize=(6,6), dpi=300)
     im = ax.imshow(corr, vmin=-1, vmax=1, cmap='RdBu')
@@ -72,7 +68,7 @@ for key, (csv_path, title) in datasets.items():
     ax.set_yticklabels([textwrap.fill(labels[c],20) for c in heat_cols], fontsize=8)
     for i in range(4):
         for j in range(4):
-            ax.text(j, i, f'{corr.iat[i,j]:.2f}', ha='center', va='center', fontsize=8)
+            ax.text(j, i, f'{corr.iat[i,j]:.2f}{marks[i,j]}', ha='center', va='center', fontsize=8)
     fig.suptitle(title, fontsize=10, y=0.92)
     plt.subplots_adjust(top=0.90, left=0.22, right=0.78)
     cbar = fig.colorbar(im, ax=ax, fraction=0.046, pad=0.04)
@@ -105,29 +101,11 @@ for key, (csv_path, title) in datasets.items():
                 bbox_inches='tight', dpi=300)
     plt.close(fig)
 
-corr_mats = {}
-for key, (csv_path, _) in datasets.items():
-    df_tmp = pd.read_csv(csv_path)
-    df_tmp.drop(columns=drop_t, inplace=True, errors='ignore')
-    df_tmp['Q2_sum'] = df_tmp[q2].sum(axis=1)
-    df_tmp['Q3_sum'] = df_tmp[q3].sum(axis=1)
-    df_tmp.drop(columns=q2+q3, inplace=True, errors='ignore')
-    corr_mats[key] = (
-        df_tmp[heat_cols]
-        .apply(pd.to_numeric, errors='coerce')
-        .dropna()
-        .corr(method='pearson')
-    )
-
-
-
-
-
-
 fig, axes = plt.subplots(1, 3, figsize=(30, 8), dpi=300)
 
-for ax, (key, (_, ttl)) in zip(axes, datasets.items()):
-    m = corr_mats[key]
+for ax, (key, ttl) in zip(axes, datasets.items()):
+    m = corr_mats[key]['r']
+    marks = significance_marks(corr_mats[key]['p_adj'].values)
     im = ax.imshow(m, vmin=-1, vmax=1, cmap='RdBu')
     ax.set_xticks(range(4)); ax.set_yticks(range(4))
     ax.set_xticklabels([textwrap.fill(labels[c], 20) for c in heat_cols],
@@ -136,7 +114,7 @@ for ax, (key, (_, ttl)) in zip(axes, datasets.items()):
                        fontsize=10)
     for i in range(4):
         for j in range(4):
-            ax.text(j, i, f'{m.iat[i, j]:.2f}',
+            ax.text(j, i, f'{m.iat[i, j]:.2f}{marks[i, j]}',
                     ha='center', va='center', fontsize=12)
     ax.set_title(ttl, fontsize=10, pad=12)
 
@@ -1,12 +1,11 @@
 import os, textwrap, pandas as pd, matplotlib.pyplot as plt, numpy as np
-from scipy.stats import linregress
 from matplotlib import cm, colors
+from freq_index import freq_index
+from dataset import load_survey
 
 datasets = {
-    'students': ('public/students.csv',
-                 "Oak Park High School Students: Sophomore, Junior, Senior of 2024-2025"),
-    'residents': ('public/residents.csv',
-                  "Oak Park Residents")
+    'students': "Oak Park High School Students: Sophomore, Junior, Senior of 2024-2025",
+    'residents': "Oak Park Residents"
 }
 
 drop_t = ['Q17t: Q1 other','Q27t: others','Q37t: other']
@@ -21,6 +20,8 @@ comparisons = [
     ('Q16: rate diet',    'Q17: rate sleep', cm.Greens)
 ]
 
+rating_cols = ['Q15: rate exercise', 'Q16: rate diet', 'Q17: rate sleep', 'Q18: rate healthiness']
+
 labels = {
     'Q15: rate exercise': 'Rated Effect of Regular\nExercise on Health',
     'Q16: rate diet':     'Rated Effect of Balanced\nDiet on Health',
@@ -38,27 +39,24 @@ def trim(cmap):
     return trimmed
 
 os.makedirs('plots', exist_ok=True)
+survey = load_survey()
 
-for key, (csv_path, title) in datasets.items():
-    df = pd.read_csv(csv_path)
-    df.drop(columns=drop_t, inplace=True, errors='ignore')
+for key, title in datasets.items():
+    df = survey.view(key).drop(columns=drop_t, errors='ignore')
     df['Q2_sum'] = df[q2].sum(axis=1)
     df['Q3_sum'] = df[q3].sum(axis=1)
     df.drop(columns=q2+q3, inplace=True, errors='ignore')
     df = df.apply(pd.to_numeric, errors='coerce')
 
     # shared max frequency for consistent colour scale
-    freq_tables, maxfreq = {}, 0
-    for xcol, ycol, _ in comparisons:
-        f = df[[xcol, ycol]].dropna().groupby([xcol, ycol]).size()
-        freq_tables[(xcol, ycol)] = f
-        maxfreq = max(maxfreq, f.max())
+    idx = freq_index(df, rating_cols)
+    maxfreq = idx.max_count([(xcol, ycol) for xcol, ycol, _ in comparisons])
 
     fig, axes = plt.subplots(1, 3, figsize=(18, 4), dpi=300)
     for ax, (xcol, ycol, base_cmap) in zip(axes, comparisons):
-        freq = freq_tables[(xcol, ycol)].reset_index(name='count')
+        freq = idx.points(xcol, ycol)
         x, y, cnt = freq[xcol], freq[ycol], freq['count']
-        res = linregress(df[xcol].dropna(), df[ycol].dropna())
+        res = idx.regress(xcol, ycol)
         cmap_use = trim(base_cmap)
         sc = ax.scatter(x, y, s=30, c=cnt, cmap=cmap_use,
                         vmin=1, vmax=maxfreq)
@@ -1,12 +1,12 @@
 import os, textwrap, pandas as pd, matplotlib.pyplot as plt, numpy as np
-from scipy.stats import linregress
 from matplotlib import cm, colors
+from freq_index import freq_index
+from dataset import load_survey
+from bootstrap import bootstrap_pairs, ci_text
 
 datasets = {
-    'students': ('public/students.csv',
-                 "Oak Park High School Students: Sophomore, Junior, Senior of 2024-2025"),
-    'residents': ('public/residents.csv',
-                  "Oak Park Residents")
+    'students': "Oak Park High School Students: Sophomore, Junior, Senior of 2024-2025",
+    'residents': "Oak Park Residents"
 }
 
 drop_t = ['Q17t: Q1 other','Q27t: others','Q37t: other']
@@ -21,6 +21,8 @@ comparisons = [
     ('Q16: rate diet',    'Q17: rate sleep', cm.Greens, 'diet_vs_sleep')
 ]
 
+rating_cols = ['Q15: rate exercise', 'Q16: rate diet', 'Q17: rate sleep', 'Q18: rate healthiness']
+
 labels = {
     'Q15: rate exercise': 'Rated Effect of Regular\nExercise on Health',
     'Q16: rate diet':     'Rated Effect of Balanced\nDiet on Health',
@@ -38,29 +40,27 @@ def trim(cmap):
     return trimmed
 
 os.makedirs('plots', exist_ok=True)
+survey = load_survey()
 
-for key, (csv_path, _) in datasets.items():
-    df = pd.read_csv(csv_path)
-    df.drop(columns=drop_t, inplace=True, errors='ignore')
+for key, _ in datasets.items():
+    df = survey.view(key).drop(columns=drop_t, errors='ignore')
     df['Q2_sum'] = df[q2].sum(axis=1)
     df['Q3_sum'] = df[q3].sum(axis=1)
     df.drop(columns=q2+q3, inplace=True, errors='ignore')
     df = df.apply(pd.to_numeric, errors='coerce')
 
     # shared max frequency for consistent scale
-    maxfreq = 0
-    freq_tables = {}
-    for xcol, ycol, _, _ in comparisons:
-        f = df[[xcol, ycol]].dropna().groupby([xcol, ycol]).size()
-        freq_tables[(xcol, ycol)] = f
-        maxfreq = max(maxfreq, f.max())
+    idx = freq_index(df, rating_cols)
+    maxfreq = idx.max_count([(xcol, ycol) for xcol, ycol, _, _ in comparisons])
 
     os.makedirs(f'plots/{key}', exist_ok=True)
+    boot = bootstrap_pairs(df, [(xcol, ycol) for xcol, ycol, _, _ in comparisons],
+                           reps=10000, seed=0)
 
     for xcol, ycol, base_cmap, tag in comparisons:
-        freq = freq_tables[(xcol, ycol)].reset_index(name='count')
+        freq = idx.points(xcol, ycol)
         x, y, cnt = freq[xcol], freq[ycol], freq['count']
-        res = linregress(df[xcol].dropna(), df[ycol].dropna())
+        res = idx.regress(xcol, ycol)
         cmap_use = trim(base_cmap)
 
         fig, ax = plt.subplots(figsize=(6, 4), dpi=300)
@@ -79,8 +79,10 @@ for key, (csv_path, _) in datasets.items():
         cbar.ax.tick_params(labelsize=8)
         cbar.set_label('Frequency', fontsize=10)
 
+        ci = boot.loc[(xcol, ycol)]
         stats_text = (f"ŷ = {res.intercept:.4f} + {res.slope:.4f} x     "
-                    f"r = {res.rvalue:.4f}     R² = {res.rvalue**2:.4f}")
+                    f"r = {res.rvalue:.4f}     R² = {res.rvalue**2:.4f}\n"
+                    f"95% bootstrap CI:  slope {ci_text(ci, 'slope', 4)}     r {ci_text(ci, 'r', 4)}")
         ax.text(0.5, -0.38, stats_text,      # lowered further
                 transform=ax.transAxes,
                 ha='center', va='top', fontsize=10)
@@ -1,7 +1,8 @@
 import os, textwrap, pandas as pd, matplotlib.pyplot as plt, numpy as np
 from scipy.stats import linregress
+from dataset import load_survey
 
-df = pd.read_csv('public/res+stu.csv').apply(pd.to_numeric, errors='coerce') \
+df = load_survey().view('combined').apply(pd.to_numeric, errors='coerce') \
        .dropna(subset=['Q17: rate sleep', 'Q7: sleep hrs'])
 x, y = df['Q17: rate sleep'], df['Q7: sleep hrs']
 res = linregress(x, y)
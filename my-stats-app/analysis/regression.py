@@ -0,0 +1,255 @@
+import numpy as np
+import pandas as pd
+from scipy.linalg import LinAlgError, cho_factor, cho_solve
+from scipy.stats import f as f_dist, t as t_dist
+from sketches import Gram
+
+##############################################################################
+#     BATCHED MULTIPLE REGRESSION WITH CATEGORICAL CONTROLS
+##############################################################################
+# One design matrix X (intercept, numeric predictors and one 0/1 column per
+# non-reference level of each categorical such as GRADE or GENDER) is shared
+# by every outcome column. Outcomes are grouped by which rows they have
+# present, and per group X'X is Cholesky-factored once; the coefficients of
+# all outcomes in the group come from a single cho_solve against X'Y, and the
+# diagonal of (X'X)^-1 from the same factor gives every standard error.
+#
+# For data split over files or processes, regression_gram reduces each shard
+# to one mergeable Gram sketch per outcome (centred cross-products of the
+# design and that outcome over its complete rows) and fit_gram fits the
+# merged sketches.
+#
+#     python analysis/regression.py --predictors "Q6: hrs exercise" \
+#         --categorical GRADE GENDER --outcomes "Q7: sleep hrs"
+
+CATEGORICAL = ('GRADE', 'GENDER')
+
+
+def _level_name(level):
+    if isinstance(level, float) and level.is_integer():
+        level = int(level)
+    return str(level)
+
+
+def design_matrix(data, predictors=(), categorical=CATEGORICAL, levels=None):
+    # X, term names and the rows where every predictor is present; the lowest
+    # level of each categorical is the reference and gets no column. Shards
+    # must share levels ({column: [level, ...]}) to share columns.
+    cols, names = [np.ones(len(data))], ['Intercept']
+    ok = np.ones(len(data), dtype=bool)
+    for c in predictors:
+        x = pd.to_numeric(data[c], errors='coerce').to_numpy(dtype=float)
+        ok &= ~np.isnan(x)
+        cols.append(x)
+        names.append(c)
+    for c in categorical:
+        x = data[c]
+        ok &= x.notna().to_numpy()
+        for level in sorted(levels[c] if levels else x.dropna().unique())[1:]:
+            cols.append((x == level).to_numpy(dtype=float))
+            names.append(f'{c}[{_level_name(level)}]')
+    return np.column_stack(cols), names, ok
+
+
+def _independent_terms(S, tol=1e-9):
+    # S: centred cross-products of the non-intercept terms. Walking from the
+    # last term, keep each one that adds a direction beyond the intercept and
+    # the terms already kept, so a constant column or a categorical with no
+    # rows at its reference level (its dummies then sum to the intercept)
+    # loses a term: the lowest level present becomes the reference.
+    scale = np.sqrt(np.maximum(np.diag(S), 0))
+    kept = []
+    for j in range(len(S) - 1, -1, -1):
+        if scale[j] == 0:
+            continue
+        cand = kept + [j]
+        R = S[np.ix_(cand, cand)] / np.outer(scale[cand], scale[cand])
+        if np.linalg.eigvalsh(R)[0] > tol:
+            kept = cand
+    return np.sort(np.array(kept, dtype=int))
+
+
+def _fit_group(X, Y):
+    # X (n, p), Y (n, m) with no missing values -> coefficients (p, m),
+    # diag((X'X)^-1) (p,) and residual sum of squares (m,)
+    c = cho_factor(X.T @ X)
+    B = cho_solve(c, X.T @ Y)
+    inv_diag = np.diag(cho_solve(c, np.eye(X.shape[1])))
+    resid = Y - X @ B
+    return B, inv_diag, np.einsum('ij,ij->j', resid, resid)
+
+
+def fit_outcomes(data, outcomes, predictors=(), categorical=CATEGORICAL, alpha=0.05):
+    # (coefficients, models): coefficients indexed by (outcome, term) with
+    # coef, se, t, p_value, ci_low, ci_high and reject; models indexed by
+    # outcome with n, df_resid, r2, adj_r2, f_stat, f_p_value and rmse
+    X, names, ok = design_matrix(data, predictors, categorical)
+    outcomes = [c for c in outcomes if c not in predictors and c not in categorical]
+    Y = data[outcomes].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float)
+    present = ~np.isnan(Y) & ok[:, None]
+    patterns, group = np.unique(present.T, axis=0, return_inverse=True)
+    group = np.ravel(group)
+
+    p, m = len(names), len(outcomes)
+    coef = np.full((p, m), np.nan)
+    se = np.full((p, m), np.nan)
+    n = present.sum(axis=0)
+    rss = np.full(m, np.nan)
+    tss = np.full(m, np.nan)
+    k = np.zeros(m, dtype=int)
+    for g, rows in enumerate(patterns):
+        idx = np.flatnonzero(group == g)
+        if not rows.any():
+            continue
+        # terms spanned by the others in this group are left out
+        Xc = X[rows][:, 1:] - X[rows][:, 1:].mean(axis=0)
+        terms = np.concatenate([[0], 1 + _independent_terms(Xc.T @ Xc)])
+        Xg, Yg = X[rows][:, terms], Y[rows][:, idx]
+        if len(Xg) <= len(terms):
+            continue
+        try:
+            B, inv_diag, rss_g = _fit_group(Xg, Yg)
+        except LinAlgError:
+            continue
+        dof = len(Xg) - len(terms)
+        coef[np.ix_(terms, idx)] = B
+        se[np.ix_(terms, idx)] = np.sqrt(np.outer(inv_diag, rss_g / dof))
+        rss[idx] = rss_g
+        tss[idx] = ((Yg - Yg.mean(axis=0)) ** 2).sum(axis=0)
+        k[idx] = len(terms)
+
+    return _tables(outcomes, names, coef, se, n, k, rss, tss, alpha)
+
+
+def _tables(outcomes, names, coef, se, n, k, rss, tss, alpha):
+    dof = np.where(k > 0, n - k, 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t_stat = coef / se
+        p_value = 2 * t_dist.sf(np.abs(t_stat), dof)
+        crit = t_dist.isf(alpha / 2, dof)
+        r2 = 1 - rss / tss
+        adj_r2 = 1 - (1 - r2) * (n - 1) / dof
+        f_stat = (tss - rss) / (k - 1) / (rss / dof)
+        f_p = f_dist.sf(f_stat, k - 1, dof)
+    f_stat = np.where(k > 1, f_stat, np.nan)
+    f_p = np.where(k > 1, f_p, np.nan)
+
+    index = pd.MultiIndex.from_product([outcomes, names], names=['outcome', 'term'])
+    coefficients = pd.DataFrame({
+        'coef': coef.T.ravel(),
+        'se': se.T.ravel(),
+        't': t_stat.T.ravel(),
+        'p_value': p_value.T.ravel(),
+        'ci_low': (coef - crit * se).T.ravel(),
+        'ci_high': (coef + crit * se).T.ravel(),
+    }, index=index)
+    coefficients['reject'] = coefficients['p_value'] < alpha
+    models = pd.DataFrame({
+        'n': n, 'df_resid': dof, 'r2': r2, 'adj_r2': adj_r2,
+        'f_stat': f_stat, 'f_p_value': f_p,
+        'rmse': np.sqrt(rss / np.where(dof > 0, dof, np.nan)),
+    }, index=pd.Index(outcomes, name='outcome'))
+    return coefficients, models
+
+
+def regression_gram(data, outcomes, predictors=(), categorical=CATEGORICAL, levels=None):
+    # {outcome: Gram sketch} over the design (without the intercept, which
+    # centring takes care of) and that one outcome, so every outcome keeps
+    # the rows where it and the predictors are present, as in fit_outcomes;
+    # shards are merged outcome by outcome before fit_gram
+    X, names, ok = design_matrix(data, predictors, categorical, levels)
+    grams = {}
+    for c in outcomes:
+        y = pd.to_numeric(data[c], errors='coerce').to_numpy(dtype=float)
+        grams[c] = Gram(names[1:] + [c]).update(np.column_stack([X[:, 1:], np.where(ok, y, np.nan)]))
+    return grams
+
+
+def _fit_one_gram(gram):
+    # slopes solve the centred normal equations Sxx b = Sxy, the intercept is
+    # mean_y - mean_x b -> coefficients, standard errors (p,), k, rss, tss
+    p, n = len(gram.columns), float(gram.n)
+    Sxx, Sxy = gram.s[:p - 1, :p - 1], gram.s[:p - 1, p - 1]
+    mean_x, mean_y = gram.mean[:p - 1], gram.mean[p - 1]
+    tss = gram.s[p - 1, p - 1]
+    coef, se = np.full(p, np.nan), np.full(p, np.nan)
+    # terms spanned by the others are left out, as in fit_outcomes
+    terms = _independent_terms(Sxx)
+    if n <= len(terms) + 1:
+        return coef, se, 0, np.nan, tss
+    try:
+        c = cho_factor(Sxx[np.ix_(terms, terms)])
+    except LinAlgError:
+        return coef, se, 0, np.nan, tss
+    B = cho_solve(c, Sxy[terms])
+    inv = cho_solve(c, np.eye(len(terms)))
+    rss = tss - B @ Sxy[terms]
+    sigma2 = rss / (n - len(terms) - 1)
+    mx = mean_x[terms]
+    coef[0] = mean_y - mx @ B
+    se[0] = np.sqrt((1 / n + mx @ inv @ mx) * sigma2)
+    coef[terms + 1] = B
+    se[terms + 1] = np.sqrt(np.diag(inv) * sigma2)
+    return coef, se, len(terms) + 1, rss, tss
+
+
+def fit_gram(grams, alpha=0.05):
+    # fit_outcomes from (merged) regression_gram sketches
+    outcomes = list(grams)
+    names = ['Intercept'] + grams[outcomes[0]].columns[:-1]
+    coef, se, k, rss, tss = zip(*(_fit_one_gram(grams[c]) for c in outcomes))
+    n = np.array([grams[c].n for c in outcomes], dtype=int)
+    return _tables(outcomes, names, np.column_stack(coef), np.column_stack(se), n,
+                   np.array(k), np.array(rss), np.array(tss), alpha)
+
+
+def check_rank_deficient(df, outcome='Q7: sleep hrs', predictors=('Q6: hrs exercise',), by='GRADE'):
+    # the outcome kept only where `by` is not at its reference level: both
+    # paths must drop one dummy, fit with the reduced term count and agree
+    df = df.copy()
+    levels = {c: sorted(df[c].dropna().unique()) for c in CATEGORICAL}
+    df.loc[df[by] == levels[by][0], outcome] = np.nan
+    a_coef, a_models = fit_outcomes(df, [outcome], list(predictors))
+    half = len(df) // 2
+    grams = [regression_gram(part, [outcome], list(predictors), levels=levels)
+             for part in (df.iloc[:half], df.iloc[half:])]
+    b_coef, b_models = fit_gram({outcome: grams[0][outcome].merge(grams[1][outcome])})
+    k = 1 + len(predictors) + sum(len(v) - 1 for v in levels.values()) - 1
+    if a_models['df_resid'].iloc[0] != a_models['n'].iloc[0] - k:
+        raise AssertionError(f'fit_outcomes df_resid {a_models["df_resid"].iloc[0]}, expected n - {k}.')
+    cols = ['coef', 'se', 'p_value']
+    if not (np.allclose(a_coef[cols], b_coef[cols], equal_nan=True) and
+            np.allclose(a_models, b_models, equal_nan=True)):
+        raise AssertionError('fit_outcomes and fit_gram disagree on a rank-deficient design.')
+    if np.isfinite(a_coef['se']).sum() != k or not (a_coef['se'].dropna() < 1e3).all():
+        raise AssertionError('rank-deficient design left an unidentified term in the fit.')
+    print(f'rank-deficient check passed: {k} terms, df_resid {a_models["df_resid"].iloc[0]}')
+
+
+if __name__ == '__main__':
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description='Regress outcome columns on predictors plus categorical controls.')
+    parser.add_argument('csv', nargs='?', default='public/survey.csv')
+    parser.add_argument('--predictors', nargs='*', default=['Q6: hrs exercise'])
+    parser.add_argument('--categorical', nargs='*', default=list(CATEGORICAL))
+    parser.add_argument('--outcomes', nargs='*', help='default: every other numeric column')
+    parser.add_argument('--alpha', type=float, default=0.05)
+    parser.add_argument('--check', action='store_true',
+                        help='check that fit_outcomes and fit_gram agree when a reference level has no rows')
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.csv)
+    if args.check:
+        check_rank_deficient(df)
+        raise SystemExit
+    outcomes = args.outcomes
+    if not outcomes:
+        num = df.apply(pd.to_numeric, errors='coerce').select_dtypes('number')
+        outcomes = [c for c in num.columns[num.std() > 0] if c != 'Survey ID']
+    t0 = time.perf_counter()
+    coefficients, models = fit_outcomes(df, outcomes, args.predictors, args.categorical, args.alpha)
+    print(f'{len(models)} outcomes in {1000 * (time.perf_counter() - t0):.1f} ms')
+    shown = coefficients[coefficients.index.get_level_values('term').isin(args.predictors)]
+    print(shown.join(models[['n', 'r2']], on='outcome').round(4).to_string())
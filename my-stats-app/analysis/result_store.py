@@ -0,0 +1,228 @@
+import base64
+import hashlib
+import json
+import pickle
+import sqlite3
+import time
+
+import numpy as np
+import pandas as pd
+
+##############################################################################
+#     PERSISTENT RESULT STORE FOR TESTS AND ANALYSES
+##############################################################################
+# One SQLite file. Every entry is keyed by the dataset hash (dataset_key in
+# corr_engine.py, '' for TESTS entries whose parameters are the whole input),
+# the test or analysis name and its canonical JSON spec. The headline numbers
+# (statistic, p-value, CI, reject) are real columns so dashboards can filter
+# and sort on them through the indexes; the full result is JSON and a table
+# result (bootstrap, regression, ...) a pickled DataFrame.
+#
+# Images live in their own table keyed by the SHA-256 of their bytes, so a
+# figure shared by many entries is stored once.
+#
+#     python analysis/result_store.py results.sqlite --test one_sample_t_test --max-p 0.05
+
+DEFAULT_PATH = 'results.sqlite'
+SUMMARY_COLUMNS = ['statistic', 'p_value', 'ci_low', 'ci_high', 'reject']
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS results (
+    key       TEXT PRIMARY KEY,
+    dataset   TEXT NOT NULL,
+    test      TEXT NOT NULL,
+    spec      TEXT NOT NULL,
+    statistic REAL,
+    p_value   REAL,
+    ci_low    REAL,
+    ci_high   REAL,
+    reject    INTEGER,
+    result    TEXT,
+    frame     BLOB,
+    image     TEXT,
+    created   REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_dataset_test ON results (dataset, test);
+CREATE INDEX IF NOT EXISTS results_test_p ON results (test, p_value);
+CREATE TABLE IF NOT EXISTS images (
+    hash   TEXT PRIMARY KEY,
+    format TEXT NOT NULL,
+    data   BLOB NOT NULL
+);
+'''
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f'{type(value).__name__} is not JSON serializable')
+
+
+def canonical(spec):
+    return json.dumps(spec, sort_keys=True, separators=(',', ':'), default=_json_default)
+
+
+def entry_key(dataset, test, spec):
+    return hashlib.sha1(f'{dataset}\x1f{test}\x1f{canonical(spec)}'.encode()).hexdigest()
+
+
+def _number(value):
+    if isinstance(value, (bool, np.bool_)):
+        return int(value)
+    if isinstance(value, (int, float, np.integer, np.floating)) and np.isfinite(value):
+        return float(value)
+    return None
+
+
+class ResultStore:
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        # WAL lets readers (dashboards, server workers) run while one process
+        # writes; writers from several processes wait on the lock
+        self.db = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA synchronous=NORMAL')
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def put_image(self, data, format='png'):
+        digest = hashlib.sha256(data).hexdigest()
+        self.db.execute('INSERT OR IGNORE INTO images (hash, format, data) VALUES (?, ?, ?)',
+                        (digest, format, sqlite3.Binary(data)))
+        return digest
+
+    def image(self, digest):
+        row = self.db.execute('SELECT data FROM images WHERE hash = ?', (digest,)).fetchone()
+        return bytes(row[0]) if row else None
+
+    def put(self, test, spec, result=None, dataset='', image=None, frame=None, summary=None):
+        # result: JSON-able dict; summary (default: result) fills the
+        # statistic/p_value/ci_low/ci_high/reject columns; frame: DataFrame;
+        # image: PNG bytes
+        result = result or {}
+        summary = result if summary is None else summary
+        digest = self.put_image(image) if image is not None else None
+        blob = None if frame is None else sqlite3.Binary(pickle.dumps(frame, protocol=pickle.HIGHEST_PROTOCOL))
+        key = entry_key(dataset, test, spec)
+        self.db.execute(
+            'INSERT OR REPLACE INTO results (key, dataset, test, spec, statistic, p_value, '
+            'ci_low, ci_high, reject, result, frame, image, created) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            (key, dataset, test, canonical(spec), *(_number(summary.get(c)) for c in SUMMARY_COLUMNS),
+             canonical(result), blob, digest, time.time()))
+        return key
+
+    def get(self, test, spec, dataset='', image=False):
+        # {'result', 'frame', 'image_hash'[, 'image']} or None
+        row = self.db.execute('SELECT result, frame, image FROM results WHERE key = ?',
+                              (entry_key(dataset, test, spec),)).fetchone()
+        if row is None:
+            return None
+        entry = {'result': json.loads(row[0]) if row[0] else {},
+                 'frame': pickle.loads(row[1]) if row[1] is not None else None,
+                 'image_hash': row[2]}
+        if image:
+            entry['image'] = self.image(row[2]) if row[2] else None
+        return entry
+
+    def frame(self, test, data, spec, compute):
+        # stored DataFrame for (data, test, spec), computing and storing it on
+        # the first call
+        from corr_engine import dataset_key
+        dataset = dataset_key(data)
+        hit = self.get(test, spec, dataset)
+        if hit is not None and hit['frame'] is not None:
+            return hit['frame']
+        frame = compute()
+        self.put(test, spec, dataset=dataset, frame=frame)
+        return frame
+
+    def query(self, test=None, dataset=None, max_p=None, limit=None):
+        where, args = [], []
+        for column, value in (('test', test), ('dataset', dataset)):
+            if value is not None:
+                where.append(f'{column} = ?')
+                args.append(value)
+        if max_p is not None:
+            where.append('p_value <= ?')
+            args.append(max_p)
+        sql = ('SELECT key, dataset, test, spec, ' + ', '.join(SUMMARY_COLUMNS) +
+               ', image, created FROM results')
+        if where:
+            sql += ' WHERE ' + ' AND '.join(where)
+        sql += ' ORDER BY test, p_value'
+        if limit:
+            sql += f' LIMIT {int(limit)}'
+        table = pd.read_sql_query(sql, self.db, params=args)
+        table['reject'] = table['reject'].astype('boolean')
+        return table
+
+    def stats(self):
+        n, = self.db.execute('SELECT COUNT(*) FROM results').fetchone()
+        images, size = self.db.execute('SELECT COUNT(*), COALESCE(SUM(LENGTH(data)), 0) FROM images').fetchone()
+        return {'results': n, 'images': images, 'image_bytes': size}
+
+
+def run_test(name, params, render=False, store=None):
+    # TESTS entry through the store: {'result', 'confidence_intervals',
+    # 'image' (base64 PNG, only with render)}, computing only on a miss
+    from stats_loader import load_stats_code, stats_code_version
+    params = dict(params)
+    ci_levels = params.pop('ci_levels', None)
+    spec = {'params': params, 'ci_levels': ci_levels, 'code': stats_code_version()}
+    if store is not None:
+        hit = store.get(name, spec, image=render)
+        if hit is not None and (not render or hit['image'] is not None):
+            out = dict(hit['result'])
+            if render:
+                out['image'] = base64.b64encode(hit['image']).decode()
+            return out
+
+    sc = load_stats_code()
+    if name not in sc.TEST_STATS:
+        raise ValueError(f'Unknown test {name!r}.')
+    out = {'result': sc.TEST_STATS[name](**params), 'confidence_intervals': None}
+    if ci_levels and 'ci_se' in out['result']:
+        out['confidence_intervals'] = sc.confidence_intervals(name, ci_levels, **params)
+    if render:
+        out['image'] = sc.TESTS[name](ci_levels=ci_levels, **params)
+    if store is not None:
+        image = base64.b64decode(out['image']) if render else None
+        store.put(name, spec, {k: v for k, v in out.items() if k != 'image'},
+                  image=image, summary=out['result'])
+    return out
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='List results kept in a result store.')
+    parser.add_argument('store', nargs='?', default=DEFAULT_PATH)
+    parser.add_argument('--test')
+    parser.add_argument('--dataset')
+    parser.add_argument('--max-p', type=float)
+    parser.add_argument('--limit', type=int, default=50)
+    parser.add_argument('--image', metavar='HASH', help='write this image to HASH.png')
+    args = parser.parse_args()
+
+    with ResultStore(args.store) as store:
+        if args.image:
+            data = store.image(args.image)
+            if data is None:
+                parser.error(f'no image {args.image}')
+            with open(f'{args.image}.png', 'wb') as f:
+                f.write(data)
+        else:
+            print(store.stats())
+            table = store.query(args.test, args.dataset, args.max_p, args.limit)
+            print(table.drop(columns=['key', 'spec']).to_string(index=False))
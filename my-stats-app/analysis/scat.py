@@ -1,7 +1,9 @@
-import os, textwrap, pandas as pd, matplotlib.pyplot as plt, numpy as np
+import os, textwrap, pandas as pd, matplotlib.pyplot as plt
 from scipy.stats import linregress
+from bootstrap import bootstrap_pairs, ci_text
+from dataset import load_survey
+from sketches import QuantileSketch
 
-data_path = 'public/res+stu.csv'
 out_dir   = 'plots/combined'
 
 labels = {
@@ -26,20 +28,32 @@ pairs = {
 dot_color, line_color, outlier_col = '#d8c5f2', '#7953A9', '#bbbbbb'
 
 os.makedirs(out_dir, exist_ok=True)
-df0 = pd.read_csv(data_path).apply(pd.to_numeric, errors='coerce')
+df0 = load_survey().view('combined').apply(pd.to_numeric, errors='coerce')
+
+def iqr_masks(x, y):
+    lo_x, hi_x = QuantileSketch().update(x).iqr_fences(1.5)
+    lo_y, hi_y = QuantileSketch().update(y).iqr_fences(1.5)
+    infl_mask = (x < lo_x) | (x > hi_x)
+    outl_mask = (y < lo_y) | (y > hi_y)
+    return infl_mask, outl_mask
+
+# bootstrap every pair's fit (on the rows kept after the IQR filter) at once
+keep_rows = {}
+for xcol, ycol in pairs.values():
+    df = df0[[xcol, ycol]].dropna()
+    infl_mask, outl_mask = iqr_masks(df[xcol], df[ycol])
+    keep_rows[(xcol, ycol)] = df0.index.isin(df.index[~(infl_mask | outl_mask)])
+boot = bootstrap_pairs(df0, list(pairs.values()), reps=10000, seed=0, masks=keep_rows)
 
 for title, (xcol, ycol) in pairs.items():
     df = df0[[xcol, ycol]].dropna()
     x, y = df[xcol], df[ycol]
 
-    qx1, qx3 = np.percentile(x, [25, 75])
-    qy1, qy3 = np.percentile(y, [25, 75])
-    iqr_x, iqr_y = qx3 - qx1, qy3 - qy1
-    infl_mask = (x < qx1 - 1.5*iqr_x) | (x > qx3 + 1.5*iqr_x)
-    outl_mask = (y < qy1 - 1.5*iqr_y) | (y > qy3 + 1.5*iqr_y)
+    infl_mask, outl_mask = iqr_masks(x, y)
     keep_mask = ~(infl_mask | outl_mask)
 
     res = linregress(x[keep_mask], y[keep_mask])
+    ci = boot.loc[(xcol, ycol)]
 
     print(f'\n{title.upper()}')
     print('Influential (x-axis):', [(float(x[i]), float(y[i])) for i in infl_mask[infl_mask].index])
@@ -56,7 +70,8 @@ for title, (xcol, ycol) in pairs.items():
 
     ax.text(0.5, -0.38,
             f"ŷ = {res.intercept:.4f} + {res.slope:.4f}·x    "
-            f"r = {res.rvalue:.4f}     R² = {res.rvalue**2:.4f}",
+            f"r = {res.rvalue:.4f}     R² = {res.rvalue**2:.4f}\n"
+            f"95% bootstrap CI:  slope {ci_text(ci, 'slope', 4)}    r {ci_text(ci, 'r', 4)}",
             transform=ax.transAxes, ha='center', va='top', fontsize=8)
     ax.tick_params(labelsize=8)
     plt.tight_layout()
@@ -0,0 +1,308 @@
+import numpy as np
+import pandas as pd
+from corr_engine import comoments, corr_result
+
+##############################################################################
+#     MERGEABLE SUFFICIENT STATISTICS FOR SHARDED DATA
+##############################################################################
+# Each accumulator is updated with any number of chunks and merged with
+# accumulators built elsewhere (another process, another machine: they are
+# plain picklable objects), and the merged state is what one pass over all
+# the rows would have produced:
+#
+#   Moments   pairwise-complete count / mean / M2 / co-moment matrices,
+#             combined with Chan et al.'s parallel update so nothing is kept
+#             as raw sums of squares -> means, variances, correlations and the
+#             summary parameters of the stats_code.py t and ANOVA tests
+#   Gram      listwise-complete centred cross-products of a fixed column set
+#             (a regression design plus one outcome) -> regression.fit_gram
+#   Counts    contingency tables and value counts -> chi-square tests
+#   QuantileSketch
+#             exact value counts while a column has few distinct values (every
+#             survey answer), then a KLL-style compactor with bounded size
+#             -> quantiles and IQR fences
+
+
+def _merge_moments(n_a, mean_a, n_b, mean_b):
+    # weights of the Chan update: combined count, mean shift d, n_b / n and
+    # n_a * n_b / n (0 where both sides are empty)
+    n_a, n_b = np.asarray(n_a, dtype=float), np.asarray(n_b, dtype=float)
+    n = n_a + n_b
+    d = mean_b - mean_a
+    with np.errstate(divide='ignore', invalid='ignore'):
+        w = np.where(n > 0, n_b / n, 0.0)
+        nn = np.where(n > 0, n_a * n_b / n, 0.0)
+    return n, d, w, nn
+
+
+class Moments:
+    # n[i, j], mean[i, j] and m2[i, j] describe column i over the rows where
+    # both i and j are present; c[i, j] is their co-moment on those rows
+    def __init__(self, columns):
+        self.columns = list(columns)
+        k = len(self.columns)
+        self.n = np.zeros((k, k))
+        self.mean = np.zeros((k, k))
+        self.m2 = np.zeros((k, k))
+        self.c = np.zeros((k, k))
+
+    def update(self, data):
+        X = data[self.columns].to_numpy(dtype=float) if isinstance(data, pd.DataFrame) \
+            else np.asarray(data, dtype=float)
+        if not len(X):
+            return self
+        # centre the chunk first so the sums of squares below stay small
+        present = (~np.isnan(X)).sum(axis=0)
+        shift = np.nansum(X, axis=0) / np.maximum(present, 1)
+        n, sx, sxx, sxy = comoments(X - shift)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean = np.where(n > 0, sx / n, 0.0)
+        m2 = sxx - sx * mean
+        c = sxy - sx * mean.T
+        self._combine(n, mean + shift[:, None] * (n > 0), m2, c)
+        return self
+
+    def _combine(self, n_b, mean_b, m2_b, c_b):
+        n, d, w, nn = _merge_moments(self.n, self.mean, n_b, mean_b)
+        self.mean = self.mean + d * w
+        self.m2 = self.m2 + m2_b + d * d * nn
+        self.c = self.c + c_b + d * d.T * nn
+        self.n = n
+
+    def merge(self, other):
+        if other.columns != self.columns:
+            raise ValueError('Cannot merge Moments over different columns.')
+        self._combine(other.n, other.mean, other.m2, other.c)
+        return self
+
+    def counts(self):
+        return pd.Series(np.diag(self.n).astype(int), index=self.columns)
+
+    def means(self):
+        n = np.diag(self.n)
+        return pd.Series(np.where(n > 0, np.diag(self.mean), np.nan), index=self.columns)
+
+    def variances(self, ddof=1):
+        n, m2 = np.diag(self.n), np.diag(self.m2)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            var = m2 / (n - ddof)
+        return pd.Series(np.where(n > ddof, var, np.nan), index=self.columns)
+
+    def cov(self, ddof=1):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cov = self.c / (self.n - ddof)
+        return pd.DataFrame(np.where(self.n > ddof, cov, np.nan), index=self.columns, columns=self.columns)
+
+    def _r(self):
+        vx, vy = self.m2, self.m2.T
+        with np.errstate(divide='ignore', invalid='ignore'):
+            r = self.c / np.sqrt(vx * vy)
+        r = np.where((vx > 0) & (vy > 0) & (self.n >= 2), r, np.nan)
+        return np.clip(r, -1.0, 1.0)
+
+    def corr(self):
+        r = self._r()
+        np.fill_diagonal(r, np.where(np.diag(self.n) >= 2, 1.0, np.nan))
+        return pd.DataFrame(r, index=self.columns, columns=self.columns)
+
+    def corr_matrices(self, alpha=0.05, correction='fdr_bh'):
+        # the same result dict as corr_engine.corr_matrices (Pearson)
+        return corr_result(self.columns, self._r(), self.n, 'pearson', alpha, correction)
+
+    def t_params(self, col, suffix=''):
+        # n / s / x_bar of one column, named as the t and z tests expect
+        # ('1' / '2' suffixes for the two-sample tests)
+        i = self.columns.index(col)
+        n = self.n[i, i]
+        if n < 2:
+            raise ValueError(f"'{col}' has {int(n)} value(s); a standard deviation needs at least 2.")
+        s = np.sqrt(self.m2[i, i] / (n - 1))
+        return {f'n{suffix}': int(n), f's{suffix}': float(s), f'x_bar{suffix}': float(self.mean[i, i])}
+
+
+def anova_params(groups, col):
+    # {label: Moments} -> summary arguments of one_way_anova_test; every
+    # group needs at least two values of col
+    params = [m.t_params(col) for m in groups.values()]
+    return {'n': [p['n'] for p in params], 'means': [p['x_bar'] for p in params],
+            'sds': [p['s'] for p in params]}
+
+
+class Gram:
+    # rows with every column present: count, column means and the centred
+    # cross-product matrix s = (X - mean)'(X - mean)
+    def __init__(self, columns):
+        self.columns = list(columns)
+        k = len(self.columns)
+        self.n = 0
+        self.mean = np.zeros(k)
+        self.s = np.zeros((k, k))
+
+    def update(self, X):
+        X = X[self.columns].to_numpy(dtype=float) if isinstance(X, pd.DataFrame) \
+            else np.asarray(X, dtype=float)
+        X = X[~np.isnan(X).any(axis=1)]
+        if len(X):
+            mean = X.mean(axis=0)
+            Xc = X - mean
+            self._combine(len(X), mean, Xc.T @ Xc)
+        return self
+
+    def _combine(self, n_b, mean_b, s_b):
+        n, d, w, nn = _merge_moments(self.n, self.mean, n_b, mean_b)
+        self.mean = self.mean + d * w
+        self.s = self.s + s_b + np.outer(d, d) * nn
+        self.n = n
+
+    def merge(self, other):
+        if other.columns != self.columns:
+            raise ValueError('Cannot merge Gram matrices over different columns.')
+        self._combine(other.n, other.mean, other.s)
+        return self
+
+
+class Counts:
+    def __init__(self, pairs=(), columns=()):
+        self.pairs = [tuple(pair) for pair in pairs]
+        self.columns = list(columns)
+        self.tables = {pair: None for pair in self.pairs}
+        self.values = {col: None for col in self.columns}
+
+    @staticmethod
+    def _add(prev, new):
+        return new if prev is None else prev.add(new, fill_value=0)
+
+    def update(self, frame):
+        for a, b in self.pairs:
+            self.tables[(a, b)] = self._add(self.tables[(a, b)], pd.crosstab(frame[a], frame[b]))
+        for col in self.columns:
+            self.values[col] = self._add(self.values[col], frame[col].value_counts())
+        return self
+
+    def merge(self, other):
+        for pair, table in other.tables.items():
+            self.tables[pair] = table if pair not in self.tables else self._add(self.tables[pair], table)
+        for col, counts in other.values.items():
+            self.values[col] = counts if col not in self.values else self._add(self.values[col], counts)
+        return self
+
+    def table(self, a, b):
+        # observed_table for the chi-square independence/homogeneity tests
+        ct = self.tables[(a, b)]
+        return None if ct is None else ct.fillna(0).astype(int).sort_index().sort_index(axis=1)
+
+    def counts(self, col):
+        vc = self.values[col]
+        return None if vc is None else vc.fillna(0).astype(int).sort_index()
+
+
+class QuantileSketch:
+    # exact mode: sorted distinct values and their counts. Past max_distinct
+    # values the counts are spread over compactor levels (a value counted c
+    # times goes to level h for every set bit h of c, where an item at level
+    # h stands for 2**h rows) and each full level sorts itself and promotes
+    # every other item, so the total weight always equals the row count.
+    def __init__(self, k=256, max_distinct=4096, seed=0):
+        self.k = k
+        self.max_distinct = max_distinct
+        self.rng = np.random.default_rng(seed)
+        self.n = 0
+        self.values = np.empty(0)
+        self.weights = np.empty(0, dtype=np.int64)
+        self.levels = None
+
+    @property
+    def exact(self):
+        return self.levels is None
+
+    def update(self, values):
+        v = np.asarray(values, dtype=float).ravel()
+        v = v[~np.isnan(v)]
+        if v.size:
+            self.n += v.size
+            if self.exact:
+                self._add_counts(*np.unique(v, return_counts=True))
+            else:
+                self.levels[0] = np.concatenate([self.levels[0], v])
+                self._compress()
+        return self
+
+    def _add_counts(self, values, weights):
+        values, inv = np.unique(np.concatenate([self.values, values]), return_inverse=True)
+        weights = np.bincount(np.ravel(inv), minlength=len(values),
+                              weights=np.concatenate([self.weights, weights])).astype(np.int64)
+        self.values, self.weights = values, weights
+        if len(values) > self.max_distinct:
+            self.levels = self._split_levels(values, weights)
+            self.values, self.weights = np.empty(0), np.empty(0, dtype=np.int64)
+            self._compress()
+
+    @staticmethod
+    def _split_levels(values, weights):
+        levels, w = [], weights.copy()
+        while w.any():
+            levels.append(values[(w & 1).astype(bool)])
+            w >>= 1
+        return levels or [np.empty(0)]
+
+    def _compress(self):
+        h = 0
+        while h < len(self.levels):
+            capacity = max(2, int(np.ceil(self.k * (2 / 3) ** (len(self.levels) - 1 - h))))
+            buf = self.levels[h]
+            if len(buf) > capacity:
+                buf = np.sort(buf)
+                odd = len(buf) % 2
+                self.levels[h] = buf[len(buf) - odd:]
+                if h + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                promoted = buf[:len(buf) - odd][self.rng.integers(2)::2]
+                self.levels[h + 1] = np.concatenate([self.levels[h + 1], promoted])
+            h += 1
+
+    def merge(self, other):
+        self.n += other.n
+        if self.exact and other.exact:
+            self._add_counts(other.values, other.weights)
+            return self
+        if self.exact:
+            self.levels = self._split_levels(self.values, self.weights)
+            self.values, self.weights = np.empty(0), np.empty(0, dtype=np.int64)
+        theirs = other.levels if not other.exact else self._split_levels(other.values, other.weights)
+        for h, buf in enumerate(theirs):
+            if h == len(self.levels):
+                self.levels.append(np.empty(0))
+            self.levels[h] = np.concatenate([self.levels[h], buf])
+        self._compress()
+        return self
+
+    def _weighted(self):
+        if self.exact:
+            return self.values, self.weights
+        v = np.concatenate(self.levels)
+        w = np.concatenate([np.full(len(buf), 2 ** h, dtype=np.int64) for h, buf in enumerate(self.levels)])
+        order = np.argsort(v, kind='stable')
+        return v[order], w[order]
+
+    def quantile(self, q):
+        # linear interpolation between order statistics, as np.percentile;
+        # exact while self.exact, otherwise within the sketch's rank error
+        q = np.asarray(q, dtype=float)
+        if self.n == 0:
+            return np.full(q.shape, np.nan)
+        v, w = self._weighted()
+        cw = np.cumsum(w)
+        pos = q * (self.n - 1)
+        lo, hi = np.floor(pos), np.ceil(pos)
+        v_lo = v[np.minimum(np.searchsorted(cw, lo, side='right'), len(v) - 1)]
+        v_hi = v[np.minimum(np.searchsorted(cw, hi, side='right'), len(v) - 1)]
+        return v_lo + (pos - lo) * (v_hi - v_lo)
+
+    def iqr_fences(self, whisker=1.5):
+        q1, q3 = self.quantile([0.25, 0.75])
+        iqr = q3 - q1
+        return q1 - whisker * iqr, q3 + whisker * iqr
+
+
+def quantile_sketches(data, cols, **kwargs):
+    return {c: QuantileSketch(**kwargs).update(pd.to_numeric(data[c], errors='coerce')) for c in cols}
@@ -0,0 +1,208 @@
+import argparse
+import base64
+import io
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+from PIL import Image
+from stats_loader import load_stats_code
+
+##############################################################################
+#     GOLDEN SNAPSHOTS OF EVERY TESTS ENTRY (FIGURES + NUMBERS)
+##############################################################################
+# Every case in CASES is rendered through TESTS exactly as the app does and
+# reduced to a 64-bit difference hash plus a 32x32 grayscale thumbnail; the
+# TEST_STATS numbers are stored alongside. --update rewrites the golden file,
+# otherwise each case is compared against it (in parallel) and the script
+# exits non-zero on any drift. Run it before and after render-path changes:
+#
+#     python analysis/snapshot_check.py            # compare
+#     python analysis/snapshot_check.py --update   # accept the current output
+
+GOLDEN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'golden', 'snapshots.json')
+NUMERIC_FIELDS = ('statistic', 'p_value', 'critical_value', 'df', 'ci_low', 'ci_high')
+HASH_TOLERANCE = 4          # differing dHash bits
+THUMB_TOLERANCE = 0.5       # mean absolute thumbnail difference (0-255)
+RTOL = 1e-9
+
+_GROUPS = [[6.5, 7, 8, 5.5, 7.5, 6, 9, 7], [8, 8.5, 7, 9, 7.5, 8, 9.5], [5, 6, 6.5, 7, 5.5, 6, 4.5, 6]]
+_X = [7, 8, 6.5, 9, 5, 7.5, 8, 6, 7, 8.5, 9, 6]
+_Y = [6, 8, 7, 7.5, 5.5, 6, 7, 6.5, 6, 7, 8, 5]
+
+CASES = {
+    'one_sample_t_test': [
+        dict(n=25, s=8, x_bar=52, mu=50, alpha=0.05, tail_type=3),
+        dict(n=12, s=2.5, x_bar=9.1, mu=10, alpha=0.01, tail_type=1),
+        dict(n=40, s=4, x_bar=21.5, mu=20, alpha=0.1, tail_type=2),
+    ],
+    'one_sample_z_test': [
+        dict(n=30, sigma=5, x_bar=51.2, mu=50, alpha=0.05, tail_type=3),
+        dict(n=64, sigma=10, x_bar=97, mu=100, alpha=0.05, tail_type=1),
+    ],
+    'one_sample_proportion_z_test': [
+        dict(n=100, p_hat=0.42, p=0.5, alpha=0.05, tail_type=3),
+        dict(n=250, p_hat=0.58, p=0.5, alpha=0.01, tail_type=2),
+        dict(n=20, p_hat=0.15, p=0.2, alpha=0.05, tail_type=3),
+    ],
+    'two_dependent_z_test': [
+        dict(n=30, sigma_d=3, d_bar=1, alpha=0.05, tail_type=3),
+    ],
+    'two_dependent_t_test': [
+        dict(n=15, s_d=2.2, d_bar=1.4, alpha=0.05, tail_type=2),
+        dict(n=20, s_d=3, d_bar=-0.5, alpha=0.05, tail_type=3),
+    ],
+    'two_dependent_proportion_test': [
+        dict(n10=10, n01=5, n11=20, n00=15, alpha=0.05, tail_type=2),
+        dict(n10=10, n01=5, n11=20, n00=15, alpha=0.05, tail_type=3, method='asymptotic'),
+    ],
+    'two_independent_z_test': [
+        dict(n1=40, n2=35, sigma1=5, sigma2=6, x_bar1=20, x_bar2=18, alpha=0.05, tail_type=3),
+    ],
+    'two_independent_t_test': [
+        dict(n1=40, n2=35, s1=5, s2=6, x_bar1=20, x_bar2=18, alpha=0.05, tail_type=3),
+        dict(n1=12, n2=30, s1=1.5, s2=4, x_bar1=7.2, x_bar2=8.9, alpha=0.05, tail_type=1),
+        dict(n1=40, n2=35, s1=5, s2=6, x_bar1=20, x_bar2=18, alpha=0.05, tail_type=3,
+             ci_levels=[0.9, 0.95, 0.99]),
+    ],
+    'two_independent_proportion_z_test': [
+        dict(x1=45, x2=30, n1=100, n2=90, alpha=0.05, tail_type=2),
+    ],
+    'chi_square_gof_test': [
+        dict(observed=[10, 20, 30], expected=[15, 25, 20], alpha=0.05),
+        dict(observed=[18, 22, 20, 25, 15], expected=[20, 20, 20, 20, 20], alpha=0.05),
+    ],
+    'chi_square_independence_test': [
+        dict(observed_table=[[10, 20], [30, 25]], alpha=0.05),
+        dict(observed_table=[[12, 8, 10], [9, 14, 7], [6, 5, 15]], alpha=0.01),
+        dict(observed_table=[[3, 1], [1, 4]], alpha=0.05),
+        dict(observed_table=[[3, 1, 0], [1, 4, 2], [0, 2, 5]], alpha=0.05),
+    ],
+    'chi_square_homogeneity_test': [
+        dict(observed_table=[[20, 15, 10], [12, 18, 14]], alpha=0.05),
+    ],
+    'one_way_anova_test': [
+        dict(alpha=0.05, groups=_GROUPS),
+        dict(alpha=0.05, n=[30, 25, 40], means=[7.1, 7.5, 6.8], sds=[1.0, 1.1, 1.2]),
+    ],
+    'kruskal_wallis_test': [
+        dict(alpha=0.05, groups=_GROUPS),
+    ],
+    'mann_whitney_u_test': [
+        dict(x=_GROUPS[0], y=_GROUPS[1], alpha=0.05, tail_type=3),
+    ],
+    'wilcoxon_signed_rank_test': [
+        dict(x=_X, y=_Y, alpha=0.05, tail_type=3),
+    ],
+}
+
+
+def dhash(img, size=8):
+    small = np.asarray(img.resize((size + 1, size), Image.LANCZOS), dtype=np.int16)
+    bits = (small[:, 1:] > small[:, :-1]).ravel()
+    return '%016x' % int(''.join('1' if b else '0' for b in bits), 2)
+
+
+def thumbnail(img, size=32):
+    return np.asarray(img.resize((size, size), Image.LANCZOS), dtype=np.uint8)
+
+
+def snapshot(name, params):
+    sc = load_stats_code()
+    stats_params = {k: v for k, v in params.items() if k != 'ci_levels'}
+    res = sc.TEST_STATS[name](**stats_params)
+    png = base64.b64decode(sc.TESTS[name](**params))
+    img = Image.open(io.BytesIO(png)).convert('L')
+    return {
+        'test': name,
+        'params': params,
+        'numbers': {k: res.get(k) for k in NUMERIC_FIELDS if k in res},
+        'size': list(img.size),
+        'dhash': dhash(img),
+        'thumbnail': base64.b64encode(thumbnail(img).tobytes()).decode('ascii'),
+    }
+
+
+def _snapshot_case(case):
+    return snapshot(*case)
+
+
+def case_key(name, i):
+    return f'{name}[{i}]'
+
+
+def collect(names=None, workers=None):
+    cases = [(name, params) for name, grid in CASES.items() if not names or name in names
+             for params in grid]
+    keys = [case_key(name, i) for name, grid in CASES.items() if not names or name in names
+            for i in range(len(grid))]
+    if workers == 1:
+        snaps = [snapshot(*case) for case in cases]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            snaps = list(pool.map(_snapshot_case, cases))
+    return dict(zip(keys, snaps))
+
+
+def _numbers_differ(a, b):
+    if a is None or b is None:
+        return a is not b
+    a, b = np.asarray(a, dtype=float), np.asarray(b, dtype=float)
+    return a.shape != b.shape or not np.allclose(a, b, rtol=RTOL, atol=1e-12, equal_nan=True)
+
+
+def compare(current, golden):
+    problems = []
+    for key, snap in current.items():
+        gold = golden.get(key)
+        if gold is None:
+            problems.append(f'{key}: no golden snapshot (run with --update)')
+            continue
+        if gold['params'] != snap['params']:
+            problems.append(f'{key}: parameters changed (run with --update)')
+            continue
+        for field in set(gold['numbers']) | set(snap['numbers']):
+            if _numbers_differ(gold['numbers'].get(field), snap['numbers'].get(field)):
+                problems.append(f'{key}: {field} {gold["numbers"].get(field)} -> {snap["numbers"].get(field)}')
+        if gold['size'] != snap['size']:
+            problems.append(f'{key}: image size {gold["size"]} -> {snap["size"]}')
+        bits = bin(int(gold['dhash'], 16) ^ int(snap['dhash'], 16)).count('1')
+        thumb_a = np.frombuffer(base64.b64decode(gold['thumbnail']), dtype=np.uint8).astype(float)
+        thumb_b = np.frombuffer(base64.b64decode(snap['thumbnail']), dtype=np.uint8).astype(float)
+        diff = np.abs(thumb_a - thumb_b).mean()
+        if bits > HASH_TOLERANCE or diff > THUMB_TOLERANCE:
+            problems.append(f'{key}: image changed (dhash bits {bits}, thumbnail diff {diff:.2f})')
+    return problems
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compare every TESTS figure and statistic against golden snapshots.')
+    parser.add_argument('tests', nargs='*', help='only these TESTS names (default: all)')
+    parser.add_argument('--update', action='store_true', help='rewrite the golden file from the current output')
+    parser.add_argument('--workers', type=int, default=None, help='parallel render processes (default: all cores)')
+    parser.add_argument('--golden', default=GOLDEN_PATH)
+    args = parser.parse_args()
+
+    current = collect(args.tests, args.workers)
+    golden = {}
+    if os.path.exists(args.golden):
+        with open(args.golden) as f:
+            golden = json.load(f)
+
+    if args.update:
+        golden.update(current)
+        os.makedirs(os.path.dirname(args.golden), exist_ok=True)
+        with open(args.golden, 'w') as f:
+            json.dump(golden, f, indent=1, sort_keys=True)
+        print(f'Updated {len(current)} snapshot(s) in {args.golden}')
+        sys.exit(0)
+
+    problems = compare(current, golden)
+    for line in problems:
+        print(line)
+    print(f'{len(current)} snapshot(s) checked, {len(problems)} problem(s)')
+    sys.exit(1 if problems else 0)
@@ -1,14 +1,17 @@
 import os
 import itertools
-import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 from scipy.stats import linregress
+from corr_engine import corr_matrices, significance_marks
+from bootstrap import bootstrap_pairs, ci_text, code_version
+from result_store import ResultStore
+from dataset import load_survey
 
-paths = {
-    'resnstu': 'public/res+stu.csv',
-    'res':     'public/residents.csv',
-    'stu':     'public/students.csv',
+views = {
+    'resnstu': 'combined',
+    'res':     'residents',
+    'stu':     'students',
 }
 
 drop_t = ['Q17t: Q1 other','Q27t: others','Q37t: other']
@@ -30,18 +33,26 @@ def univariate_filter(df, thresh=3):
     return df[mask].reset_index(drop=True)
 
 os.makedirs('plots', exist_ok=True)
+# bootstrap tables are kept in a result store only when one is named:
+#     STATS_RESULT_STORE=results.sqlite python analysis/stats_analysis.py
+store_path = os.environ.get('STATS_RESULT_STORE')
+store = ResultStore(store_path) if store_path else None
+survey = load_survey()
 
-for key, path in paths.items():
-    df = pd.read_csv(path)
-    df = preprocess(df)
+for key, view in views.items():
+    df = preprocess(survey.view(view))
     df = univariate_filter(df)
     num = df.select_dtypes(include='number')
     num = num.loc[:, num.std(ddof=0) > 0]
 
     # save correlation matrix
-    m = num.corr()
+    cm = corr_matrices(num)
+    m = cm['r']
+    marks = significance_marks(cm['p_adj'].values)
     fig, ax = plt.subplots(figsize=(10,8))
     im = ax.imshow(m, vmin=-1, vmax=1, cmap='RdBu')
+    for i, j in zip(*np.nonzero(marks != '')):
+        ax.text(j, i, marks[i, j], ha='center', va='center', fontsize=4)
     ax.set_xticks(range(len(m))); ax.set_yticks(range(len(m)))
     ax.set_xticklabels(m.columns, rotation=90, fontsize=6)
     ax.set_yticklabels(m.columns, fontsize=6)
@@ -51,7 +62,11 @@ for key, path in paths.items():
     # scatterplots
     os.makedirs(f'plots/{key}', exist_ok=True)
     cols = num.columns.tolist()
-    for i,(xcol,ycol) in enumerate(itertools.combinations(cols,2),1):
+    pairs = list(itertools.combinations(cols,2))
+    compute = lambda: bootstrap_pairs(num, pairs, reps=10000, seed=0)
+    spec = {'reps': 10000, 'seed': 0, 'pairs': pairs, 'code': code_version()}
+    boot = store.frame('bootstrap_pairs', num, spec, compute) if store else compute()
+    for i,(xcol,ycol) in enumerate(pairs,1):
         x = num[xcol]; y = num[ycol]
         mask = x.notna() & y.notna() & (x.std(ddof=0)>0) & (y.std(ddof=0)>0)
         x,y = x[mask], y[mask]
@@ -67,7 +82,9 @@ for key, path in paths.items():
         ax.plot(x,line,linewidth=1,color='black')
         ax.set_xlabel(xcol,fontsize=6); ax.set_ylabel(ycol,fontsize=6)
         ax.set_title(f'{xcol} vs {ycol}',fontsize=8)
-        legend = f'a={slope:.2f}, b={intercept:.2f}\nr={r:.2f}, R²={r*r:.2f}'
+        ci = boot.loc[(xcol, ycol)]
+        legend = (f'a={slope:.2f} {ci_text(ci, "slope")}, b={intercept:.2f}\n'
+                  f'r={r:.2f} {ci_text(ci, "r")}, R²={r*r:.2f}')
         ax.legend([legend],fontsize=6,loc='best')
         fig.savefig(f'plots/{key}/{key}_{i}.png',dpi=300)
         plt.close(fig)
@@ -0,0 +1,29 @@
+import functools
+import hashlib
+import os
+import importlib.util
+
+# public/stats_code.py is written for Pyodide and served as a static file, so
+# it is loaded by path rather than imported as a package module.
+STATS_CODE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                               '..', 'public', 'stats_code.py')
+
+_module = None
+
+
+def load_stats_code(path=STATS_CODE_PATH):
+    global _module
+    if _module is None:
+        spec = importlib.util.spec_from_file_location('stats_code', path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _module = module
+    return _module
+
+
+@functools.lru_cache(maxsize=None)
+def stats_code_version(path=STATS_CODE_PATH):
+    # content hash of stats_code.py, so stored results from an older version
+    # of the tests are never served for the current one
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()[:16]
@@ -0,0 +1,243 @@
+import argparse
+import gc
+import json
+import os
+import signal
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import matplotlib
+matplotlib.use('Agg')
+from stats_loader import load_stats_code
+from result_store import ResultStore, run_test
+
+##############################################################################
+#     HEADLESS HTTP SERVICE FOR THE TESTS REGISTRY
+##############################################################################
+# GET  /tests                          -> names of every TESTS entry
+# POST /tests/<name>?mode=render       -> {"result": {...}, "image": "<base64 png>"}
+# POST /tests/<name>?mode=compute      -> {"result": {...}}
+# The POST body is the same JSON object of parameters runTestFunction sends;
+# an optional "ci_levels": [...] adds intervals at those confidence levels.
+#
+# stats_code.py is loaded and one figure is rendered in the parent before
+# forking, so every worker starts with scipy/matplotlib imported and font and
+# mathtext caches already built; the workers then share the listening socket.
+#
+# Every response closes its connection and a client that goes quiet is
+# dropped after `timeout` seconds: a worker serves one connection at a time,
+# so a keep-alive client left open would otherwise hold it indefinitely.
+#
+# With --store, results and figures are read from and written to a
+# ResultStore, so a request that was answered before is a single lookup.
+
+
+_stores = {}
+
+
+def _store(path):
+    # one connection per process: SQLite connections must not cross a fork
+    if path is None:
+        return None
+    key = (path, os.getpid())
+    if key not in _stores:
+        _stores[key] = ResultStore(path)
+    return _stores[key]
+
+
+class StatsHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    timeout = 5
+    quiet = True
+    store_path = None
+
+    def end_headers(self):
+        self.send_header('Connection', 'close')
+        super().end_headers()
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+    def _send(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_OPTIONS(self):
+        self.send_response(204)
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def do_GET(self):
+        path = urlparse(self.path).path.rstrip('/')
+        if path == '/tests':
+            self._send(200, {'tests': sorted(load_stats_code().TESTS)})
+        elif path == '/health':
+            self._send(200, {'status': 'ok', 'pid': os.getpid()})
+        else:
+            self._send(404, {'error': f'Unknown path {path!r}.'})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        parts = url.path.strip('/').split('/')
+        if len(parts) != 2 or parts[0] != 'tests':
+            return self._send(404, {'error': f'Unknown path {url.path!r}.'})
+        name = parts[1]
+        mode = parse_qs(url.query).get('mode', ['render'])[0]
+
+        sc = load_stats_code()
+        if name not in sc.TESTS:
+            return self._send(404, {'error': f'Unknown test {name!r}.'})
+        if mode not in ('render', 'compute'):
+            return self._send(400, {'error': "mode must be 'render' or 'compute'."})
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            params = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            return self._send(400, {'error': 'Body must be a JSON object of test parameters.'})
+
+        if not isinstance(params, dict):
+            return self._send(400, {'error': 'Body must be a JSON object of test parameters.'})
+        try:
+            out = run_test(name, params, render=mode == 'render', store=_store(self.store_path))
+            payload = {'test': name, 'result': out['result']}
+            if out['confidence_intervals']:
+                payload['confidence_intervals'] = out['confidence_intervals']
+            if mode == 'render':
+                payload['image'] = out['image']
+        except (TypeError, ValueError) as e:
+            return self._send(400, {'error': str(e)})
+        except Exception as e:
+            return self._send(500, {'error': f'{type(e).__name__}: {e}'})
+        self._send(200, payload)
+
+
+def warm_up():
+    sc = load_stats_code()
+    sc.TESTS['one_sample_t_test'](n=25, s=8, x_bar=52, mu=50, alpha=0.05, tail_type=3)
+    sc.TESTS['chi_square_gof_test'](observed=[10, 20, 30], expected=[15, 25, 20], alpha=0.05)
+    # keep the warmed-up heap out of the collector so forked workers do not
+    # dirty (and copy) the shared pages during their first collections
+    gc.collect()
+    if hasattr(gc, 'freeze'):
+        gc.freeze()
+
+
+def serve(host='127.0.0.1', port=8765, workers=os.cpu_count() or 1, quiet=True, memory_ceiling=None,
+          store=None):
+    StatsHandler.quiet = quiet
+    StatsHandler.store_path = store
+    warm_up()
+    # each worker trims its caches once its RSS passes the ceiling
+    load_stats_code().set_memory_ceiling(memory_ceiling)
+    server = HTTPServer((host, port), StatsHandler)
+    print(f'Serving TESTS on http://{host}:{server.server_port} with {workers} worker(s)')
+
+    if workers <= 1 or not hasattr(os, 'fork'):
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
+        return
+
+    # losers of the accept race get BlockingIOError, which serve_forever
+    # treats as "no request" instead of blocking the worker
+    server.socket.setblocking(False)
+    children = []
+    for _ in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            try:
+                server.serve_forever()
+            finally:
+                os._exit(0)
+        children.append(pid)
+
+    def stop(signum, frame):
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    for pid in children:
+        try:
+            os.waitpid(pid, 0)
+        except ChildProcessError:
+            pass
+    server.server_close()
+
+
+def check_keepalive(host='127.0.0.1', port=8765, timeout=3):
+    # two clients that both ask for keep-alive must each get an answer
+    # while the other's connection is still open
+    from http.client import HTTPConnection
+    clients = [HTTPConnection(host, port, timeout=timeout) for _ in range(2)]
+    try:
+        for conn in clients:
+            conn.request('GET', '/health', headers={'Connection': 'keep-alive'})
+        for conn in clients:
+            resp = conn.getresponse()
+            resp.read()
+            if resp.status != 200:
+                raise RuntimeError(f'/health returned {resp.status}.')
+    finally:
+        for conn in clients:
+            conn.close()
+
+
+def _check(workers=1):
+    # serve on a free port in a child process and run check_keepalive
+    import socket
+    import time
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    pid = os.fork()
+    if pid == 0:
+        try:
+            serve('127.0.0.1', port, workers)
+        finally:
+            os._exit(0)
+    try:
+        for _ in range(100):
+            try:
+                check_keepalive('127.0.0.1', port)
+                break
+            except ConnectionRefusedError:
+                time.sleep(0.2)
+        check_keepalive('127.0.0.1', port)
+        print(f'keep-alive check passed with {workers} worker(s)')
+    finally:
+        os.kill(pid, signal.SIGTERM)
+        os.waitpid(pid, 0)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Serve the stats_code.py TESTS registry over HTTP.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--verbose', action='store_true')
+    parser.add_argument('--memory-ceiling', type=int, default=None, metavar='MB',
+                        help='trim render caches in a worker whose RSS exceeds this')
+    parser.add_argument('--store', metavar='PATH', help='serve and keep results in this result store')
+    parser.add_argument('--check', action='store_true',
+                        help='start a server on a free port and check that concurrent keep-alive clients are served')
+    args = parser.parse_args()
+    if args.check:
+        _check(args.workers)
+        raise SystemExit
+    serve(args.host, args.port, args.workers, quiet=not args.verbose, memory_ceiling=args.memory_ceiling,
+          store=args.store)
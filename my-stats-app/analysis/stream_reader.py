@@ -0,0 +1,143 @@
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from sketches import Counts, Moments, QuantileSketch
+
+##############################################################################
+#     CHUNKED SURVEY READER WITH A FIXED, INFERRED SCHEMA
+##############################################################################
+# Survey exports mark skipped answers with '-'; mapping them to NaN inside
+# read_csv keeps numeric columns float64 at parse time instead of leaving
+# them as object columns that need pd.to_numeric(errors='coerce') later.
+PLACEHOLDERS = ['-', '']
+
+
+def infer_schema(path, sample_rows=2000, categorical=(), numeric=(), text=(),
+                 max_levels=6, na_values=PLACEHOLDERS):
+    sample = pd.read_csv(path, nrows=sample_rows, dtype=str, na_values=na_values)
+    schema = {}
+    for col in sample.columns:
+        vals = sample[col].dropna()
+        num = pd.to_numeric(vals, errors='coerce')
+        if col in text:
+            kind = 'text'
+        elif col in categorical:
+            kind = 'categorical'
+        elif col in numeric:
+            kind = 'numeric'
+        elif vals.empty or num.isna().any():
+            # free-text columns such as Q17t/Q27t/Q37t are mostly empty
+            kind = 'text'
+        elif (num == np.round(num)).all() and num.nunique() <= max_levels:
+            kind = 'categorical'
+        else:
+            kind = 'numeric'
+        schema[col] = kind
+    return schema
+
+
+def read_chunks(path, schema, chunksize=50_000, keep_text=False, na_values=PLACEHOLDERS):
+    cols = [c for c, kind in schema.items() if keep_text or kind != 'text']
+    dtypes = {c: (object if schema[c] == 'text' else 'float64') for c in cols}
+    reader = pd.read_csv(path, usecols=cols, dtype=dtypes, na_values=na_values,
+                         chunksize=chunksize)
+    for chunk in reader:
+        yield chunk[cols]
+
+
+class RunningAggregates:
+    # per-stream sketches (sketches.py): merging the aggregates of several
+    # files or processes gives the aggregates of all their rows
+    def __init__(self, schema, crosstabs=(), quantiles=()):
+        self.columns = [c for c, kind in schema.items() if kind != 'text']
+        self.crosstab_pairs = [tuple(pair) for pair in crosstabs]
+        self.rows = 0
+        self.moments = Moments(self.columns)
+        self.tables = Counts(self.crosstab_pairs)
+        self.quantiles = {c: QuantileSketch() for c in quantiles}
+
+    def update(self, chunk):
+        self.moments.update(chunk[self.columns])
+        self.tables.update(chunk)
+        for c, sketch in self.quantiles.items():
+            sketch.update(chunk[c])
+        self.rows += len(chunk)
+        return self
+
+    def merge(self, other):
+        self.moments.merge(other.moments)
+        self.tables.merge(other.tables)
+        for c, sketch in self.quantiles.items():
+            sketch.merge(other.quantiles[c])
+        self.rows += other.rows
+        return self
+
+    def counts(self):
+        return self.moments.counts()
+
+    def sums(self):
+        return self.moments.means().fillna(0) * self.counts()
+
+    def means(self):
+        return self.moments.means()
+
+    def variances(self, ddof=1):
+        return self.moments.variances(ddof)
+
+    def corr(self):
+        return self.moments.corr()
+
+    def crosstab(self, a, b):
+        return self.tables.table(a, b)
+
+    def iqr_fences(self, col, whisker=1.5):
+        return self.quantiles[col].iqr_fences(whisker)
+
+
+def _aggregate_file(path, schema, crosstabs=(), quantiles=(), chunksize=50_000):
+    agg = RunningAggregates(schema, crosstabs, quantiles)
+    for chunk in read_chunks(path, schema, chunksize):
+        agg.update(chunk)
+    return agg
+
+
+def stream_aggregates(paths, schema=None, crosstabs=(), chunksize=50_000, quantiles=(), workers=1):
+    # one file or a list of files sharing a schema; with workers > 1 each file
+    # is reduced in its own process and the results are merged
+    paths = [paths] if isinstance(paths, str) else list(paths)
+    schema = infer_schema(paths[0]) if schema is None else schema
+    args = (schema, crosstabs, quantiles, chunksize)
+    if workers <= 1 or len(paths) == 1:
+        parts = [_aggregate_file(path, *args) for path in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(_aggregate_file, paths, *([a] * len(paths) for a in args)))
+    agg = parts[0]
+    for part in parts[1:]:
+        agg.merge(part)
+    return agg
+
+
+if __name__ == '__main__':
+    from stats_loader import load_stats_code
+
+    paths = sys.argv[1:] or ['public/survey.csv']
+    schema = infer_schema(paths[0])
+    for kind in ('numeric', 'categorical', 'text'):
+        print(f'{kind}:', [c for c, k in schema.items() if k == kind])
+    agg = stream_aggregates(paths, schema, crosstabs=[('GENDER', 'Q1: cold symptom')],
+                            quantiles=['Q7: sleep hrs'], workers=len(paths))
+    print(f'\nrows: {agg.rows}')
+    print(pd.DataFrame({'n': agg.counts(), 'mean': agg.means(), 'sd': agg.variances() ** 0.5}))
+    table = agg.crosstab('GENDER', 'Q1: cold symptom')
+    print(table)
+    print('Q7 IQR fences:', agg.iqr_fences('Q7: sleep hrs'))
+
+    # the tests run on the merged sketches, never on the rows themselves
+    sc = load_stats_code()
+    res = sc.TEST_STATS['chi_square_independence_test'](observed_table=table.values.tolist(), alpha=0.05)
+    print(f"chi-square GENDER x Q1: {res['statistic']:.3f}, p={res['p_value']:.4f} ({res['method']})")
+    res = sc.TEST_STATS['one_sample_t_test'](**agg.moments.t_params('Q7: sleep hrs'), mu=56, alpha=0.05, tail_type=3)
+    print(f"t-test Q7 sleep hrs vs 56: t={res['statistic']:.3f}, p={res['p_value']:.4f}")
@@ -0,0 +1,118 @@
+import sys
+import numpy as np
+import pandas as pd
+from scipy.stats import t as t_dist
+from corr_engine import dataset_key, corr_from_moments, corr_pvalues, adjust_pvalues
+
+##############################################################################
+#     ONE GROUPED PASS OVER EVERY SUBGROUP (GRADE, GENDER, SOURCE, ...)
+##############################################################################
+# The per-group pairwise-complete co-moments are stacked into (G, P, P)
+# arrays with a single einsum over a one-hot group matrix; correlations,
+# regressions and group-vs-rest Welch tests for every group are then read
+# from those arrays with broadcasting, instead of re-running each analysis
+# on a separate CSV copy.
+
+_cache = {}
+
+
+def combine(frames, source_col='source'):
+    return pd.concat([df.assign(**{source_col: name}) for name, df in frames.items()],
+                     ignore_index=True)
+
+
+def grouped_comoments(X, codes, n_groups):
+    M = (~np.isnan(X)).astype(float)
+    X0 = np.where(M > 0, X, 0.0)
+    G = np.zeros((len(codes), n_groups))
+    G[np.arange(len(codes)), codes] = 1.0
+    n = np.einsum('rg,ri,rj->gij', G, M, M, optimize=True)
+    sx = np.einsum('rg,ri,rj->gij', G, X0, M, optimize=True)
+    sxx = np.einsum('rg,ri,rj->gij', G, X0 * X0, M, optimize=True)
+    sxy = np.einsum('rg,ri,rj->gij', G, X0, X0, optimize=True)
+    return n, sx, sxx, sxy
+
+
+def _welch_vs_rest(n, s, ss):
+    # n, s, ss: (G, P) per-group counts, sums and sums of squares
+    N, S, SS = n.sum(0), s.sum(0), ss.sum(0)
+    n2, s2, ss2 = N - n, S - s, SS - ss
+    with np.errstate(divide='ignore', invalid='ignore'):
+        m1, m2 = s / n, s2 / n2
+        v1 = (ss - s * m1) / (n - 1)
+        v2 = (ss2 - s2 * m2) / (n2 - 1)
+        a, b = v1 / n, v2 / n2
+        t_stat = (m1 - m2) / np.sqrt(a + b)
+        dof = (a + b) ** 2 / (a * a / (n - 1) + b * b / (n2 - 1))
+        p = 2 * t_dist.sf(np.abs(t_stat), dof)
+    ok = (n > 1) & (n2 > 1)
+    nan = lambda v: np.where(ok, v, np.nan)
+    return nan(m1), nan(m2), nan(t_stat), nan(dof), nan(p)
+
+
+def sweep(df, by, cols, correction='fdr_bh'):
+    by = [by] if isinstance(by, str) else list(by)
+    cols = list(cols)
+    key = (dataset_key(df[by + cols]), tuple(by), tuple(cols), correction)
+    if key in _cache:
+        return _cache[key]
+
+    grouped = df.groupby(by, sort=True, dropna=True)
+    # rows with a missing key get NaN from ngroup; code them -1 so keep drops them
+    codes = grouped.ngroup().fillna(-1).to_numpy(dtype=int)
+    groups = grouped.size().index.tolist()
+    keep = codes >= 0
+    X = df[cols].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float)[keep]
+    n, sx, sxx, sxy = grouped_comoments(X, codes[keep], len(groups))
+
+    r = corr_from_moments(n, sx, sxx, sxy)
+    p = corr_pvalues(r, n)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slope = (n * sxy - sx * np.swapaxes(sx, -1, -2)) / (n * sxx - sx * sx)
+        intercept = (np.swapaxes(sx, -1, -2) - slope * sx) / n
+
+    diag = np.arange(len(cols))
+    gn, gs, gss = n[:, diag, diag], sx[:, diag, diag], sxx[:, diag, diag]
+    m1, m2, t_stat, dof, t_p = _welch_vs_rest(gn, gs, gss)
+
+    iu = np.triu_indices(len(cols), 1)
+    off = ~np.eye(len(cols), dtype=bool)
+    xi, yi = np.nonzero(off)
+    results = {}
+    for g, name in enumerate(groups):
+        gkey = name if isinstance(name, tuple) else (name,)
+        rg, pg = r[g].copy(), p[g].copy()
+        np.fill_diagonal(rg, np.where(np.diag(n[g]) >= 2, 1.0, np.nan))
+        np.fill_diagonal(pg, np.nan)
+        p_adj = np.full(pg.shape, np.nan)
+        p_adj[iu] = adjust_pvalues(pg[iu], correction)
+        p_adj.T[iu] = p_adj[iu]
+        frame = lambda a: pd.DataFrame(a, index=cols, columns=cols)
+        results[gkey] = {
+            'n': frame(n[g].astype(int)), 'r': frame(rg), 'p': frame(pg), 'p_adj': frame(p_adj),
+            # slope[i, j] regresses column j on column i
+            'regression': pd.DataFrame({
+                'x': [cols[i] for i in xi], 'y': [cols[j] for j in yi],
+                'slope': slope[g][xi, yi], 'intercept': intercept[g][xi, yi],
+                'r': r[g][xi, yi], 'p': p[g][xi, yi], 'n': n[g][xi, yi].astype(int),
+            }),
+            'tests': pd.DataFrame({
+                'n': gn[g].astype(int), 'mean': m1[g], 'rest_mean': m2[g],
+                't': t_stat[g], 'df': dof[g], 'p': t_p[g],
+                'p_adj': adjust_pvalues(t_p[g], correction),
+            }, index=cols),
+        }
+    _cache[key] = results
+    return results
+
+
+if __name__ == '__main__':
+    from dataset import load_survey
+    df = load_survey().table
+    cols = ['Q6: hrs exercise', 'Q7: sleep hrs', 'Q15: rate exercise', 'Q16: rate diet',
+            'Q17: rate sleep', 'Q18: rate healthiness']
+    by = sys.argv[1:] or ['source']
+    for group, res in sweep(df, by, cols).items():
+        print(f'\n{dict(zip(by, group))}')
+        print(res['r'].round(2))
+        print(res['tests'].round(4))
@@ -0,0 +1,228 @@
+import numpy as np
+import pandas as pd
+from stats_loader import load_stats_code
+from corr_engine import adjust_pvalues
+
+##############################################################################
+#     RUN THE stats_code.py TESTS DIRECTLY ON SURVEY COLUMNS
+##############################################################################
+# Each helper reduces the data to the summary numbers a TESTS entry expects
+# (one groupby/crosstab per call) and hands them to the compute-only
+# TEST_STATS function; render=True also returns the TESTS image.
+
+
+def _run(name, params, render=False):
+    sc = load_stats_code()
+    res = sc.TEST_STATS[name](**params)
+    res['params'] = params
+    if render:
+        res['image'] = sc.TESTS[name](**params)
+    return res
+
+
+def _numeric(df, col):
+    return pd.to_numeric(df[col], errors='coerce')
+
+
+def _two_groups(levels, groups):
+    if groups is None:
+        groups = sorted(levels)
+    groups = list(groups)
+    if len(groups) != 2:
+        raise ValueError(f'Expected exactly two groups, got {groups}.')
+    return groups
+
+
+def mean_test(df, col, mu, alpha=0.05, tail_type=3, render=False):
+    x = _numeric(df, col).dropna()
+    params = dict(n=int(x.size), s=float(x.std()), x_bar=float(x.mean()), mu=mu,
+                  alpha=alpha, tail_type=tail_type)
+    return _run('one_sample_t_test', params, render)
+
+
+def compare_means(df, col, by, groups=None, alpha=0.05, tail_type=3, render=False):
+    summary = _numeric(df, col).dropna().groupby(df[by]).agg(['count', 'mean', 'std'])
+    g1, g2 = _two_groups(summary.index, groups)
+    a, b = summary.loc[g1], summary.loc[g2]
+    params = dict(n1=int(a['count']), n2=int(b['count']), s1=float(a['std']), s2=float(b['std']),
+                  x_bar1=float(a['mean']), x_bar2=float(b['mean']), alpha=alpha, tail_type=tail_type)
+    return _run('two_independent_t_test', params, render)
+
+
+def paired_means(df, col1, col2, alpha=0.05, tail_type=3, render=False):
+    d = (_numeric(df, col1) - _numeric(df, col2)).dropna()
+    params = dict(n=int(d.size), s_d=float(d.std()), d_bar=float(d.mean()),
+                  alpha=alpha, tail_type=tail_type)
+    return _run('two_dependent_t_test', params, render)
+
+
+def proportion_test(df, col, success, p, alpha=0.05, tail_type=3, render=False):
+    vals = df[col].dropna()
+    hits = vals.isin(np.atleast_1d(success))
+    params = dict(n=int(hits.size), p_hat=float(hits.mean()), p=p, alpha=alpha, tail_type=tail_type)
+    return _run('one_sample_proportion_z_test', params, render)
+
+
+def compare_proportions(df, col, success, by, groups=None, alpha=0.05, tail_type=3, render=False):
+    vals = df[col].dropna()
+    hits = vals.isin(np.atleast_1d(success)).groupby(df.loc[vals.index, by]).agg(['sum', 'count'])
+    g1, g2 = _two_groups(hits.index, groups)
+    params = dict(x1=int(hits.loc[g1, 'sum']), x2=int(hits.loc[g2, 'sum']),
+                  n1=int(hits.loc[g1, 'count']), n2=int(hits.loc[g2, 'count']),
+                  alpha=alpha, tail_type=tail_type)
+    return _run('two_independent_proportion_z_test', params, render)
+
+
+def chi_square_test(df, row, col, alpha=0.05, kind='independence', render=False):
+    table = pd.crosstab(df[row], df[col])
+    params = dict(observed_table=table.to_numpy().tolist(), alpha=alpha)
+    res = _run(f'chi_square_{kind}_test', params, render)
+    res['rows'], res['columns'] = table.index.tolist(), table.columns.tolist()
+    return res
+
+
+def goodness_of_fit(df, col, expected=None, alpha=0.05, render=False):
+    counts = df[col].dropna().value_counts().sort_index()
+    if expected is None:
+        props = pd.Series(1.0, index=counts.index)
+    else:
+        props = pd.Series(expected, dtype=float)
+        counts = counts.reindex(props.index, fill_value=0)
+    props = props / props.sum()
+    params = dict(observed=counts.to_numpy().tolist(),
+                  expected=(props.to_numpy() * counts.sum()).tolist(), alpha=alpha)
+    res = _run('chi_square_gof_test', params, render)
+    res['categories'] = counts.index.tolist()
+    return res
+
+
+def goodness_of_fit_all(df, cols, by=None, expected=None, alpha=0.05):
+    # one GoF row per column (per level of `by`, e.g. survey wave), all
+    # tested in one chi_square_gof_test_bulk call; expected may be None
+    # (uniform), 'poisson' or 'binomial' for numeric categories
+    keys, rows, cats = [], [], []
+    groups = [(None, df)] if by is None else df.groupby(by)
+    for level, part in groups:
+        for col in cols:
+            counts = part[col].dropna().value_counts().sort_index()
+            keys.append((col,) if by is None else (col, level))
+            rows.append(counts.to_numpy(dtype=float))
+            cats.append(counts.index.to_numpy(dtype=float) if expected in ('poisson', 'binomial') else None)
+    res = load_stats_code().chi_square_gof_test_bulk(
+        rows, expected, alpha, categories=cats if expected in ('poisson', 'binomial') else None)
+    index = pd.MultiIndex.from_tuples(keys, names=['column'] + ([] if by is None else [by]))
+    return pd.DataFrame({key: res[key] for key in ('k', 'n', 'statistic', 'df', 'p_value', 'reject',
+                                                   'valid', 'min_expected', 'small_expected')},
+                        index=index)
+
+
+def compare_groups(df, col, by, alpha=0.05, method='anova', render=False):
+    # the whole column and its labels go in flat; the groups are split by
+    # np.bincount inside the test, not by a loop here
+    x = _numeric(df, col)
+    keep = x.notna() & df[by].notna()
+    params = dict(alpha=alpha, values=x[keep].tolist(), labels=df.loc[keep, by].astype(str).tolist())
+    name = 'one_way_anova_test' if method == 'anova' else 'kruskal_wallis_test'
+    return _run(name, params, render)
+
+
+def rank_sum_test(df, col, by, groups=None, alpha=0.05, tail_type=3, render=False):
+    x = _numeric(df, col)
+    g1, g2 = _two_groups(df[by].dropna().unique(), groups)
+    params = dict(x=x[df[by] == g1].dropna().tolist(), y=x[df[by] == g2].dropna().tolist(),
+                  alpha=alpha, tail_type=tail_type)
+    return _run('mann_whitney_u_test', params, render)
+
+
+def signed_rank_test(df, col1, col2, alpha=0.05, tail_type=3, render=False):
+    pairs = pd.concat([_numeric(df, col1), _numeric(df, col2)], axis=1).dropna()
+    params = dict(x=pairs.iloc[:, 0].tolist(), y=pairs.iloc[:, 1].tolist(),
+                  alpha=alpha, tail_type=tail_type)
+    return _run('wilcoxon_signed_rank_test', params, render)
+
+
+##############################################################################
+#     ONE TWO-GROUP TEST PER LEVEL OF ANOTHER COLUMN (BULK)
+##############################################################################
+# One groupby builds the summary table (a row per school, district, ...) and
+# the BULK_TESTS variant tests every row at once. Levels missing a group or
+# too small to test come back with valid=False and NaN p-values.
+
+
+def _bulk_table(name, summary, alpha, tail_type):
+    res = load_stats_code().bulk_test(name, summary, alpha, tail_type)
+    out = summary.copy()
+    for key in ('statistic', 'df', 'p_value', 'critical_value', 'reject', 'valid', 'estimate',
+                'ci_low', 'ci_high'):
+        if res[key] is not None:
+            out[key] = res[key]
+    return out
+
+
+def compare_means_within(df, col, by, within, groups=None, alpha=0.05, tail_type=3):
+    stats = _numeric(df, col).dropna().groupby([df[within], df[by]]).agg(['count', 'mean', 'std'])
+    stats = stats.unstack(by)
+    g1, g2 = _two_groups(stats.columns.get_level_values(by).unique(), groups)
+    summary = pd.DataFrame({'n1': stats[('count', g1)], 'n2': stats[('count', g2)],
+                            's1': stats[('std', g1)], 's2': stats[('std', g2)],
+                            'x_bar1': stats[('mean', g1)], 'x_bar2': stats[('mean', g2)]})
+    return _bulk_table('two_independent_t_test', summary, alpha, tail_type)
+
+
+def compare_proportions_within(df, col, success, by, within, groups=None, alpha=0.05, tail_type=3):
+    vals = df[col].dropna()
+    hits = vals.isin(np.atleast_1d(success))
+    counts = hits.groupby([df.loc[vals.index, within], df.loc[vals.index, by]]).agg(['sum', 'count'])
+    counts = counts.unstack(by)
+    g1, g2 = _two_groups(counts.columns.get_level_values(by).unique(), groups)
+    summary = pd.DataFrame({'x1': counts[('sum', g1)], 'x2': counts[('sum', g2)],
+                            'n1': counts[('count', g1)], 'n2': counts[('count', g2)]})
+    return _bulk_table('two_independent_proportion_z_test', summary, alpha, tail_type)
+
+
+KINDS = {
+    'mean': mean_test,
+    'compare_means': compare_means,
+    'paired_means': paired_means,
+    'proportion': proportion_test,
+    'compare_proportions': compare_proportions,
+    'chi_square': chi_square_test,
+    'goodness_of_fit': goodness_of_fit,
+    'compare_groups': compare_groups,
+    'rank_sum': rank_sum_test,
+    'signed_rank': signed_rank_test,
+}
+
+
+def run_comparisons(df, specs, render=False, correction=None, alpha=0.05):
+    rows = []
+    for spec in specs:
+        spec = dict(spec)
+        kind = spec.pop('kind')
+        res = KINDS[kind](df, render=render, **spec)
+        rows.append({'kind': kind, 'spec': spec, **res})
+    table = pd.DataFrame(rows)
+    if correction is not None and not table.empty:
+        table['p_adj'] = adjust_pvalues(table['p_value'].to_numpy(dtype=float), correction)
+        table['reject_adj'] = table['p_adj'] < alpha
+    return table
+
+
+if __name__ == '__main__':
+    from dataset import load_survey
+    df = load_survey().table
+    specs = [
+        {'kind': 'compare_means', 'col': 'Q7: sleep hrs', 'by': 'source',
+         'groups': ['students', 'residents']},
+        {'kind': 'compare_means', 'col': 'Q6: hrs exercise', 'by': 'GENDER'},
+        {'kind': 'chi_square', 'row': 'GENDER', 'col': 'Q1: cold symptom'},
+        {'kind': 'compare_groups', 'col': 'Q7: sleep hrs', 'by': 'GRADE'},
+        {'kind': 'compare_groups', 'col': 'Q7: sleep hrs', 'by': 'GRADE', 'method': 'kruskal'},
+        {'kind': 'rank_sum', 'col': 'Q17: rate sleep', 'by': 'GENDER'},
+        {'kind': 'signed_rank', 'col1': 'Q16: rate diet', 'col2': 'Q15: rate exercise'},
+        {'kind': 'compare_proportions', 'col': 'Q2: none', 'success': 1, 'by': 'source',
+         'groups': ['students', 'residents']},
+    ]
+    table = run_comparisons(df, specs, correction='holm')
+    print(table[['kind', 'test', 'statistic', 'df', 'p_value', 'reject', 'p_adj', 'reject_adj']].to_string())
+    print(compare_means_within(df, 'Q7: sleep hrs', 'GENDER', 'GRADE').to_string())
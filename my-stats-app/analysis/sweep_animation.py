@@ -0,0 +1,53 @@
+import argparse
+import json
+import time
+
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+from stats_loader import load_stats_code
+
+##############################################################################
+#     PARAMETER-SWEEP ANIMATIONS OF ANY TESTS ENTRY
+##############################################################################
+# Sweeps one parameter of a TESTS entry and writes the rejection region,
+# critical value, statistic and p-value as an animation (animate_sweep in
+# stats_code.py). The output extension picks the format: .gif, .png (APNG),
+# .webp, .mp4/.webm (needs ffmpeg) or no extension for a directory of frames.
+#
+#     python analysis/sweep_animation.py one_sample_t_test n --range 3 100 98 \
+#         --params '{"s": 8, "x_bar": 52, "mu": 50, "alpha": 0.05, "tail_type": 3}' n_sweep.gif
+
+
+def sweep_values(start=None, stop=None, num=None, values=None):
+    if values:
+        return [json.loads(v) for v in values.split(',')]
+    grid = np.linspace(float(start), float(stop), int(num))
+    if all(float(v).is_integer() for v in (start, stop)):
+        # integer endpoints (n, k, ...) sweep integers
+        return [int(v) for v in np.unique(np.round(grid))]
+    return grid.tolist()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Animate a TESTS entry over a range of one parameter.')
+    parser.add_argument('test', help='TESTS name, e.g. one_sample_t_test')
+    parser.add_argument('param', help='parameter to sweep, e.g. n or alpha')
+    parser.add_argument('out', help='.gif, .png, .webp, .mp4 or a directory for PNG frames')
+    parser.add_argument('--range', nargs=3, metavar=('START', 'STOP', 'NUM'))
+    parser.add_argument('--values', help='comma-separated values instead of --range')
+    parser.add_argument('--params', default='{}', help='JSON object of the other parameters')
+    parser.add_argument('--fps', type=float, default=10)
+    parser.add_argument('--dpi', type=int, default=100)
+    args = parser.parse_args()
+    if not args.values and not args.range:
+        parser.error('give --range START STOP NUM or --values')
+
+    start, stop, num = args.range or (None, None, None)
+    values = sweep_values(start, stop, num, args.values)
+    params = json.loads(args.params)
+    params.setdefault('alpha', 0.05)
+    t0 = time.perf_counter()
+    load_stats_code().animate_sweep(args.test, args.param, values, args.out,
+                                    fps=args.fps, dpi=args.dpi, **params)
+    print(f'{len(values)} frames -> {args.out} ({time.perf_counter() - t0:.1f}s)')
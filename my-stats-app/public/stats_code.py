@@ -1,7 +1,16 @@
 import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.offsetbox import TextArea, HPacker, VPacker, AnchoredOffsetbox
 import io
+import os
+import gc
 import base64
+import time
+import functools
+import tracemalloc
+from collections import deque
 
 ##############################################################################
 #                          HELPER FORMATTING FUNCTIONS
@@ -35,16 +44,160 @@ MARKER_SIZE = 8
 BIG_MARKER_SIZE = 8  #unify
 MULTIPLIER = 1.15
 
+##############################################################################
+#     PER-STAGE TIMING AND MEMORY INSTRUMENTATION
+##############################################################################
+# Every TESTS call records how long it spent in each stage (compute, figure,
+# plot, savefig, encode) into PROFILE_HISTORY; LAST_PROFILE holds the most
+# recent record. Peak memory is traced only when PROFILE["memory"] is on,
+# since tracemalloc slows rendering down noticeably.
+PROFILE = {"enabled": True, "memory": False}
+PROFILE_HISTORY = deque(maxlen=2000)
+LAST_PROFILE = {}
+_current_profile = None
+# while a TESTS render with ci_levels runs, the first result of each compute
+# stage function by name, so _with_ci_panel reuses it instead of recomputing
+_captured_results = None
+
+def _timed(stage):
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapped(*args, **kwargs):
+            rec = _current_profile
+            if rec is None:
+                out = func(*args, **kwargs)
+            else:
+                start = time.perf_counter()
+                try:
+                    out = func(*args, **kwargs)
+                finally:
+                    rec[stage] = rec.get(stage, 0.0) + time.perf_counter() - start
+            if _captured_results is not None:
+                _captured_results.setdefault(func.__name__, out)
+            return out
+        return wrapped
+    return decorator
+
+def profile_histogram(stage="total", bins=20, test=None):
+    vals = np.array([rec[stage] for rec in PROFILE_HISTORY
+                     if stage in rec and (test is None or rec["test"] == test)])
+    if vals.size == 0:
+        return {"stage": stage, "count": 0, "counts": [], "edges": []}
+    counts, edges = np.histogram(vals, bins=bins)
+    return {"stage": stage, "count": int(vals.size), "counts": counts.tolist(), "edges": edges.tolist()}
+
+def profile_summary():
+    stages = ("compute", "figure", "plot", "savefig", "encode", "total", "peak_memory")
+    summary = {}
+    for test in sorted({rec["test"] for rec in PROFILE_HISTORY}):
+        recs = [rec for rec in PROFILE_HISTORY if rec["test"] == test]
+        summary[test] = {"calls": len(recs)}
+        for stage in stages:
+            vals = np.array([rec[stage] for rec in recs if stage in rec])
+            if vals.size:
+                summary[test][stage] = {
+                    "mean": float(vals.mean()),
+                    "p50": float(np.percentile(vals, 50)),
+                    "p95": float(np.percentile(vals, 95)),
+                    "max": float(vals.max()),
+                }
+    return summary
+
+def reset_profiles():
+    PROFILE_HISTORY.clear()
+    LAST_PROFILE.clear()
+
+##############################################################################
+#     MATHTEXT PARSE CACHE
+##############################################################################
+# matplotlib caches mathtext parses per MathTextParser instance (50 entries),
+# but every savefig builds a fresh Agg renderer with a fresh parser, so no
+# parse ever survives from one render to the next. This swaps in one cache
+# shared by all parsers of the same output type, so the static strings
+# (formula templates, axis labels, H0, legend entries) are parsed only once.
+MATHTEXT_CACHE_SIZE = 512
+
+def _share_mathtext_cache(maxsize=MATHTEXT_CACHE_SIZE):
+    from matplotlib.mathtext import MathTextParser
+    parse = getattr(MathTextParser._parse_cached, "__wrapped__", None)
+    if parse is None or hasattr(MathTextParser._parse_cached, "shared_cache"):
+        return
+    parsers = {}
+
+    @functools.lru_cache(maxsize)
+    def shared_cache(output_type, s, *args):
+        return parse(parsers[output_type], s, *args)
+
+    def _parse_cached(self, s, *args):
+        output_type = getattr(self, "_output_type", getattr(self, "_output", None))
+        parsers.setdefault(output_type, self)
+        return shared_cache(output_type, s, *args)
+
+    _parse_cached.shared_cache = shared_cache
+    MathTextParser._parse_cached = _parse_cached
+
+def clear_mathtext_cache():
+    from matplotlib.mathtext import MathTextParser
+    cache = getattr(MathTextParser._parse_cached, "shared_cache", None)
+    if cache is not None:
+        cache.cache_clear()
+
+_share_mathtext_cache()
+
+##############################################################################
+#     MEMORY CEILING FOR LONG-RUNNING RENDER PROCESSES
+##############################################################################
+# When MEMORY["ceiling_mb"] is set, the resident set size is checked after
+# every render; above the ceiling the module's own caches and matplotlib's
+# font/text caches are dropped and freed memory is handed back to the OS.
+MEMORY = {"ceiling_mb": None, "trims": 0}
+
+def _rss_bytes():
+    # /proc is not available everywhere (e.g. Pyodide); no reading, no check
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+def trim_caches():
+    global _PNG_BUFFER
+    import matplotlib.font_manager as font_manager
+
+    clear_mathtext_cache()
+    font_manager._get_font.cache_clear()
+    _PNG_BUFFER = io.BytesIO()
+    gc.collect()
+    try:
+        import ctypes
+        ctypes.CDLL("libc.so.6").malloc_trim(0)
+    except (OSError, AttributeError):
+        pass
+    MEMORY["trims"] += 1
+
+def set_memory_ceiling(megabytes):
+    MEMORY["ceiling_mb"] = megabytes
+
+def _enforce_memory_ceiling(rec=None):
+    if not MEMORY["ceiling_mb"]:
+        return
+    rss = _rss_bytes()
+    if rss is None or rss <= MEMORY["ceiling_mb"] * 2**20:
+        return
+    trim_caches()
+    if rec is not None:
+        rec["trimmed_rss"] = rss
+
 ##############################################################################
 #     CREATE THE FIGURE WITH THE LEFT INFO BOX
 ##############################################################################
-def create_figure_with_info_box(info_text: str):
-    fig, (ax_info, ax_graph) = plt.subplots(
-        1, 2,
-        gridspec_kw={'width_ratios': [1, 4]},
-        figsize=(12, 8),
-        facecolor='#F0F2F5' 
-    )
+@_timed("figure")
+def create_figure_with_info_box(info_text: str, formula: str = None, value: float = None):
+    # built on Figure + FigureCanvasAgg directly so pyplot's figure manager
+    # never holds a reference; show_figure attaches one when needed
+    fig = Figure(figsize=(12, 8), facecolor='#F0F2F5')
+    FigureCanvasAgg(fig)
+    ax_info, ax_graph = fig.subplots(1, 2, gridspec_kw={'width_ratios': [1, 4]})
     #faf0e6
     #fig.patch.set_facecolor('FAF0E6')
     #ax_graph.set_facecolor('#F0F2F5')  
@@ -53,17 +206,37 @@ def create_figure_with_info_box(info_text: str):
 
     ax_info.axis("off")
  
-    ax_info.text(
-        0.5, 0.5, info_text,
-        ha="center", va="center", transform=ax_info.transAxes,
-        fontsize=16, color=DARK_GRAY
-        #bbox=dict(boxstyle="round,pad=1", ec=DARK_GRAY, lw=1.5, fc="none")
+    if formula is None:
+        ax_info.text(
+            0.5, 0.5, info_text,
+            ha="center", va="center", transform=ax_info.transAxes,
+            fontsize=16, color=DARK_GRAY
+            #bbox=dict(boxstyle="round,pad=1", ec=DARK_GRAY, lw=1.5, fc="none")
+        )
+        return fig, ax_info, ax_graph
+
+    # The formula template and its value are laid out as separate mathtext
+    # strings on one row: the template never changes, so its (expensive)
+    # \frac layout is parsed once and served from the mathtext cache.
+    text_props = dict(fontsize=16, color=DARK_GRAY)
+    lines = TextArea(info_text.rstrip("\n") + "\n\n", textprops=dict(ha="center", **text_props))
+    formula_row = HPacker(
+        children=[
+            TextArea(formula, textprops=text_props),
+            TextArea(f"$= {format_val(value)}$", textprops=text_props),
+        ],
+        align="baseline", pad=0, sep=0
     )
+    ax_info.add_artist(AnchoredOffsetbox(
+        loc="center", child=VPacker(children=[lines, formula_row], align="center", pad=0, sep=0),
+        frameon=False
+    ))
     return fig, ax_info, ax_graph
 
 ##############################################################################
 #     PLOT THE DISTRIBUTION (T OR Z) WITH THE SAME STYLE
 ##############################################################################
+@_timed("plot")
 def plot_test_distribution(
     ax_graph,
     distribution: str,    # "t" or "z"
@@ -300,6 +473,7 @@ def plot_test_distribution(
 
 
 
+@_timed("plot")
 def plot_chi_square_distribution(
     ax_graph,
     alpha: float,
@@ -368,33 +542,304 @@ def plot_chi_square_distribution(
 
 
 
+@_timed("plot")
+def plot_f_distribution(
+    ax_graph,
+    alpha: float,
+    test_stat: float,
+    p_value: float,
+    test_name: str,
+    dfn: float,
+    dfd: float,
+):
+    from scipy.stats import f
+
+    def vertical_line_with_marker(x_val, top_y, label_str, line_style, marker_style='.', marker_sz=10):
+        ax_graph.plot(
+            [x_val, x_val], [0, top_y],
+            color='#7E4794' if line_style == '--' else '#ff8ca1', linestyle=line_style, lw=2,
+            marker=marker_style, markersize=marker_sz,
+            markevery=[0],  #marker only at the bottom
+            label=label_str,
+            zorder=100
+        )
+
+    x_min = 0 if dfn > 2 else 1e-6
+    x_max = max(f.ppf(0.999, dfn, dfd), f.ppf(1 - alpha, dfn, dfd) * 1.5)
+    x_vals = np.linspace(x_min, x_max, 1000)
+    y_vals = np.minimum(f.pdf(x_vals, dfn, dfd), 1.0)
+    ax_graph.plot(x_vals, y_vals, label="$F$-distribution", color=COLOR_CURVE, lw=2)
+
+    f_crit = f.ppf(1 - alpha, dfn, dfd)
+    shade_vals = np.linspace(f_crit, x_max, 500)
+    shade_pdf = np.minimum(f.pdf(shade_vals, dfn, dfd), 1.0)
+    ax_graph.fill_between(shade_vals, shade_pdf, color=COLOR_SHADE, alpha=0.7, label=f"Critical region ($\\alpha={format_alpha(alpha)}$)")
+
+    top_y = min(f.pdf(f_crit, dfn, dfd) * MULTIPLIER, 1.0)
+    vertical_line_with_marker(f_crit, top_y, f"$F_c={format_val(f_crit)}$", '--')
+
+    boundary = max(x_min, min(x_max, test_stat))
+    top_stat = min(f.pdf(boundary, dfn, dfd) * MULTIPLIER, 1.0)
+    vertical_line_with_marker(boundary, top_stat, f"$F={format_val(test_stat)}$", '-')
+
+    ax_graph.plot([], [], ' ', label=f"$p-value = {format_scientific_latex(p_value)}$")
+
+    h0_x_pos = f.ppf(0.5, dfn, dfd)
+    h0_y_pos = min(f.pdf(h0_x_pos, dfn, dfd) * 0.45, 1.0)
+    ax_graph.text(h0_x_pos, h0_y_pos, r"$H_0$", fontsize=14, ha='center', va='center', color=DARK_GRAY)
+    ax_graph.set_xlabel("$F$", color=DARK_GRAY)
+    ax_graph.set_ylabel("$Probability$", color=DARK_GRAY)
+    ax_graph.set_title(test_name, color=DARK_GRAY)
+    ax_graph.set_xlim(x_min, x_max)
+    ax_graph.set_ylim(0, np.max(y_vals) * 1.35)
+    ax_graph.legend()
+
+
 
 ##############################################################################
-# 1) One-Sample T-Test
+#     SHARED COMPUTE HELPERS
 ##############################################################################
-def one_sample_t_test(n, s, x_bar, mu, alpha, tail_type=1):
-    from scipy.stats import t
-    df = n - 1
-    t_stat = (x_bar - mu) / (s / (n**0.5))
+def _tail_result(distribution, stat, alpha, tail_type, df=None):
+    from scipy.stats import t, norm
+
+    if distribution == "t":
+        cdf = lambda v: t.cdf(v, df)
+        ppf = lambda q: t.ppf(q, df)
+    else:
+        cdf = norm.cdf
+        ppf = norm.ppf
 
-    
     if tail_type == 1:
         # Left
-        t_crit = t.ppf(alpha, df)
-        crit_str = f"$t_c = {format_val(t_crit)}$"
-        p_value = t.cdf(t_stat, df)
-
+        crit = ppf(alpha)
+        p_value = cdf(stat)
     elif tail_type == 2:
         # Right
-        t_crit = t.ppf(1 - alpha, df)
-        crit_str = f"$t_c = {format_val(t_crit)}$"
-        p_value = 1 - t.cdf(t_stat, df)
+        crit = ppf(1 - alpha)
+        p_value = 1 - cdf(stat)
+    else:
+        # Both tails => crit is the positive bound of ±crit
+        crit = ppf(1 - alpha / 2)
+        p_value = 2 * (1 - cdf(abs(stat)))
+    return crit, p_value
+
+def _crit_str(label, crit, tail_type):
+    if tail_type in (1, 2):
+        return f"${label}_c = {format_val(crit)}$"
+    return f"${label}_c = \\pm\\,{format_val(crit)}$"
+
+def _to_native(val):
+    if isinstance(val, np.ndarray):
+        return val.tolist()
+    if isinstance(val, np.generic):
+        return val.item()
+    return val
+
+def _result(test, distribution, statistic, p_value, critical_value, alpha, tail_type=None, df=None, **extra):
+    res = {
+        "test": test,
+        "distribution": distribution,
+        "statistic": statistic,
+        "p_value": p_value,
+        "critical_value": critical_value,
+        "df": df,
+        "alpha": alpha,
+        "tail_type": tail_type,
+        "reject": bool(p_value < alpha),
+    }
+    res.update(extra)
+    return {k: _to_native(v) for k, v in res.items()}
 
+
+##############################################################################
+#     CONFIDENCE INTERVALS
+##############################################################################
+# Every z/t/proportion *_stats result also carries the point estimate, the
+# standard error of that estimate and the null value; an interval is then
+# estimate +/- crit * se, with crit from one ppf call over an array of
+# (two-sided) confidence levels.
+def confidence_interval(estimate, se, levels=0.95, distribution="z", df=None):
+    from scipy.stats import t, norm
+
+    q = (1 + np.asarray(levels, dtype=float)) / 2
+    crit = t.ppf(q, df) if distribution == "t" else norm.ppf(q)
+    return estimate - crit * se, estimate + crit * se
+
+def _ci_fields(distribution, estimate, se, null_value, alpha, df=None):
+    ci_low, ci_high = confidence_interval(estimate, se, 1 - alpha, distribution, df)
+    return {
+        "estimate": estimate,
+        "ci_se": se,
+        "null_value": null_value,
+        "ci_level": 1 - alpha,
+        "ci_low": ci_low,
+        "ci_high": ci_high,
+    }
+
+def confidence_intervals(name, levels=(0.90, 0.95, 0.99), **params):
+    params.setdefault("alpha", 0.05)
+    res = TEST_STATS[name](**params)
+    if "ci_se" not in res:
+        raise ValueError(f"{name} does not have a confidence interval.")
+    levels = np.atleast_1d(np.asarray(levels, dtype=float))
+    ci_low, ci_high = confidence_interval(res["estimate"], res["ci_se"], levels,
+                                          res["distribution"], res["df"])
+    return {
+        "test": name,
+        "estimate": res["estimate"],
+        "null_value": res["null_value"],
+        "levels": levels.tolist(),
+        "ci_low": ci_low.tolist(),
+        "ci_high": ci_high.tolist(),
+    }
+
+@_timed("plot")
+def plot_confidence_intervals(ax_graph, res, levels=(0.90, 0.95, 0.99)):
+    levels = np.sort(np.atleast_1d(np.asarray(levels, dtype=float)))
+    ci_low, ci_high = confidence_interval(res["estimate"], res["ci_se"], levels,
+                                          res["distribution"], res["df"])
+    ax_ci = ax_graph.inset_axes([0.07, 0.68, 0.28, 0.24])
+    y = np.arange(levels.size)
+    ax_ci.hlines(y, ci_low, ci_high, color='#7E4794', lw=2)
+    ax_ci.plot(np.full(levels.size, res["estimate"]), y, 'o', color='#ff8ca1', markersize=MARKER_SIZE - 2)
+    ax_ci.axvline(res["null_value"], color=DARK_GRAY, linestyle='--', lw=1)
+    ax_ci.set_yticks(y, [f"{100 * lvl:g}%" for lvl in levels])
+    ax_ci.set_ylim(-0.75, levels.size - 0.25)
+    ax_ci.tick_params(labelsize=8, colors=DARK_GRAY)
+    ax_ci.set_title("Confidence intervals", fontsize=9, color=DARK_GRAY)
+    ax_ci.set_facecolor('#F0F2F5')
+    return ax_ci
+
+
+##############################################################################
+#     EXACT SMALL-SAMPLE TESTS
+##############################################################################
+# method="auto" (the default) switches a test to its exact counterpart when
+# its normal/chi-square approximation is unreliable:
+#   McNemar                 b + c < 25                  -> exact binomial (p = 1/2)
+#   one-sample proportion   n*p or n*(1-p) < 10         -> exact binomial
+#   contingency tables      any expected < 1 or > 20%   -> Fisher's exact (2x2) or
+#                           of expected counts < 5         Monte Carlo Fisher-Freeman-
+#                                                          Halton (r x c)
+# method="exact" or "asymptotic" forces one or the other. The exact p-values
+# are computed for whole arrays of counts at once (each distinct set of counts
+# once), and the scalar entry points are cached by their counts. Two-sided
+# exact p-values sum the probabilities of every outcome no more likely than
+# the observed one, as scipy.stats.binomtest and fisher_exact do.
+EXACT_METHODS = ("auto", "exact", "asymptotic")
+EXACT_MCNEMAR_BELOW = 25
+EXACT_BINOMIAL_BELOW = 10
+EXACT_EXPECTED_BELOW = 5
+MONTE_CARLO_DRAWS = 10000
+MONTE_CARLO_SEED = 12345
+_EXACT_RTOL = 1 + 1e-7
+
+def _use_exact(method, small):
+    if method not in EXACT_METHODS:
+        raise ValueError(f"method must be one of {EXACT_METHODS}.")
+    return method == "exact" or (method == "auto" and bool(small))
+
+def _unique_rows(*cols):
+    # distinct (col1, col2, ...) combinations and how to scatter them back
+    stacked = np.column_stack(np.broadcast_arrays(*(np.ravel(np.asarray(c, dtype=float)) for c in cols)))
+    uniq, inverse = np.unique(stacked, axis=0, return_inverse=True)
+    return uniq.T, inverse.ravel()
+
+def _minlike(pmf, observed):
+    # two-sided p: total probability of outcomes no more likely than observed
+    return np.minimum(np.where(pmf <= observed[:, None] * _EXACT_RTOL, pmf, 0).sum(axis=1), 1.0)
+
+def exact_binomial_pvalue(x, n, p=0.5, tail_type=3):
+    # P-values of X ~ Bin(n, p) at the observed x, for arrays of (x, n, p);
+    # tail_type as elsewhere: 1=left (X <= x), 2=right (X >= x), 3=two-sided
+    from scipy.stats import binom
+
+    shape = np.broadcast(np.asarray(x), np.asarray(n), np.asarray(p)).shape
+    (x, n, p), inverse = _unique_rows(x, n, p)
+    if tail_type == 1:
+        out = binom.cdf(x, n, p)
+    elif tail_type == 2:
+        out = binom.sf(x - 1, n, p)
     else:
-        # Both tails
-        t_crit_val = t.ppf(1 - alpha / 2, df)
-        crit_str = f"$t_c = \\pm\\,{format_val(t_crit_val)}$"
-        p_value = 2 * (1 - t.cdf(abs(t_stat), df))
+        k = np.arange(int(n.max()) + 1 if n.size else 1)
+        pmf = binom.pmf(k[None, :], n[:, None], p[:, None])
+        out = _minlike(pmf, binom.pmf(x, n, p))
+    return out[inverse].reshape(shape)
+
+def fisher_exact_pvalue(a, b, c, d):
+    # two-sided Fisher's exact test for arrays of 2x2 tables [[a, b], [c, d]]
+    from scipy.stats import hypergeom
+
+    shape = np.broadcast(*(np.asarray(v) for v in (a, b, c, d))).shape
+    (a, b, c, d), inverse = _unique_rows(a, b, c, d)
+    total, row1, col1 = a + b + c + d, a + b, a + c
+    k = np.arange(int(np.max(np.minimum(row1, col1), initial=0)) + 1)
+    pmf = hypergeom.pmf(k[None, :], total[:, None], row1[:, None], col1[:, None])
+    out = _minlike(pmf, hypergeom.pmf(a, total, row1, col1))
+    return out[inverse].reshape(shape)
+
+def fisher_monte_carlo_pvalue(table, draws=MONTE_CARLO_DRAWS, seed=MONTE_CARLO_SEED, block=2000):
+    # Fisher-Freeman-Halton test of an r x c table: tables with the same
+    # margins are drawn by shuffling the column labels of the N observations,
+    # and p is the share (with the usual +1) no more likely than the observed
+    # table. Table probability is monotone in -sum(log n_ij!), so that is all
+    # that is compared.
+    from scipy.special import gammaln
+
+    table = np.asarray(table, dtype=np.int64)
+    n_rows, n_cols = table.shape
+    total = int(table.sum())
+    rows = np.repeat(np.arange(n_rows), table.sum(axis=1))
+    cols = np.repeat(np.arange(n_cols), table.sum(axis=0))
+    log_fact = gammaln(np.arange(total + 1) + 1.0)
+    observed = log_fact[table].sum()
+    rng = np.random.default_rng(seed)
+    extreme = 0
+    for start in range(0, draws, block):
+        size = min(block, draws - start)
+        shuffled = cols[np.argsort(rng.random((size, total)), axis=1)]
+        cells = rows[None, :] * n_cols + shuffled + (np.arange(size) * n_rows * n_cols)[:, None]
+        counts = np.bincount(cells.ravel(), minlength=size * n_rows * n_cols).reshape(size, -1)
+        extreme += int(np.count_nonzero(log_fact[counts].sum(axis=1) >= observed - 1e-7))
+    return (extreme + 1) / (draws + 1)
+
+@functools.lru_cache(maxsize=4096)
+def _exact_binomial_cached(x, n, p, tail_type):
+    return float(exact_binomial_pvalue(x, n, p, tail_type))
+
+@functools.lru_cache(maxsize=4096)
+def _fisher_exact_cached(a, b, c, d):
+    return float(fisher_exact_pvalue(a, b, c, d))
+
+@functools.lru_cache(maxsize=512)
+def _fisher_monte_carlo_cached(table, draws, seed):
+    return fisher_monte_carlo_pvalue(np.array(table), draws, seed)
+
+def _method_line(res):
+    # info-box note when the p-value did not come from the plotted curve
+    if res.get("method", "asymptotic") == "asymptotic":
+        return ""
+    return f"{res['method'].replace('_', ' ')} p-value\n\n"
+
+def _contingency_needs_exact(expected):
+    expected = np.asarray(expected, dtype=float)
+    return expected.min() < 1 or np.mean(expected < EXACT_EXPECTED_BELOW) > 0.2
+
+
+##############################################################################
+# 1) One-Sample T-Test
+##############################################################################
+@_timed("compute")
+def one_sample_t_test_stats(n, s, x_bar, mu, alpha, tail_type=1):
+    df = n - 1
+    t_stat = (x_bar - mu) / (s / (n**0.5))
+    t_crit, p_value = _tail_result("t", t_stat, alpha, tail_type, df)
+    return _result("one_sample_t_test", "t", t_stat, p_value, t_crit, alpha, tail_type, df,
+                   **_ci_fields("t", x_bar, s / (n**0.5), mu, alpha, df))
+
+def one_sample_t_test(n, s, x_bar, mu, alpha, tail_type=1):
+    res = one_sample_t_test_stats(n, s, x_bar, mu, alpha, tail_type)
+    df, t_stat = res["df"], res["statistic"]
 
     # Info box text
     info_text = (
@@ -402,20 +847,20 @@ def one_sample_t_test(n, s, x_bar, mu, alpha, tail_type=1):
         f"$df = {df}$\n\n"
         f"$\\bar{{x}} = {format_val(x_bar)}$\n\n"
         f"$s = {format_val(s)}$\n\n"
-        f"{crit_str}\n\n"
+        f"{_crit_str('t', res['critical_value'], tail_type)}\n\n"
         f"$t = {format_val(t_stat)}$\n\n"
         f"$\\alpha = {format_alpha(alpha)}$\n\n\n"
-        f"$t = \\frac{{\\bar{{x}} - \\mu}}{{s / \\sqrt{{n}}}} = {format_val(t_stat)}$"
     )
+    formula = "$t = \\frac{\\bar{x} - \\mu}{s / \\sqrt{n}}$"
 
-    fig, ax_info, ax_graph = create_figure_with_info_box(info_text)
+    fig, ax_info, ax_graph = create_figure_with_info_box(info_text, formula, t_stat)
     plot_test_distribution(
         ax_graph=ax_graph,
         distribution="t",
         alpha=alpha,
         tail_type=tail_type,
         test_stat=t_stat,
-        p_value=p_value,
+        p_value=res["p_value"],
         test_name="One-Sample T-Test",
         stat_label="t",
         df=df
@@ -426,46 +871,35 @@ def one_sample_t_test(n, s, x_bar, mu, alpha, tail_type=1):
 ##############################################################################
 # 2) One-Sample Z-Test
 ##############################################################################
-def one_sample_z_test(n, sigma, x_bar, mu, alpha, tail_type=1):
-    from scipy.stats import norm
+@_timed("compute")
+def one_sample_z_test_stats(n, sigma, x_bar, mu, alpha, tail_type=1):
     z_stat = (x_bar - mu) / (sigma / (n**0.5))
+    z_crit, p_value = _tail_result("z", z_stat, alpha, tail_type)
+    return _result("one_sample_z_test", "z", z_stat, p_value, z_crit, alpha, tail_type,
+                   **_ci_fields("z", x_bar, sigma / (n**0.5), mu, alpha))
 
-    if tail_type == 1:
-        # Left
-        z_crit = norm.ppf(alpha)
-        crit_str = f"$z_c = {format_val(z_crit)}$"
-        p_value = norm.cdf(z_stat)
-
-    elif tail_type == 2:
-        # Right
-        z_crit = norm.ppf(1 - alpha)
-        crit_str = f"$z_c = {format_val(z_crit)}$"
-        p_value = 1 - norm.cdf(z_stat)
-
-    else:
-        # Both tails
-        z_crit_val = norm.ppf(1 - alpha / 2)
-        crit_str = f"$z_c = \\pm\\,{format_val(z_crit_val)}$"
-        p_value = 2 * (1 - norm.cdf(abs(z_stat)))
+def one_sample_z_test(n, sigma, x_bar, mu, alpha, tail_type=1):
+    res = one_sample_z_test_stats(n, sigma, x_bar, mu, alpha, tail_type)
+    z_stat = res["statistic"]
 
     info_text = (
         f"$n = {n}$\n\n"
         f"$\\sigma = {format_val(sigma)}$\n\n"
         f"$\\bar{{x}} = {format_val(x_bar)}$\n\n"
-        f"{crit_str}\n\n"
+        f"{_crit_str('z', res['critical_value'], tail_type)}\n\n"
         f"$z = {format_val(z_stat)}$\n\n"
         f"$\\alpha = {format_alpha(alpha)}$\n\n\n"
-        f"$z = \\frac{{\\bar{{x}} - \\mu}}{{\\sigma / \\sqrt{{n}}}} = {format_val(z_stat)}$"
     )
+    formula = "$z = \\frac{\\bar{x} - \\mu}{\\sigma / \\sqrt{n}}$"
 
-    fig, ax_info, ax_graph = create_figure_with_info_box(info_text)
+    fig, ax_info, ax_graph = create_figure_with_info_box(info_text, formula, z_stat)
     plot_test_distribution(
         ax_graph=ax_graph,
         distribution="z",
         alpha=alpha,
         tail_type=tail_type,
         test_stat=z_stat,
-        p_value=p_value,
+        p_value=res["p_value"],
         test_name="One-Sample Z-Test",
         stat_label="z"
     )
@@ -475,49 +909,43 @@ def one_sample_z_test(n, sigma, x_bar, mu, alpha, tail_type=1):
 ##############################################################################
 # 3) One-Sample Proportion Z-Test
 ##############################################################################
-def one_sample_proportion_z_test(n, p_hat, p, alpha, tail_type=1):
-    from scipy.stats import norm
-
+@_timed("compute")
+def one_sample_proportion_z_test_stats(n, p_hat, p, alpha, tail_type=1, method="auto"):
     q = 1 - p
     z_stat = (p_hat - p) / ((p*q / n)**0.5)
-
-    if tail_type == 1:
-        # Left
-        z_crit = norm.ppf(alpha)
-        crit_str = f"$z_c = {format_val(z_crit)}$"
-        p_value = norm.cdf(z_stat)
-
-    elif tail_type == 2:
-        # Right
-        z_crit = norm.ppf(1 - alpha)
-        crit_str = f"$z_c = {format_val(z_crit)}$"
-        p_value = 1 - norm.cdf(z_stat)
-
-    else:
-        # Both tails
-        z_crit_val = norm.ppf(1 - alpha / 2)
-        crit_str = f"$z_c = \\pm\\,{format_val(z_crit_val)}$"
-        p_value = 2 * (1 - norm.cdf(abs(z_stat)))
+    z_crit, p_value = _tail_result("z", z_stat, alpha, tail_type)
+    exact = _use_exact(method, min(n*p, n*q) < EXACT_BINOMIAL_BELOW)
+    if exact:
+        p_value = _exact_binomial_cached(int(round(n*p_hat)), int(n), float(p), tail_type)
+    # the interval uses the estimated p_hat, not the hypothesised p
+    return _result("one_sample_proportion_z_test", "z", z_stat, p_value, z_crit, alpha, tail_type,
+                   method="exact" if exact else "asymptotic",
+                   **_ci_fields("z", p_hat, (p_hat*(1 - p_hat) / n)**0.5, p, alpha))
+
+def one_sample_proportion_z_test(n, p_hat, p, alpha, tail_type=1, method="auto"):
+    res = one_sample_proportion_z_test_stats(n, p_hat, p, alpha, tail_type, method)
+    z_stat = res["statistic"]
 
     info_text = (
         f"$n = {n}$\n\n"
         f"$\\hat{{p}} = {format_val(p_hat)}$\n\n"
         f"$p = {format_val(p)}$\n\n"
         f"$q = 1-p$\n\n"
-        f"{crit_str}\n\n"
+        f"{_crit_str('z', res['critical_value'], tail_type)}\n\n"
         f"$z = {format_val(z_stat)}$\n\n"
-        f"$\\alpha = {format_alpha(alpha)}$\n\n\n"
-        f"$z = \\frac{{\\hat{{p}} - p}}{{\\sqrt{{p\\,q / n}}}} = {format_val(z_stat)}$"
+        f"$\\alpha = {format_alpha(alpha)}$\n\n"
+        f"{_method_line(res)}\n"
     )
+    formula = "$z = \\frac{\\hat{p} - p}{\\sqrt{p\\,q / n}}$"
 
-    fig, ax_info, ax_graph = create_figure_with_info_box(info_text)
+    fig, ax_info, ax_graph = create_figure_with_info_box(info_text, formula, z_stat)
     plot_test_distribution(
         ax_graph=ax_graph,
         distribution="z",
         alpha=alpha,
         tail_type=tail_type,
         test_stat=z_stat,
-        p_value=p_value,
+        p_value=res["p_value"],
         test_name="One-Sample Proportion Z-Test",
         stat_label="z"
     )
@@ -527,47 +955,35 @@ def one_sample_proportion_z_test(n, p_hat, p, alpha, tail_type=1):
 ##############################################################################
 # 4) Two-Dependent-Sample Z-Test (sigma_d known)
 ##############################################################################
-def two_dependent_z_test(n, sigma_d, d_bar, alpha, tail_type=1):
-    from scipy.stats import norm
-
+@_timed("compute")
+def two_dependent_z_test_stats(n, sigma_d, d_bar, alpha, tail_type=1):
     z_stat = d_bar / (sigma_d / (n**0.5))
+    z_crit, p_value = _tail_result("z", z_stat, alpha, tail_type)
+    return _result("two_dependent_z_test", "z", z_stat, p_value, z_crit, alpha, tail_type,
+                   **_ci_fields("z", d_bar, sigma_d / (n**0.5), 0, alpha))
 
-    if tail_type == 1:
-        # Left
-        z_crit = norm.ppf(alpha)
-        crit_str = f"$z_c = {format_val(z_crit)}$"
-        p_value = norm.cdf(z_stat)
-
-    elif tail_type == 2:
-        # Right
-        z_crit = norm.ppf(1 - alpha)
-        crit_str = f"$z_c = {format_val(z_crit)}$"
-        p_value = 1 - norm.cdf(z_stat)
-
-    else:
-        # Both tails
-        z_crit_val = norm.ppf(1 - alpha / 2)
-        crit_str = f"$z_c = \\pm\\,{format_val(z_crit_val)}$"
-        p_value = 2 * (1 - norm.cdf(abs(z_stat)))
+def two_dependent_z_test(n, sigma_d, d_bar, alpha, tail_type=1):
+    res = two_dependent_z_test_stats(n, sigma_d, d_bar, alpha, tail_type)
+    z_stat = res["statistic"]
 
     info_text = (
         f"$n = {n}$\n\n"
         f"$\\sigma_d = {format_val(sigma_d)}$\n\n"
         f"$\\bar{{d}} = {format_val(d_bar)}$\n\n"
-        f"{crit_str}\n\n"
+        f"{_crit_str('z', res['critical_value'], tail_type)}\n\n"
         f"$z = {format_val(z_stat)}$\n\n"
         f"$\\alpha = {format_alpha(alpha)}$\n\n\n"
-        f"$z = \\frac{{\\bar{{d}} - 0}}{{\\sigma_d / \\sqrt{{n}}}} = {format_val(z_stat)}$"
     )
+    formula = "$z = \\frac{\\bar{d} - 0}{\\sigma_d / \\sqrt{n}}$"
 
-    fig, ax_info, ax_graph = create_figure_with_info_box(info_text)
+    fig, ax_info, ax_graph = create_figure_with_info_box(info_text, formula, z_stat)
     plot_test_distribution(
         ax_graph=ax_graph,
         distribution="z",
         alpha=alpha,
         tail_type=tail_type,
         test_stat=z_stat,
-        p_value=p_value,
+        p_value=res["p_value"],
         test_name="Two-Dependent-Sample Z-Test",
         stat_label="z"
     )
@@ -577,49 +993,36 @@ def two_dependent_z_test(n, sigma_d, d_bar, alpha, tail_type=1):
 ##############################################################################
 # 5) Two-Dependent-Sample T-Test (Paired T)
 ##############################################################################
-def two_dependent_t_test(n, s_d, d_bar, alpha, tail_type=1):
-    from scipy.stats import t
-
+@_timed("compute")
+def two_dependent_t_test_stats(n, s_d, d_bar, alpha, tail_type=1):
     df = n - 1
     t_stat = d_bar / (s_d / (n**0.5))
+    t_crit, p_value = _tail_result("t", t_stat, alpha, tail_type, df)
+    return _result("two_dependent_t_test", "t", t_stat, p_value, t_crit, alpha, tail_type, df,
+                   **_ci_fields("t", d_bar, s_d / (n**0.5), 0, alpha, df))
 
-    
-    if tail_type == 1:
-        # Left
-        t_crit = t.ppf(alpha, df)
-        crit_str = f"$t_c = {format_val(t_crit)}$"
-        p_value = t.cdf(t_stat, df)
-
-    elif tail_type == 2:
-        # Right
-        t_crit = t.ppf(1 - alpha, df)
-        crit_str = f"$t_c = {format_val(t_crit)}$"
-        p_value = 1 - t.cdf(t_stat, df)
-
-    else:
-        # Both tails
-        t_crit_val = t.ppf(1 - alpha / 2, df)
-        crit_str = f"$t_c = \\pm\\,{format_val(t_crit_val)}$"
-        p_value = 2 * (1 - t.cdf(abs(t_stat), df))
+def two_dependent_t_test(n, s_d, d_bar, alpha, tail_type=1):
+    res = two_dependent_t_test_stats(n, s_d, d_bar, alpha, tail_type)
+    df, t_stat = res["df"], res["statistic"]
 
     info_text = (
         f"$n = {n}$\n\n"
         f"$s_d = {format_val(s_d)}$\n\n"
         f"$\\bar{{d}} = {format_val(d_bar)}$\n\n"
-        f"{crit_str}\n\n"
+        f"{_crit_str('t', res['critical_value'], tail_type)}\n\n"
         f"$t = {format_val(t_stat)}$\n\n"
         f"$\\alpha = {format_alpha(alpha)}$\n\n\n"
-        f"$t = \\frac{{\\bar{{d}} - 0}}{{s_d/\\sqrt{{n}}}} = {format_val(t_stat)}$"
     )
+    formula = "$t = \\frac{\\bar{d} - 0}{s_d/\\sqrt{n}}$"
 
-    fig, ax_info, ax_graph = create_figure_with_info_box(info_text)
+    fig, ax_info, ax_graph = create_figure_with_info_box(info_text, formula, t_stat)
     plot_test_distribution(
         ax_graph=ax_graph,
         distribution="t",
         alpha=alpha,
         tail_type=tail_type,
         test_stat=t_stat,
-        p_value=p_value,
+        p_value=res["p_value"],
         test_name="Two-Dependent-Sample T-Test",
         stat_label="t",
         df=df
@@ -630,44 +1033,47 @@ def two_dependent_t_test(n, s_d, d_bar, alpha, tail_type=1):
 ##############################################################################
 # 6) Two-Dependent-Sample Proportion Test (McNemar)
 ##############################################################################
-def two_dependent_proportion_test(n10, n01, n11, n00, alpha, tail_type=2):
-    from scipy.stats import norm
-
+@_timed("compute")
+def two_dependent_proportion_test_stats(n10, n01, n11, n00, alpha, tail_type=2, method="auto"):
     b = n10
     c = n01
-    
+
     numerator = abs(b - c) - 1
     if numerator < 0:
         numerator = 0
 
     z_stat = numerator / ((b + c + 1e-15)**0.5)
+    z_crit, p_value = _tail_result("z", z_stat, alpha, tail_type)
+    exact = _use_exact(method, b + c < EXACT_MCNEMAR_BELOW)
+    if exact:
+        # the smaller discordant count against Bin(b + c, 1/2); z >= 0, so
+        # its right tail is the lower tail of min(b, c)
+        small, discordant = int(min(b, c)), int(b + c)
+        if tail_type == 3:
+            p_value = _exact_binomial_cached(small, discordant, 0.5, 3)
+        else:
+            p_value = _exact_binomial_cached(small, discordant, 0.5, 1 if tail_type == 2 else 2)
 
-    if tail_type == 1:
-        # Left (H₁: Δp < 0)
-        z_crit = norm.ppf(alpha)
-        crit_str = f"$z_c = {format_val(z_crit)}$"
-        p_value = norm.cdf(z_stat)
+    # Wald interval for the difference of the paired proportions (b - c) / n
+    n = n10 + n01 + n11 + n00
+    diff = (b - c) / n if n else float("nan")
+    se = max(b + c - (b - c)**2 / n, 0)**0.5 / n if n else float("nan")
+    return _result("two_dependent_proportion_test", "z", z_stat, p_value, z_crit, alpha, tail_type,
+                   method="exact" if exact else "asymptotic", **_ci_fields("z", diff, se, 0, alpha))
 
-    elif tail_type == 2:
-        # Right (H₁: Δp > 0)
-        z_crit = norm.ppf(1 - alpha)
-        crit_str = f"$z_c = {format_val(z_crit)}$"
-        p_value = 1 - norm.cdf(z_stat)
-
-    else:
-        # Both (H₁: Δp ≠ 0)
-        z_crit_val = norm.ppf(1 - alpha/2)
-        crit_str = f"$z_c = \\pm\\,{format_val(z_crit_val)}$"
-        p_value = 2 * (1 - norm.cdf(abs(z_stat)))
+def two_dependent_proportion_test(n10, n01, n11, n00, alpha, tail_type=2, method="auto"):
+    res = two_dependent_proportion_test_stats(n10, n01, n11, n00, alpha, tail_type, method)
+    z_stat = res["statistic"]
 
     info_text = (
         f"$n_{{10}} = {n10}$\n\n"
         f"$n_{{01}} = {n01}$\n\n"
         f"$n_{{11}} = {n11}$\n\n"
         f"$n_{{00}} = {n00}$\n\n"
-        f"{crit_str}\n\n"
+        f"{_crit_str('z', res['critical_value'], tail_type)}\n\n"
         f"$z = {format_val(z_stat)}$\n\n"
-        f"$\\alpha = {format_alpha(alpha)}$\n\n\n"
+        f"$\\alpha = {format_alpha(alpha)}$\n\n"
+        f"{_method_line(res)}\n"
         "McNemar’s approx:\n"
         "$z = \\frac{|b-c|-1}{\\sqrt{b + c}}$"
     )
@@ -679,7 +1085,7 @@ def two_dependent_proportion_test(n10, n01, n11, n00, alpha, tail_type=2):
         alpha=alpha,
         tail_type=tail_type,
         test_stat=z_stat,
-        p_value=p_value,
+        p_value=res["p_value"],
         test_name="Two-Dependent-Sample Proportion Test (McNemar)",
         stat_label="z"
     )
@@ -690,30 +1096,18 @@ def two_dependent_proportion_test(n10, n01, n11, n00, alpha, tail_type=2):
 ##############################################################################
 # 7) Two-Independent-Sample Z-Test (sigma1, sigma2 known)
 ##############################################################################
-def two_independent_z_test(n1, n2, sigma1, sigma2, x_bar1, x_bar2, alpha, tail_type=1):
-    from scipy.stats import norm
-
+@_timed("compute")
+def two_independent_z_test_stats(n1, n2, sigma1, sigma2, x_bar1, x_bar2, alpha, tail_type=1):
     diff = x_bar1 - x_bar2
     se = ((sigma1**2)/n1 + (sigma2**2)/n2)**0.5
     z_stat = diff / se
+    z_crit, p_value = _tail_result("z", z_stat, alpha, tail_type)
+    return _result("two_independent_z_test", "z", z_stat, p_value, z_crit, alpha, tail_type,
+                   **_ci_fields("z", diff, se, 0, alpha))
 
-    if tail_type == 1:
-        # Left
-        z_crit = norm.ppf(alpha)
-        crit_str = f"$z_c = {format_val(z_crit)}$"
-        p_value = norm.cdf(z_stat)
-
-    elif tail_type == 2:
-        # Right
-        z_crit = norm.ppf(1 - alpha)
-        crit_str = f"$z_c = {format_val(z_crit)}$"
-        p_value = 1 - norm.cdf(z_stat)
-
-    else:
-        # Both tails
-        z_crit_val = norm.ppf(1 - alpha / 2)
-        crit_str = f"$z_c = \\pm\\,{format_val(z_crit_val)}$"
-        p_value = 2 * (1 - norm.cdf(abs(z_stat)))
+def two_independent_z_test(n1, n2, sigma1, sigma2, x_bar1, x_bar2, alpha, tail_type=1):
+    res = two_independent_z_test_stats(n1, n2, sigma1, sigma2, x_bar1, x_bar2, alpha, tail_type)
+    z_stat = res["statistic"]
 
     info_text = (
         f"$n_1 = {n1}$\n\n"
@@ -722,20 +1116,20 @@ def two_independent_z_test(n1, n2, sigma1, sigma2, x_bar1, x_bar2, alpha, tail_t
         f"$\\sigma_2 = {format_val(sigma2)}$\n\n"
         f"$\\bar{{x}}_1 = {format_val(x_bar1)}$\n\n"
         f"$\\bar{{x}}_2 = {format_val(x_bar2)}$\n\n"
-        f"{crit_str}\n\n"
+        f"{_crit_str('z', res['critical_value'], tail_type)}\n\n"
         f"$z = {format_val(z_stat)}$\n\n"
         f"$\\alpha = {format_alpha(alpha)}$\n\n\n"
-        f"$z = \\frac{{(\\bar{{x}}_1 - \\bar{{x}}_2)}}{{\\sqrt{{\\frac{{\\sigma_1^2}}{{n_1}} + \\frac{{\\sigma_2^2}}{{n_2}}}}}} = {format_val(z_stat)}$"
     )
+    formula = "$z = \\frac{(\\bar{x}_1 - \\bar{x}_2)}{\\sqrt{\\frac{\\sigma_1^2}{n_1} + \\frac{\\sigma_2^2}{n_2}}}$"
 
-    fig, ax_info, ax_graph = create_figure_with_info_box(info_text)
+    fig, ax_info, ax_graph = create_figure_with_info_box(info_text, formula, z_stat)
     plot_test_distribution(
         ax_graph=ax_graph,
         distribution="z",
         alpha=alpha,
         tail_type=tail_type,
         test_stat=z_stat,
-        p_value=p_value,
+        p_value=res["p_value"],
         test_name="Two-Independent-Sample Z-Test",
         stat_label="z"
     )
@@ -743,47 +1137,100 @@ def two_independent_z_test(n1, n2, sigma1, sigma2, x_bar1, x_bar2, alpha, tail_t
 
 
 ##############################################################################
-# 8) Two-Independent-Sample T-Test (Welch)
+#     BULK TWO-SAMPLE TESTS FROM SUMMARY TABLES
 ##############################################################################
-def two_independent_t_test(n1, n2, s1, s2, x_bar1, x_bar2, alpha, tail_type=1):
-    from scipy.stats import t
-
-    # Compute the difference in sample means
-    diff = x_bar1 - x_bar2
+# Columnar versions of tests 8 and 9: every argument may be an array (one row
+# per school, question, ...) and all rows are computed in one vectorized pass.
+# Rows that cannot be tested (n < 2 for a variance, zero standard error,
+# counts outside [0, n]) get NaN statistics and p-values and valid=False
+# rather than a value propagated through an epsilon. The scalar *_stats
+# functions call these with 0-d arrays.
+def _bulk_columns(*cols):
+    return np.broadcast_arrays(*(np.asarray(c, dtype=float) for c in cols))
+
+def _bulk_result(test, distribution, statistic, alpha, tail_type, valid, estimate, se, df=None, **extra):
+    crit, p_value = _tail_result(distribution, statistic, alpha, tail_type, df)
+    ci_low, ci_high = confidence_interval(estimate, se, 1 - alpha, distribution, df)
+    return {
+        "test": test,
+        "distribution": distribution,
+        "statistic": statistic,
+        "p_value": p_value,
+        "critical_value": crit,
+        "df": df,
+        "alpha": alpha,
+        "tail_type": tail_type,
+        "reject": p_value < alpha,
+        "valid": valid,
+        "estimate": estimate,
+        "ci_se": se,
+        "ci_low": ci_low,
+        "ci_high": ci_high,
+        **extra,
+    }
+
+def two_independent_t_test_bulk(n1, n2, s1, s2, x_bar1, x_bar2, alpha=0.05, tail_type=3):
+    n1, n2, s1, s2, x_bar1, x_bar2 = _bulk_columns(n1, n2, s1, s2, x_bar1, x_bar2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        var1 = s1**2 / n1
+        var2 = s2**2 / n2
+        se = np.sqrt(var1 + var2)
+        valid = (n1 >= 2) & (n2 >= 2) & (se > 0)
+        diff = x_bar1 - x_bar2
+        t_stat = np.where(valid, diff / se, np.nan)
+        # Welch-Satterthwaite; one zero variance is fine, both zero is not
+        df = np.where(valid, (var1 + var2)**2 / (var1**2 / (n1 - 1) + var2**2 / (n2 - 1)), np.nan)
+        return _bulk_result("two_independent_t_test", "t", t_stat, alpha, tail_type, valid,
+                            diff, np.where(valid, se, np.nan), df)
+
+def two_independent_proportion_z_test_bulk(x1, x2, n1, n2, alpha=0.05, tail_type=3):
+    x1, x2, n1, n2 = _bulk_columns(x1, x2, n1, n2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        p1_hat = x1 / n1
+        p2_hat = x2 / n2
+        p_hat = (x1 + x2) / (n1 + n2)
+        se = np.sqrt(p_hat * (1 - p_hat) * (1 / n1 + 1 / n2))
+        valid = (n1 > 0) & (n2 > 0) & (x1 >= 0) & (x2 >= 0) & (x1 <= n1) & (x2 <= n2) & (se > 0)
+        diff = p1_hat - p2_hat
+        z_stat = np.where(valid, diff / se, np.nan)
+        # the interval uses the unpooled standard error
+        se_ci = np.sqrt(p1_hat * (1 - p1_hat) / n1 + p2_hat * (1 - p2_hat) / n2)
+        return _bulk_result("two_independent_proportion_z_test", "z", z_stat, alpha, tail_type, valid,
+                            diff, np.where(valid, se_ci, np.nan),
+                            p1_hat=p1_hat, p2_hat=p2_hat, p_hat=p_hat)
+
+BULK_COLUMNS = {
+    "two_independent_t_test": ("n1", "n2", "s1", "s2", "x_bar1", "x_bar2"),
+    "two_independent_proportion_z_test": ("x1", "x2", "n1", "n2"),
+    # one list of counts (and of expected counts or proportions) per row
+    "chi_square_gof_test": ("observed", "expected"),
+}
+# chi-square tests are upper-tailed only and take no tail_type
+UNTAILED_BULK_TESTS = {"chi_square_gof_test"}
+
+def bulk_test(name, table, alpha=0.05, tail_type=3):
+    # table: anything indexable by column name (dict of arrays, DataFrame)
+    func = BULK_TESTS[name]
+    tails = {} if name in UNTAILED_BULK_TESTS else {"tail_type": tail_type}
+    return func(*(table[col] for col in BULK_COLUMNS[name]), alpha=alpha, **tails)
 
-    # Compute each sample's variance/n
-    var1 = (s1**2) / n1
-    var2 = (s2**2) / n2
 
-    # Standard error under Welch's assumptions
-    se = (var1 + var2) ** 0.5
-
-    # Test statistic
-    t_stat = diff / se
-
-    # Satterthwaite's approximation for df
-    numerator = (var1 + var2) ** 2
-    denominator = (var1**2) / (n1 - 1) + (var2**2) / (n2 - 1)
-    df_welch = numerator / (denominator + 1e-15)
-
-    # Decide critical values and p-value based on tail_type
-    if tail_type == 1:
-        # Left (H₁: μ₁ - μ₂ < 0)
-        t_crit = t.ppf(alpha, df_welch)
-        crit_str = f"$t_c = {format_val(t_crit)}$"
-        p_value = t.cdf(t_stat, df_welch)
-
-    elif tail_type == 2:
-        # Right (H₁: μ₁ - μ₂ > 0)
-        t_crit = t.ppf(1 - alpha, df_welch)
-        crit_str = f"$t_c = {format_val(t_crit)}$"
-        p_value = 1 - t.cdf(t_stat, df_welch)
+##############################################################################
+# 8) Two-Independent-Sample T-Test (Welch)
+##############################################################################
+@_timed("compute")
+def two_independent_t_test_stats(n1, n2, s1, s2, x_bar1, x_bar2, alpha, tail_type=1):
+    # tail_type: 1 => H₁: μ₁ - μ₂ < 0, 2 => H₁: μ₁ - μ₂ > 0, 3 => H₁: μ₁ - μ₂ ≠ 0
+    res = two_independent_t_test_bulk(n1, n2, s1, s2, x_bar1, x_bar2, alpha, tail_type)
+    if not res["valid"]:
+        raise ValueError("Each sample needs n >= 2 and the standard deviations cannot both be 0.")
+    return _result("two_independent_t_test", "t", res["statistic"], res["p_value"], res["critical_value"],
+                   alpha, tail_type, res["df"],
+                   **_ci_fields("t", res["estimate"], res["ci_se"], 0, alpha, res["df"]))
 
-    else:
-        # TWO-TAILED (H₁: μ₁ - μ₂ ≠ 0) => tail_type=3
-        t_crit_val = t.ppf(1 - alpha / 2, df_welch)
-        crit_str = f"$t_c = \\pm\\,{format_val(t_crit_val)}$"
-        p_value = 2 * (1 - t.cdf(abs(t_stat), df_welch))
+def two_independent_t_test(n1, n2, s1, s2, x_bar1, x_bar2, alpha, tail_type=1):
+    res = two_independent_t_test_stats(n1, n2, s1, s2, x_bar1, x_bar2, alpha, tail_type)
+    df_welch, t_stat = res["df"], res["statistic"]
 
     info_text = (
         f"$n_1 = {n1}$\n\n"
@@ -792,21 +1239,21 @@ def two_independent_t_test(n1, n2, s1, s2, x_bar1, x_bar2, alpha, tail_type=1):
         f"$s_2 = {format_val(s2)}$\n\n"
         f"$\\bar{{x}}_1 = {format_val(x_bar1)}$\n\n"
         f"$\\bar{{x}}_2 = {format_val(x_bar2)}$\n\n"
-        f"{crit_str}\n\n"
+        f"{_crit_str('t', res['critical_value'], tail_type)}\n\n"
         f"$t = {format_val(t_stat)}$\n\n"
         f"df$_{{\\mathrm{{Welch}}}} = {format_val(df_welch)}$\n\n"
         f"$\\alpha = {format_alpha(alpha)}$\n\n\n"
-        f"$t = \\frac{{(\\bar{{x}}_1 - \\bar{{x}}_2)}}{{\\sqrt{{\\frac{{s_1^2}}{{n_1}} + \\frac{{s_2^2}}{{n_2}}}}}} = {format_val(t_stat)}$"
     )
+    formula = "$t = \\frac{(\\bar{x}_1 - \\bar{x}_2)}{\\sqrt{\\frac{s_1^2}{n_1} + \\frac{s_2^2}{n_2}}}$"
 
-    fig, ax_info, ax_graph = create_figure_with_info_box(info_text)
+    fig, ax_info, ax_graph = create_figure_with_info_box(info_text, formula, t_stat)
     plot_test_distribution(
         ax_graph=ax_graph,
         distribution="t",
         alpha=alpha,
         tail_type=tail_type,
         test_stat=t_stat,
-        p_value=p_value,
+        p_value=res["p_value"],
         test_name="Welch Two-Sample T-Test",
         stat_label="t",
         df=df_welch
@@ -818,165 +1265,823 @@ def two_independent_t_test(n1, n2, s1, s2, x_bar1, x_bar2, alpha, tail_type=1):
 ##############################################################################
 # 9) Two-Independent-Sample Proportion Z-Test
 ##############################################################################
-def two_independent_proportion_z_test(x1, x2, n1, n2, alpha, tail_type=1):
-    from scipy.stats import norm
-
-    p1_hat = x1/n1
-    p2_hat = x2/n2
-    p_hat = (x1 + x2)/(n1 + n2)
-    q_hat = 1 - p_hat
+@_timed("compute")
+def two_independent_proportion_z_test_stats(x1, x2, n1, n2, alpha, tail_type=1):
+    res = two_independent_proportion_z_test_bulk(x1, x2, n1, n2, alpha, tail_type)
+    if not res["valid"]:
+        raise ValueError("Counts must lie in [0, n] with n > 0, and the pooled proportion cannot be 0 or 1.")
+    return _result("two_independent_proportion_z_test", "z", res["statistic"], res["p_value"],
+                   res["critical_value"], alpha, tail_type,
+                   p1_hat=res["p1_hat"], p2_hat=res["p2_hat"], p_hat=res["p_hat"],
+                   **_ci_fields("z", res["estimate"], res["ci_se"], 0, alpha))
 
-    diff = p1_hat - p2_hat
-    se = (p_hat*q_hat*(1/n1 + 1/n2))**0.5
-    z_stat = diff / se
-
-    if tail_type == 1:
-        # Left
-        z_crit = norm.ppf(alpha)
-        crit_str = f"$z_c = {format_val(z_crit)}$"
-        p_value = norm.cdf(z_stat)
-
-    elif tail_type == 2:
-        # Right
-        z_crit = norm.ppf(1 - alpha)
-        crit_str = f"$z_c = {format_val(z_crit)}$"
-        p_value = 1 - norm.cdf(z_stat)
-
-    else:
-        # Both tails
-        z_crit_val = norm.ppf(1 - alpha / 2)
-        crit_str = f"$z_c = \\pm\\,{format_val(z_crit_val)}$"
-        p_value = 2 * (1 - norm.cdf(abs(z_stat)))
+def two_independent_proportion_z_test(x1, x2, n1, n2, alpha, tail_type=1):
+    res = two_independent_proportion_z_test_stats(x1, x2, n1, n2, alpha, tail_type)
+    z_stat = res["statistic"]
 
     info_text = (
         f"$n_1 = {n1}$\n\n"
         f"$n_2 = {n2}$\n\n"
-        f"$\\hat{{p}}_1 = {format_val(p1_hat)}$\n\n"
-        f"$\\hat{{p}}_2 = {format_val(p2_hat)}$\n\n"
-        f"$\\hat{{p}} = {format_val(p_hat)}$\n\n"
+        f"$\\hat{{p}}_1 = {format_val(res['p1_hat'])}$\n\n"
+        f"$\\hat{{p}}_2 = {format_val(res['p2_hat'])}$\n\n"
+        f"$\\hat{{p}} = {format_val(res['p_hat'])}$\n\n"
         f"$\\hat{{q}} = 1-\\hat{{p}}$\n\n"
-        f"{crit_str}\n\n"
+        f"{_crit_str('z', res['critical_value'], tail_type)}\n\n"
         f"$z = {format_val(z_stat)}$\n\n"
         f"$\\alpha = {format_alpha(alpha)}$\n\n\n"
-        "$z = \\frac{\\hat{p}_1 - \\hat{p}_2}{\\sqrt{\\hat{p}\\,\\hat{q}\\left(\\frac{1}{n_1} + \\frac{1}{n_2}\\right)}} = "
-        + f"{format_val(z_stat)}$"
     )
+    formula = "$z = \\frac{\\hat{p}_1 - \\hat{p}_2}{\\sqrt{\\hat{p}\\,\\hat{q}\\left(\\frac{1}{n_1} + \\frac{1}{n_2}\\right)}}$"
 
-    fig, ax_info, ax_graph = create_figure_with_info_box(info_text)
+    fig, ax_info, ax_graph = create_figure_with_info_box(info_text, formula, z_stat)
     plot_test_distribution(
         ax_graph=ax_graph,
         distribution="z",
         alpha=alpha,
         tail_type=tail_type,
         test_stat=z_stat,
-        p_value=p_value,
+        p_value=res["p_value"],
         test_name="Two-Independent-Sample Proportion Z-Test",
         stat_label="z"
     )
     return fig, ax_info, ax_graph
 
+##############################################################################
+#     BULK CHI-SQUARE GOODNESS OF FIT
+##############################################################################
+# One test per row of observed counts: a 2-D array, or a list of rows of
+# different lengths (padded with NaN internally; each row keeps its own k).
+# expected is a matching array/list of rows, proportions that sum to 1 (scaled
+# to each row's total), None for uniform, or "poisson"/"binomial" to fit the
+# distribution to each row over `categories` (default 0..k-1; the first and
+# last cells take the tails), which costs one extra degree of freedom.
+# Statistics, p-values and critical values come from one chi2 call each;
+# small_expected counts the cells with expected < 5.
+GOF_FITS = {"uniform": 0, "poisson": 1, "binomial": 1}
+
+def _ragged_rows(rows):
+    if not isinstance(rows, np.ndarray):
+        rows = list(rows)
+    if isinstance(rows, np.ndarray) or np.ndim(rows[0]) == 0 or all(np.ndim(r) == 1 and len(r) == len(rows[0]) for r in rows):
+        return np.atleast_2d(np.asarray(rows, dtype=float))
+    lengths = np.array([len(r) for r in rows])
+    out = np.full((lengths.size, lengths.max()), np.nan)
+    out[np.arange(lengths.max()) < lengths[:, None]] = np.concatenate(
+        [np.asarray(r, dtype=float) for r in rows])
+    return out
+
+def _fitted_expected(fit, obs, present, categories, trials=None):
+    from scipy.stats import poisson, binom
+
+    if categories is None:
+        cats = np.broadcast_to(np.arange(obs.shape[1], dtype=float), obs.shape)
+    else:
+        cats = _ragged_rows(categories) * np.ones_like(obs)
+    total = np.nansum(obs, axis=1, keepdims=True)
+    counts = np.where(present, obs, 0)
+    if fit == "uniform":
+        probs = present / present.sum(axis=1, keepdims=True)
+        return total * probs
+    mean = (counts * np.where(present, cats, 0)).sum(axis=1, keepdims=True) / total
+    last = present.sum(axis=1) - 1
+    rows = np.arange(obs.shape[0])
+    c_first, c_last = cats[:, :1], cats[rows, last][:, None]
+    if fit == "poisson":
+        dist = poisson(mean)
+    else:
+        n = np.nanmax(np.where(present, cats, np.nan), axis=1, keepdims=True) if trials is None \
+            else np.broadcast_to(np.asarray(trials, dtype=float).reshape(-1, 1), mean.shape)
+        dist = binom(n, mean / n)
+    probs = dist.pmf(cats)
+    # the end cells hold everything beyond them
+    probs[:, 0] = dist.cdf(c_first)[:, 0]
+    probs[rows, last] = dist.sf(c_last - 1)[:, 0]
+    return total * np.where(present, probs, np.nan)
+
+def chi_square_gof_test_bulk(observed, expected=None, alpha=0.05, ddof=0, categories=None, trials=None):
+    from scipy.stats import chi2
+
+    obs = _ragged_rows(observed)
+    present = ~np.isnan(obs)
+    k = present.sum(axis=1)
+    total = np.nansum(obs, axis=1)
+    if expected is None or isinstance(expected, str):
+        fit = expected or "uniform"
+        if fit not in GOF_FITS:
+            raise ValueError(f"expected must be counts, proportions or one of {sorted(GOF_FITS)}.")
+        with np.errstate(divide="ignore", invalid="ignore"):
+            exp = _fitted_expected(fit, obs, present, categories, trials)
+        ddof = ddof + GOF_FITS[fit]
+    else:
+        exp = _ragged_rows(expected) * np.ones_like(obs)
+        exp_total = np.nansum(np.where(present, exp, np.nan), axis=1)
+        # rows given as proportions are scaled to the observed total
+        proportions = np.isclose(exp_total, 1.0, rtol=1e-9) & ~np.isclose(total, 1.0, rtol=1e-9)
+        exp = np.where(proportions[:, None], exp * total[:, None], exp)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        exp_total = np.nansum(np.where(present, exp, np.nan), axis=1)
+        totals_match = np.isclose(exp_total, total, rtol=1e-6)
+        positive = np.all(~present | (exp > 0), axis=1)
+        df = k - 1 - ddof
+        valid = totals_match & positive & (df >= 1) & np.all(~present | (obs >= 0), axis=1)
+        cells = np.where(present, (obs - exp)**2 / exp, 0.0)
+        stat = np.where(valid, cells.sum(axis=1), np.nan)
+        df = np.where(valid, df, np.nan)
+        p_value = chi2.sf(stat, df)
+        crit = chi2.isf(alpha, df)
+    exp_present = np.where(present, exp, np.inf)
+    return {
+        "test": "chi_square_gof_test",
+        "distribution": "chi2",
+        "statistic": stat,
+        "p_value": p_value,
+        "critical_value": crit,
+        "df": df,
+        "alpha": alpha,
+        "reject": p_value < alpha,
+        "valid": valid,
+        "totals_match": totals_match,
+        "k": k,
+        "n": total,
+        "expected": exp,
+        "min_expected": np.where(k > 0, exp_present.min(axis=1), np.nan),
+        "small_expected": (exp_present < 5).sum(axis=1),
+    }
+
+
 ##############################################################################
 # 10) Chi-Square Goodness of Fit Test
 ##############################################################################
+@_timed("compute")
+def chi_square_gof_test_stats(observed, expected, alpha):
+    res = chi_square_gof_test_bulk([observed], [expected], alpha)
+    if not res["totals_match"][0]:
+        raise ValueError(f"Observed total {format_val(res['n'][0])} and expected total "
+                         f"{format_val(np.sum(expected))} differ (or give proportions that sum to 1).")
+    if not res["valid"][0]:
+        raise ValueError("Expected frequencies must be positive and there must be at least two categories.")
+    return _result("chi_square_gof_test", "chi2", res["statistic"][0], res["p_value"][0],
+                   res["critical_value"][0], alpha, df=int(res["df"][0]), k=int(res["k"][0]),
+                   min_expected=res["min_expected"][0], small_expected=int(res["small_expected"][0]))
+
 def chi_square_gof_test(observed, expected, alpha):
-    from scipy.stats import chi2
-    import numpy as np
-    obs = np.array(observed)
-    exp = np.array(expected)
-    chi_stat = np.sum((obs - exp)**2 / exp)
-    df = len(obs) - 1
-    chi_crit = chi2.ppf(1 - alpha, df)
-    p_value = 1 - chi2.cdf(chi_stat, df)
+    res = chi_square_gof_test_stats(observed, expected, alpha)
+    chi_stat = res["statistic"]
     info_text = (
-        f"$k = {len(obs)}$\n\n"
-        f"$df = {df}$\n\n"
-        f"$\\chi^2_c = {format_val(chi_crit)}$\n\n"
+        f"$k = {res['k']}$\n\n"
+        f"$df = {res['df']}$\n\n"
+        f"$\\chi^2_c = {format_val(res['critical_value'])}$\n\n"
         f"$\\chi^2 = {format_val(chi_stat)}$\n\n"
         f"$\\alpha = {format_alpha(alpha)}$\n\n\n"
-        f"$\\chi^2 = \\sum \\frac{{(O_i - E_i)^2}}{{E_i}} = {format_val(chi_stat)}$"
     )
-    fig, ax_info, ax_graph = create_figure_with_info_box(info_text)
+    formula = "$\\chi^2 = \\sum \\frac{(O_i - E_i)^2}{E_i}$"
+    fig, ax_info, ax_graph = create_figure_with_info_box(info_text, formula, chi_stat)
     plot_chi_square_distribution(
         ax_graph=ax_graph,
         alpha=alpha,
         test_stat=chi_stat,
-        p_value=p_value,
+        p_value=res["p_value"],
         test_name="Chi-Square Goodness of Fit Test",
-        df=df
+        df=res["df"]
     )
     return fig, ax_info, ax_graph
 
 ##############################################################################
 # 11) Chi-Square Independent Test
 ##############################################################################
-def chi_square_independence_test(observed_table, alpha):
+def _contingency_stats(test, observed_table, alpha, method="auto"):
     from scipy.stats import chi2_contingency, chi2
     import numpy as np
     table = np.array(observed_table)
     chi_stat, p_value, df, expected = chi2_contingency(table)
     chi_crit = chi2.ppf(1 - alpha, df)
+    used = "asymptotic"
+    if _use_exact(method, _contingency_needs_exact(expected)):
+        counts = tuple(int(v) for v in table.ravel())
+        if table.shape == (2, 2):
+            p_value, used = _fisher_exact_cached(*counts), "fisher_exact"
+        else:
+            shaped = tuple(map(tuple, np.asarray(counts).reshape(table.shape).tolist()))
+            p_value = _fisher_monte_carlo_cached(shaped, MONTE_CARLO_DRAWS, MONTE_CARLO_SEED)
+            used = "monte_carlo"
+    return _result(test, "chi2", chi_stat, p_value, chi_crit, alpha, df=df, method=used,
+                   shape=list(table.shape), expected=expected)
+
+def _contingency_figure(res, alpha, test_name):
+    chi_stat = res["statistic"]
     info_text = (
-        f"$r = {table.shape[0]}, c = {table.shape[1]}$\n\n"
-        f"$df = {df}$\n\n"
-        f"$\\chi^2_c = {format_val(chi_crit)}$\n\n"
+        f"$r = {res['shape'][0]}, c = {res['shape'][1]}$\n\n"
+        f"$df = {res['df']}$\n\n"
+        f"$\\chi^2_c = {format_val(res['critical_value'])}$\n\n"
         f"$\\chi^2 = {format_val(chi_stat)}$\n\n"
-        f"$\\alpha = {format_alpha(alpha)}$\n\n\n"
-        f"$\\chi^2 = \\sum \\frac{{(O_{{ij}} - E_{{ij}})^2}}{{E_{{ij}}}} = {format_val(chi_stat)}$"
+        f"$\\alpha = {format_alpha(alpha)}$\n\n"
+        f"{_method_line(res)}\n"
     )
-    fig, ax_info, ax_graph = create_figure_with_info_box(info_text)
+    formula = "$\\chi^2 = \\sum \\frac{(O_{ij} - E_{ij})^2}{E_{ij}}$"
+    fig, ax_info, ax_graph = create_figure_with_info_box(info_text, formula, chi_stat)
     plot_chi_square_distribution(
         ax_graph=ax_graph,
         alpha=alpha,
         test_stat=chi_stat,
-        p_value=p_value,
-        test_name="Chi-Square Test of Independence",
-        df=df
+        p_value=res["p_value"],
+        test_name=test_name,
+        df=res["df"]
     )
     return fig, ax_info, ax_graph
 
-def chi_square_homogeneity_test(observed_table, alpha):
-    from scipy.stats import chi2_contingency, chi2
-    import numpy as np
-    table = np.array(observed_table)
-    chi_stat, p_value, df, expected = chi2_contingency(table)
+@_timed("compute")
+def chi_square_independence_test_stats(observed_table, alpha, method="auto"):
+    return _contingency_stats("chi_square_independence_test", observed_table, alpha, method)
+
+def chi_square_independence_test(observed_table, alpha, method="auto"):
+    res = chi_square_independence_test_stats(observed_table, alpha, method)
+    return _contingency_figure(res, alpha, "Chi-Square Test of Independence")
+
+@_timed("compute")
+def chi_square_homogeneity_test_stats(observed_table, alpha, method="auto"):
+    return _contingency_stats("chi_square_homogeneity_test", observed_table, alpha, method)
+
+def chi_square_homogeneity_test(observed_table, alpha, method="auto"):
+    res = chi_square_homogeneity_test_stats(observed_table, alpha, method)
+    return _contingency_figure(res, alpha, "Chi-Square Test of Homogeneity")
+
+
+##############################################################################
+# 13) One-Way ANOVA
+##############################################################################
+# The rank and ANOVA tests take either one list per group (groups=[[...], ...])
+# or a flat column with a label per value (values=[...], labels=[...]); both
+# become (x, codes) and every per-group sum is a single np.bincount.
+def _grouped_values(groups=None, values=None, labels=None):
+    if groups is not None:
+        groups = [np.asarray(g, dtype=float).ravel() for g in groups]
+        x = np.concatenate(groups)
+        codes = np.repeat(np.arange(len(groups)), [g.size for g in groups])
+        names = list(range(1, len(groups) + 1))
+    elif values is not None and labels is not None:
+        x = np.asarray(values, dtype=float)
+        names, codes = np.unique(np.asarray(labels), return_inverse=True)
+        names = names.tolist()
+    else:
+        raise ValueError("Pass groups=[...] or values=[...] with labels=[...].")
+    keep = ~np.isnan(x)
+    x, codes = x[keep], codes[keep]
+    # drop groups left empty after removing missing values
+    present = np.bincount(codes, minlength=len(names)) > 0
+    remap = np.cumsum(present) - 1
+    return x, remap[codes], [name for name, ok in zip(names, present) if ok]
+
+def _tie_term(x):
+    _, t = np.unique(x, return_counts=True)
+    return float(np.sum(t**3 - t))
+
+@_timed("compute")
+def one_way_anova_test_stats(alpha, groups=None, values=None, labels=None, n=None, means=None, sds=None):
+    from scipy.stats import f
+
+    if n is not None:
+        # grouped summary statistics
+        n = np.asarray(n, dtype=float)
+        means = np.asarray(means, dtype=float)
+        within = (n - 1) * np.asarray(sds, dtype=float)**2
+        names = list(range(1, n.size + 1))
+    else:
+        x, codes, names = _grouped_values(groups, values, labels)
+        k = len(names)
+        shift = x.mean()
+        n = np.bincount(codes, minlength=k).astype(float)
+        s = np.bincount(codes, x - shift, minlength=k)
+        ss = np.bincount(codes, (x - shift)**2, minlength=k)
+        means = s / n + shift
+        within = ss - s * s / n
+
+    k, N = n.size, int(round(n.sum()))
+    grand = np.sum(n * means) / N
+    ss_between = float(np.sum(n * (means - grand)**2))
+    ss_within = float(np.sum(within))
+    dfn, dfd = k - 1, N - k
+    if k < 2 or N <= k:
+        raise ValueError("One-way ANOVA needs at least two groups and more values than groups.")
+    if not ss_within > 0:
+        raise ValueError("One-way ANOVA needs some variation within the groups.")
+    f_stat = (ss_between / dfn) / (ss_within / dfd)
+    f_crit = f.ppf(1 - alpha, dfn, dfd)
+    p_value = f.sf(f_stat, dfn, dfd)
+    return _result("one_way_anova_test", "f", f_stat, p_value, f_crit, alpha, df=[dfn, dfd],
+                   k=k, N=N, groups=names, n=n, means=means,
+                   ss_between=ss_between, ss_within=ss_within,
+                   eta_squared=ss_between / (ss_between + ss_within))
+
+def one_way_anova_test(alpha, groups=None, values=None, labels=None, n=None, means=None, sds=None):
+    res = one_way_anova_test_stats(alpha, groups, values, labels, n, means, sds)
+    f_stat = res["statistic"]
+    dfn, dfd = res["df"]
+
+    info_text = (
+        f"$k = {res['k']}$\n\n"
+        f"$N = {res['N']}$\n\n"
+        f"$df_B = {dfn}$\n\n"
+        f"$df_W = {dfd}$\n\n"
+        f"$F_c = {format_val(res['critical_value'])}$\n\n"
+        f"$F = {format_val(f_stat)}$\n\n"
+        f"$\\alpha = {format_alpha(alpha)}$\n\n\n"
+    )
+    formula = "$F = \\frac{SS_B / (k-1)}{SS_W / (N-k)}$"
+
+    fig, ax_info, ax_graph = create_figure_with_info_box(info_text, formula, f_stat)
+    plot_f_distribution(
+        ax_graph=ax_graph,
+        alpha=alpha,
+        test_stat=f_stat,
+        p_value=res["p_value"],
+        test_name="One-Way ANOVA",
+        dfn=dfn,
+        dfd=dfd
+    )
+    return fig, ax_info, ax_graph
+
+
+##############################################################################
+# 14) Kruskal-Wallis H Test
+##############################################################################
+@_timed("compute")
+def kruskal_wallis_test_stats(alpha, groups=None, values=None, labels=None):
+    from scipy.stats import chi2, rankdata
+
+    x, codes, names = _grouped_values(groups, values, labels)
+    k, N = len(names), x.size
+    n = np.bincount(codes, minlength=k)
+    if N < 2 or np.all(x == x[0]):
+        raise ValueError("Kruskal-Wallis test needs values that are not all tied.")
+    rank_sums = np.bincount(codes, rankdata(x), minlength=k)
+    h_stat = 12 / (N * (N + 1)) * np.sum(rank_sums**2 / n) - 3 * (N + 1)
+    h_stat /= 1 - _tie_term(x) / (N**3 - N)
+    df = k - 1
     chi_crit = chi2.ppf(1 - alpha, df)
+    p_value = chi2.sf(h_stat, df)
+    return _result("kruskal_wallis_test", "chi2", h_stat, p_value, chi_crit, alpha, df=df,
+                   k=k, N=N, groups=names, n=n, rank_sums=rank_sums)
+
+def kruskal_wallis_test(alpha, groups=None, values=None, labels=None):
+    res = kruskal_wallis_test_stats(alpha, groups, values, labels)
+    h_stat = res["statistic"]
+
     info_text = (
-        f"$r = {table.shape[0]}, c = {table.shape[1]}$\n\n"
-        f"$df = {df}$\n\n"
-        f"$\\chi^2_c = {format_val(chi_crit)}$\n\n"
-        f"$\\chi^2 = {format_val(chi_stat)}$\n\n"
+        f"$k = {res['k']}$\n\n"
+        f"$N = {res['N']}$\n\n"
+        f"$df = {res['df']}$\n\n"
+        f"$\\chi^2_c = {format_val(res['critical_value'])}$\n\n"
+        f"$H = {format_val(h_stat)}$\n\n"
         f"$\\alpha = {format_alpha(alpha)}$\n\n\n"
-        f"$\\chi^2 = \\sum \\frac{{(O_{{ij}} - E_{{ij}})^2}}{{E_{{ij}}}} = {format_val(chi_stat)}$"
     )
-    fig, ax_info, ax_graph = create_figure_with_info_box(info_text)
+    formula = "$H = \\frac{12}{N(N+1)} \\sum \\frac{R_i^2}{n_i} - 3(N+1)$"
+
+    fig, ax_info, ax_graph = create_figure_with_info_box(info_text, formula, h_stat)
     plot_chi_square_distribution(
         ax_graph=ax_graph,
         alpha=alpha,
-        test_stat=chi_stat,
-        p_value=p_value,
-        test_name="Chi-Square Test of Homogeneity",
-        df=df
+        test_stat=h_stat,
+        p_value=res["p_value"],
+        test_name="Kruskal-Wallis H Test",
+        df=res["df"]
     )
     return fig, ax_info, ax_graph
 
 
+##############################################################################
+# 15) Mann-Whitney U Test (normal approximation)
+##############################################################################
+def _continuity_z(stat, mu, sigma, tail_type):
+    # continuity correction of 0.5 towards the null mean, per tail
+    if tail_type == 1:
+        return (stat - mu + 0.5) / sigma
+    if tail_type == 2:
+        return (stat - mu - 0.5) / sigma
+    return (stat - mu - 0.5 * np.sign(stat - mu)) / sigma
+
+@_timed("compute")
+def mann_whitney_u_test_stats(x, y, alpha, tail_type=3):
+    from scipy.stats import rankdata
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    x, y = x[~np.isnan(x)], y[~np.isnan(y)]
+    n1, n2 = x.size, y.size
+    N = n1 + n2
+    both = np.concatenate([x, y])
+    if n1 == 0 or n2 == 0 or np.all(both == both[0]):
+        raise ValueError("Mann-Whitney U test needs values in both samples that are not all tied.")
+    u_stat = rankdata(both)[:n1].sum() - n1 * (n1 + 1) / 2
+    mu = n1 * n2 / 2
+    sigma = (n1 * n2 / 12 * ((N + 1) - _tie_term(both) / (N * (N - 1))))**0.5
+
+    # tail_type: 1 => x tends to be smaller than y, 2 => larger, 3 => either
+    z_stat = _continuity_z(u_stat, mu, sigma, tail_type)
+    z_crit, p_value = _tail_result("z", z_stat, alpha, tail_type)
+    return _result("mann_whitney_u_test", "z", z_stat, min(p_value, 1.0), z_crit, alpha, tail_type,
+                   u=u_stat, n1=n1, n2=n2)
+
+def mann_whitney_u_test(x, y, alpha, tail_type=3):
+    res = mann_whitney_u_test_stats(x, y, alpha, tail_type)
+    z_stat = res["statistic"]
+
+    info_text = (
+        f"$n_1 = {res['n1']}$\n\n"
+        f"$n_2 = {res['n2']}$\n\n"
+        f"$U = {format_val(res['u'])}$\n\n"
+        f"{_crit_str('z', res['critical_value'], tail_type)}\n\n"
+        f"$z = {format_val(z_stat)}$\n\n"
+        f"$\\alpha = {format_alpha(alpha)}$\n\n\n"
+    )
+    formula = "$z = \\frac{U - n_1 n_2 / 2}{\\sigma_U}$"
+
+    fig, ax_info, ax_graph = create_figure_with_info_box(info_text, formula, z_stat)
+    plot_test_distribution(
+        ax_graph=ax_graph,
+        distribution="z",
+        alpha=alpha,
+        tail_type=tail_type,
+        test_stat=z_stat,
+        p_value=res["p_value"],
+        test_name="Mann-Whitney U Test",
+        stat_label="z"
+    )
+    return fig, ax_info, ax_graph
+
+
+##############################################################################
+# 16) Wilcoxon Signed-Rank Test (normal approximation)
+##############################################################################
+@_timed("compute")
+def wilcoxon_signed_rank_test_stats(x, y, alpha, tail_type=3):
+    from scipy.stats import rankdata
+
+    d = np.asarray(x, dtype=float) - np.asarray(y, dtype=float)
+    # pairs with a missing value or no difference carry no sign
+    d = d[~np.isnan(d) & (d != 0)]
+    n = d.size
+    if n == 0:
+        raise ValueError("Wilcoxon signed-rank test needs at least one nonzero difference.")
+    r = rankdata(np.abs(d))
+    w_plus = r[d > 0].sum()
+    mu = n * (n + 1) / 4
+    sigma = (n * (n + 1) * (2 * n + 1) / 24 - _tie_term(np.abs(d)) / 48)**0.5
+
+    # tail_type: 1 => x - y tends to be negative, 2 => positive, 3 => either
+    z_stat = (w_plus - mu) / sigma
+    z_crit, p_value = _tail_result("z", z_stat, alpha, tail_type)
+    return _result("wilcoxon_signed_rank_test", "z", z_stat, p_value, z_crit, alpha, tail_type,
+                   w_plus=w_plus, n=n)
+
+def wilcoxon_signed_rank_test(x, y, alpha, tail_type=3):
+    res = wilcoxon_signed_rank_test_stats(x, y, alpha, tail_type)
+    z_stat = res["statistic"]
+
+    info_text = (
+        f"$n = {res['n']}$\n\n"
+        f"$W^+ = {format_val(res['w_plus'])}$\n\n"
+        f"{_crit_str('z', res['critical_value'], tail_type)}\n\n"
+        f"$z = {format_val(z_stat)}$\n\n"
+        f"$\\alpha = {format_alpha(alpha)}$\n\n\n"
+    )
+    formula = "$z = \\frac{W^+ - n(n+1)/4}{\\sigma_W}$"
+
+    fig, ax_info, ax_graph = create_figure_with_info_box(info_text, formula, z_stat)
+    plot_test_distribution(
+        ax_graph=ax_graph,
+        distribution="z",
+        alpha=alpha,
+        tail_type=tail_type,
+        test_stat=z_stat,
+        p_value=res["p_value"],
+        test_name="Wilcoxon Signed-Rank Test",
+        stat_label="z"
+    )
+    return fig, ax_info, ax_graph
+
+
+
+##############################################################################
+#     PARAMETER-SWEEP ANIMATION
+##############################################################################
+# One figure is built for the whole sweep. Everything that does not depend on
+# the swept parameter (axes, ticks, labels, title) is drawn once and kept as a
+# pixel background; each frame restores it and redraws only the curve, the
+# critical regions and lines, the statistic, the legend and the info text
+# (blitting). Axis limits are fixed to the union over every frame so the
+# background stays valid. Frames go to the encoder as they are produced.
+# Labels that change from frame to frame are plain text: a mathtext string
+# with a new number in it misses the parse cache and would cost more than the
+# rest of the frame.
+SWEEP_LABELS = {"z": "z", "t": "t", "chi2": "\u03c7\u00b2", "f": "F"}
+
+def _sweep_distribution(res):
+    from scipy.stats import norm, t, chi2, f
+
+    dist, df = res["distribution"], res["df"]
+    if dist == "z":
+        return norm()
+    if dist == "t":
+        return t(df)
+    if dist == "chi2":
+        return chi2(df)
+    if dist == "f":
+        return f(*df)
+    raise ValueError(f"Cannot animate a {dist!r} distribution.")
+
+def _sweep_limits(res, frozen):
+    dist = res["distribution"]
+    if dist == "z":
+        return -4.0, 4.0
+    if dist == "t":
+        x_max = min(frozen.ppf(0.999), 8.0)
+        return -x_max, x_max
+    x_min = 0.0 if np.ravel(res["df"])[0] > 2 else 1e-6
+    return x_min, max(frozen.ppf(0.999), res["critical_value"] * 1.5)
+
+def _sweep_regions(res, x_min, x_max):
+    # (start, end) of each shaded critical region and the critical values
+    # drawn as dashed lines
+    crit, tail_type = res["critical_value"], res["tail_type"]
+    if tail_type == 1:
+        return [(x_min, crit)], [crit]
+    if tail_type == 3:
+        return [(x_min, -crit), (crit, x_max)], [-crit, crit]
+    return [(crit, x_max)], [crit]
+
+def _sweep_crit_str(res):
+    label = SWEEP_LABELS[res["distribution"]]
+    sign = "\u00b1" if res["tail_type"] == 3 else ""
+    return f"{label} critical = {sign}{format_val(res['critical_value'])}"
+
+def _sweep_info(param, value, res):
+    label = SWEEP_LABELS[res["distribution"]]
+    df = res["df"]
+    df_str = "" if df is None else (
+        f"df = ({format_val(df[0])}, {format_val(df[1])})\n\n" if isinstance(df, list)
+        else f"df = {format_val(df)}\n\n")
+    value_str = str(value) if isinstance(value, (int, np.integer)) else format_val(value)
+    return (
+        f"{param} = {value_str}\n\n"
+        f"{df_str}"
+        f"{_sweep_crit_str(res)}\n\n"
+        f"{label} = {format_val(res['statistic'])}\n\n"
+        f"\u03b1 = {format_alpha(res['alpha'])}\n\n"
+        f"p = {res['p_value']:.3e}\n\n"
+        f"{'reject' if res['reject'] else 'fail to reject'} H\u2080"
+    )
+
+def sweep_frames(name, param, values, dpi=100, **params):
+    # yields (value, result, rgba) per frame; rgba is a (height, width, 4)
+    # view of the canvas and is only valid until the next frame
+    results = [TEST_STATS[name](**{**params, param: v}) for v in values]
+    if not results:
+        return
+    frozen = [_sweep_distribution(res) for res in results]
+    limits = [_sweep_limits(res, fz) for res, fz in zip(results, frozen)]
+    x_min = min(lo for lo, _ in limits)
+    x_max = max(hi for _, hi in limits)
+    x_vals = np.linspace(x_min, x_max, 1000)
+    capped = results[0]["distribution"] in ("chi2", "f")
+    pdf = lambda fz, x: np.minimum(fz.pdf(x), 1.0) if capped else fz.pdf(x)
+    y_max = max(np.max(pdf(fz, x_vals)) for fz in frozen) * 1.35
+    label = SWEEP_LABELS[results[0]["distribution"]]
+
+    fig, ax_info, ax_graph = create_figure_with_info_box(_sweep_info(param, values[0], results[0]))
+    fig.set_dpi(dpi)
+    info = ax_info.texts[0]
+    curve, = ax_graph.plot(x_vals, pdf(frozen[0], x_vals), color=COLOR_CURVE, lw=2)
+    shades = [ax_graph.fill([0], [0], color=COLOR_SHADE, alpha=0.7, lw=0)[0] for _ in range(2)]
+    line_style = dict(lw=2, marker='.', markersize=10, markevery=[0], zorder=10)
+    crit_lines = [ax_graph.plot([], [], color='#7E4794', linestyle='--', **line_style)[0] for _ in range(2)]
+    stat_line, = ax_graph.plot([], [], color='#ff8ca1', linestyle='-', **line_style)
+    h0 = ax_graph.text(0, 0, r"$H_0$", fontsize=14, ha='center', va='center', color=DARK_GRAY)
+    p_handle, = ax_graph.plot([], [], ' ')
+    ax_graph.set_xlabel(label, color=DARK_GRAY)
+    ax_graph.set_ylabel("$Probability$", color=DARK_GRAY)
+    ax_graph.set_title(f"{name.replace('_', ' ').title()}: {param} sweep", color=DARK_GRAY)
+    ax_graph.set_xlim(x_min, x_max)
+    ax_graph.set_ylim(0, y_max)
+    legend = ax_graph.legend([curve, shades[0], crit_lines[0], stat_line, p_handle],
+                             [f"{label}-distribution", "", "", "", ""], loc="upper right")
+
+    animated = [curve, *shades, *crit_lines, stat_line, h0, legend, info]
+    for artist in animated:
+        artist.set_animated(True)
+    canvas = fig.canvas
+    canvas.draw()
+    background = canvas.copy_from_bbox(fig.bbox)
+
+    try:
+        for value, res, fz in zip(values, results, frozen):
+            curve.set_ydata(pdf(fz, x_vals))
+            regions, crits = _sweep_regions(res, x_min, x_max)
+            for i, shade in enumerate(shades):
+                shade.set_visible(i < len(regions))
+                if i < len(regions):
+                    xs = np.linspace(*regions[i], 200)
+                    shade.set_xy(np.column_stack([np.r_[xs[0], xs, xs[-1]], np.r_[0, pdf(fz, xs), 0]]))
+            for i, line in enumerate(crit_lines):
+                line.set_visible(i < len(crits))
+                if i < len(crits):
+                    line.set_data([crits[i]] * 2, [0, min(fz.pdf(crits[i]) * MULTIPLIER, y_max)])
+            stat = max(x_min, min(x_max, res["statistic"]))
+            stat_line.set_data([stat] * 2, [0, min(fz.pdf(stat) * MULTIPLIER, y_max)])
+            h0_x = 0.0 if not capped else fz.ppf(0.5)
+            h0.set_position((h0_x, min(fz.pdf(h0_x) * 0.5, y_max * 0.5)))
+            texts = legend.get_texts()
+            texts[1].set_text(f"Critical region (\u03b1 = {format_alpha(res['alpha'])})")
+            texts[2].set_text(_sweep_crit_str(res))
+            texts[3].set_text(f"{label} = {format_val(res['statistic'])}")
+            texts[4].set_text(f"p-value = {res['p_value']:.3e}")
+            info.set_text(_sweep_info(param, value, res))
+
+            canvas.restore_region(background)
+            for artist in animated:
+                if artist.get_visible():
+                    fig.draw_artist(artist)
+            yield value, res, np.asarray(canvas.buffer_rgba())
+    finally:
+        canvas.renderer = None
+        fig.clear()
+
+def _write_frames_pillow(frames, out, fps, format=None):
+    from PIL import Image
+
+    def images():
+        palette = None
+        for _, _, rgba in frames:
+            image = Image.fromarray(rgba).convert("RGB")
+            if format == "WEBP":
+                yield image
+                continue
+            # the figure has few colours and they do not change between
+            # frames, so the first frame's palette is reused for the rest
+            # (one byte per pixel for the frames Pillow holds until the file
+            # is closed, and no per-frame palette search)
+            if palette is None:
+                palette = image.quantize(colors=256, dither=Image.Dither.NONE)
+                yield palette
+            else:
+                yield image.quantize(palette=palette, dither=Image.Dither.NONE)
+
+    stream = images()
+    first = next(stream, None)
+    if first is None:
+        raise ValueError("No values to animate.")
+    if format != "GIF":
+        # only the GIF writer consumes append_images as it goes
+        stream = list(stream)
+    # optimize=False: the frames already share one palette, so Pillow's
+    # per-frame palette remapping would only cost time
+    first.save(out, format=format, save_all=True, append_images=stream,
+               duration=int(round(1000 / fps)), loop=0, optimize=False)
+
+def _write_frames_ffmpeg(frames, out, fps):
+    import shutil
+    import subprocess
+
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None:
+        raise RuntimeError(f"ffmpeg is needed for {out!r}; write a .gif, .png (APNG) or a directory instead.")
+    proc = None
+    try:
+        for _, _, rgba in frames:
+            if proc is None:
+                height, width = rgba.shape[:2]
+                proc = subprocess.Popen(
+                    [ffmpeg, "-y", "-loglevel", "error", "-f", "rawvideo", "-pix_fmt", "rgba",
+                     "-s", f"{width}x{height}", "-r", str(fps), "-i", "-",
+                     "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2", "-pix_fmt", "yuv420p", out],
+                    stdin=subprocess.PIPE)
+            proc.stdin.write(rgba.tobytes())
+    finally:
+        if proc is not None:
+            proc.stdin.close()
+            if proc.wait() != 0:
+                raise RuntimeError(f"ffmpeg exited with status {proc.returncode}.")
+
+def _write_frames_dir(frames, out):
+    from PIL import Image
+
+    os.makedirs(out, exist_ok=True)
+    for i, (_, _, rgba) in enumerate(frames):
+        Image.fromarray(rgba).save(os.path.join(out, f"frame_{i:04d}.png"), compress_level=1)
+
+def animate_sweep(name, param, values, out=None, fps=10, dpi=100, **params):
+    # out=None returns a base64 GIF like TESTS; otherwise the extension picks
+    # the format: .gif, .png/.apng (APNG), .webp, .mp4/.webm/.mov (ffmpeg),
+    # or no extension for a directory of PNG frames
+    values = list(values)
+    frames = sweep_frames(name, param, values, dpi=dpi, **params)
+    if out is None:
+        buf = io.BytesIO()
+        _write_frames_pillow(frames, buf, fps, "GIF")
+        return base64.b64encode(buf.getbuffer()).decode("utf-8")
+    ext = os.path.splitext(out)[1].lower()
+    if ext in (".gif", ".png", ".apng", ".webp"):
+        _write_frames_pillow(frames, out, fps, {".gif": "GIF", ".webp": "WEBP"}.get(ext, "PNG"))
+    elif ext in (".mp4", ".webm", ".mov", ".mkv"):
+        _write_frames_ffmpeg(frames, out, fps)
+    elif ext == "":
+        _write_frames_dir(frames, out)
+    else:
+        raise ValueError(f"Unsupported animation format {ext!r}.")
+    return out
+
 
 def show_figure(fig):
+    # figures are created without pyplot, so hand this one to a pyplot
+    # manager before showing it
+    if fig.canvas.manager is None:
+        manager = plt.figure().canvas.manager
+        manager.canvas.figure = fig
+        fig.set_canvas(manager.canvas)
     plt.show()
 
 def save_figure(fig, filename="my_figure.png"):
     fig.savefig(filename, bbox_inches='tight')
 
-def _wrap_test_function(func):
-    def wrapped(*args, **kwargs):
+def _with_ci_panel(func, args, kwargs, ci_levels):
+    global _captured_results
+    if not ci_levels:
+        return func(*args, **kwargs)
+    stats_func = TEST_STATS[func.__name__]
+    _captured_results = {}
+    try:
         fig, ax_info, ax_graph = func(*args, **kwargs)
-        buf = io.BytesIO()
-        fig.savefig(buf, format="png", bbox_inches="tight", dpi=300)
-        plt.close(fig)
-        buf.seek(0)
-        return base64.b64encode(buf.read()).decode("utf-8")
+        res = _captured_results.get(stats_func.__name__)
+    finally:
+        _captured_results = None
+    if res is None:
+        res = stats_func(*args, **kwargs)
+    if "ci_se" in res:
+        plot_confidence_intervals(ax_graph, res, ci_levels)
+    return fig, ax_info, ax_graph
+
+_PNG_BUFFER = io.BytesIO()
+
+def _savefig_png(fig):
+    # the shared buffer is rewound and overwritten in place, so its
+    # allocation is reused from one render to the next
+    _PNG_BUFFER.seek(0)
+    fig.savefig(_PNG_BUFFER, format="png", bbox_inches="tight", dpi=300)
+    _PNG_BUFFER.truncate()
+    # drop the full-size Agg pixel buffer now rather than whenever the
+    # figure's reference cycles are next collected
+    if getattr(fig.canvas, "renderer", None) is not None:
+        fig.canvas.renderer = None
+        fig.canvas._lastKey = None
+    fig.clear()
+
+def _encode_png():
+    with _PNG_BUFFER.getbuffer() as view:
+        return base64.b64encode(view).decode("utf-8")
+
+def _wrap_test_function(func):
+    # ci_levels=[...] adds a confidence-interval panel to the rendered figure
+    @functools.wraps(func)
+    def wrapped(*args, ci_levels=None, **kwargs):
+        global _current_profile
+        if not PROFILE["enabled"]:
+            fig, ax_info, ax_graph = _with_ci_panel(func, args, kwargs, ci_levels)
+            _savefig_png(fig)
+            image = _encode_png()
+            _enforce_memory_ceiling()
+            return image
+
+        rec = {"test": func.__name__}
+        tracing = PROFILE["memory"] and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+        _current_profile = rec
+        start = time.perf_counter()
+        try:
+            fig, ax_info, ax_graph = _with_ci_panel(func, args, kwargs, ci_levels)
+            t0 = time.perf_counter()
+            _savefig_png(fig)
+            t1 = time.perf_counter()
+            image = _encode_png()
+            t2 = time.perf_counter()
+        finally:
+            _current_profile = None
+            if tracing:
+                rec["peak_memory"] = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+        rec["savefig"] = t1 - t0
+        rec["encode"] = t2 - t1
+        rec["total"] = t2 - start
+        _enforce_memory_ceiling(rec)
+        PROFILE_HISTORY.append(rec)
+        LAST_PROFILE.clear()
+        LAST_PROFILE.update(rec)
+        return image
     return wrapped
 
+def run_profiled(name, **params):
+    image = TESTS[name](**params)
+    return {"image": image, "profile": dict(LAST_PROFILE)}
+
 TESTS = {}
 
 TESTS["one_sample_t_test"] = _wrap_test_function(one_sample_t_test)
@@ -990,4 +2095,37 @@ TESTS["two_independent_t_test"] = _wrap_test_function(two_independent_t_test)
 TESTS["chi_square_gof_test"] = _wrap_test_function(chi_square_gof_test)
 TESTS["chi_square_independence_test"] = _wrap_test_function(chi_square_independence_test)
 TESTS["two_independent_proportion_z_test"] = _wrap_test_function(two_independent_proportion_z_test)
-TESTS["chi_square_homogeneity_test"] = _wrap_test_function(chi_square_homogeneity_test)
\ No newline at end of file
+TESTS["chi_square_homogeneity_test"] = _wrap_test_function(chi_square_homogeneity_test)
+TESTS["one_way_anova_test"] = _wrap_test_function(one_way_anova_test)
+TESTS["kruskal_wallis_test"] = _wrap_test_function(kruskal_wallis_test)
+TESTS["mann_whitney_u_test"] = _wrap_test_function(mann_whitney_u_test)
+TESTS["wilcoxon_signed_rank_test"] = _wrap_test_function(wilcoxon_signed_rank_test)
+
+# Compute-only counterparts: same parameters as TESTS, returning a dict of
+# statistic, p-value, critical value, df and decision instead of an image.
+TEST_STATS = {}
+
+TEST_STATS["one_sample_t_test"] = one_sample_t_test_stats
+TEST_STATS["one_sample_z_test"] = one_sample_z_test_stats
+TEST_STATS["one_sample_proportion_z_test"] = one_sample_proportion_z_test_stats
+TEST_STATS["two_dependent_z_test"] = two_dependent_z_test_stats
+TEST_STATS["two_dependent_t_test"] = two_dependent_t_test_stats
+TEST_STATS["two_dependent_proportion_test"] = two_dependent_proportion_test_stats
+TEST_STATS["two_independent_z_test"] = two_independent_z_test_stats
+TEST_STATS["two_independent_t_test"] = two_independent_t_test_stats
+TEST_STATS["chi_square_gof_test"] = chi_square_gof_test_stats
+TEST_STATS["chi_square_independence_test"] = chi_square_independence_test_stats
+TEST_STATS["two_independent_proportion_z_test"] = two_independent_proportion_z_test_stats
+TEST_STATS["chi_square_homogeneity_test"] = chi_square_homogeneity_test_stats
+TEST_STATS["one_way_anova_test"] = one_way_anova_test_stats
+TEST_STATS["kruskal_wallis_test"] = kruskal_wallis_test_stats
+TEST_STATS["mann_whitney_u_test"] = mann_whitney_u_test_stats
+TEST_STATS["wilcoxon_signed_rank_test"] = wilcoxon_signed_rank_test_stats
+
+# Columnar variants: arrays of summary numbers in, a dict of arrays out (see
+# bulk_test for passing a table).
+BULK_TESTS = {}
+
+BULK_TESTS["two_independent_t_test"] = two_independent_t_test_bulk
+BULK_TESTS["two_independent_proportion_z_test"] = two_independent_proportion_z_test_bulk
+BULK_TESTS["chi_square_gof_test"] = chi_square_gof_test_bulk
@@ -1,21 +1,10 @@
 // src/App.tsx
-import { useEffect, useState } from "react";
-import LoadingScreen from "./LoadingScreen";
 import MainContent from "./MainContent";
-import { initPyodide } from "./pyodideLoader";
 import { Analytics } from "@vercel/analytics/react"
 import "./App.css";
 export default function App() {
-  const [pyReady, setPyReady] = useState(false);
-
-  useEffect(() => {
-    initPyodide().then(() => setPyReady(true));
-  }, []);
-
-  if (!pyReady) {
-    return <LoadingScreen />;
-  }
-
+  // MainContent renders the forms straight away and starts Pyodide itself;
+  // critical values come from the precomputed tables until it is ready
   return (
     <div>
       <MainContent />
@@ -14,6 +14,7 @@ import {
   CardTitle,
 } from "@/components/ui/card"
 import { initPyodide } from "./pyodideLoader"
+import { loadCriticalTables } from "./lib/criticalValues"
 
 
 import OneSampleTForm from "./components/forms/OneSampleTForm"
@@ -33,17 +34,10 @@ export default function MainContent() {
   const [pyReady, setPyReady] = useState(false)
 
   useEffect(() => {
+    loadCriticalTables()
     initPyodide().then(() => setPyReady(true))
   }, [])
 
-  if (!pyReady) {
-    return (
-      <div className="min-h-screen bg-black text-white flex items-center justify-center">
-        <h1 className="text-2xl text-center">Loading Python environment...</h1>
-      </div>
-    )
-  }
-
   return (
     <div className="bg-black text-white min-h-screen flex flex-col">
       <Tabs defaultValue="oneSampleT" className="flex-grow flex flex-col">
@@ -53,6 +47,11 @@ export default function MainContent() {
             Hypothesis Test Plotter
           </h1>
           <p className="text-center text-xs mb-10 text-gray-400">
+          {!pyReady && (
+            <span className="block text-yellow-400 mb-2">
+              Loading Python environment... critical values are available now; plots will render once it is ready.
+            </span>
+          )}
           This tool is specifically designed to automatically generate graphs and plots that meet the AP Statistics Semester 2 project’s requirements. This software is provided “as is,” without any warranty of any kind. The author accepts no liability for errors, omissions, or misuse of the tool. Users should verify the results themselves.
           </p>
 
@@ -38,6 +38,12 @@ export default function ChiSquareGofForm() {
       setError("Expected frequencies must be strictly positive.");
       return;
     }
+    const obsTotal = obsArr.reduce((a, b) => a + b, 0);
+    const expTotal = expArr.reduce((a, b) => a + b, 0);
+    if (Math.abs(expTotal - 1) > 1e-9 && Math.abs(expTotal - obsTotal) > 1e-6 * obsTotal) {
+      setError("Expected frequencies must add up to the observed total (or be proportions that add up to 1).");
+      return;
+    }
     if (alpha <= 0 || alpha >= 1) {
       setError("Significance level α must be between 0 and 1 (exclusive).");
       return;
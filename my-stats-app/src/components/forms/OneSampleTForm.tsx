@@ -2,6 +2,7 @@
 import React, { useState } from "react";
 import { runTestFunction } from "../../pyodideLoader";
 import { Button } from "@/components/ui/button";
+import { useCriticalValue } from "@/lib/criticalValues";
 
 export default function OneSampleTForm() {
   const defaultValues = {
@@ -21,10 +22,19 @@ export default function OneSampleTForm() {
   const [tailType, setTailType] = useState<number>(defaultValues.tailType);
   const [imgB64, setImgB64] = useState<string>("");
   const [error, setError] = useState<string>("");
+  const tCrit = useCriticalValue("t", alpha, tailType, n - 1);
 
   async function handleSubmit(e: React.FormEvent) {
     e.preventDefault();
     setError("");
+    if (n < 2) {
+      setError("n must be at least 2.");
+      return;
+    }
+    if (alpha <= 0 || alpha >= 1) {
+      setError("Significance level α must be between 0 and 1.");
+      return;
+    }
     try {
       const base64 = await runTestFunction("one_sample_t_test", {
         n,
@@ -134,6 +144,12 @@ export default function OneSampleTForm() {
         </select>
       </div>
 
+      {tCrit !== null && (
+        <p className="text-sm text-gray-400">
+          df = {n - 1}, t<sub>c</sub> = {tailType === 3 ? "±" : ""}{tCrit.toFixed(4)}
+        </p>
+      )}
+
       <div className="flex flex-col space-y-2">
         <Button type="submit">Solve &amp; Graph</Button>
         <Button variant="outline" onClick={handleClear}>Clear Form</Button>
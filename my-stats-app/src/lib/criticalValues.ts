@@ -0,0 +1,168 @@
+// src/lib/criticalValues.ts
+// Critical values and tail probabilities from the tables written by
+// analysis/critical_tables.py (public/critical_values.json), so forms can
+// show them without waiting for Pyodide. Interpolation mirrors
+// CriticalTables in that script.
+
+import { useEffect, useState } from 'react';
+
+export type Distribution = 'z' | 't' | 'chi2';
+
+interface RawTables {
+  alphas: number[];
+  z: number[];
+  t: { df: number[]; upper: number[][] };
+  chi2: { df: number[]; upper: number[][] };
+}
+
+let tablesPromise: Promise<RawTables> | null = null;
+let tables: RawTables | null = null;
+
+export function loadCriticalTables(): Promise<RawTables> {
+  if (!tablesPromise) {
+    tablesPromise = fetch('/critical_values.json', { cache: 'force-cache' })
+      .then((resp) => resp.json())
+      .then((data: RawTables) => (tables = data));
+  }
+  return tablesPromise;
+}
+
+export function criticalTablesReady(): boolean {
+  return tables !== null;
+}
+
+// Upper-tail normal quantile z such that P(Z > z) = p (Acklam's algorithm).
+export function normalIsf(p: number): number {
+  const a = [-3.969683028665376e1, 2.209460984245205e2, -2.759285104469687e2,
+    1.38357751867269e2, -3.066479806614716e1, 2.506628277459239];
+  const b = [-5.447609879822406e1, 1.615858368580409e2, -1.556989798598866e2,
+    6.680131188771972e1, -1.328068155288572e1];
+  const c = [-7.784894002430293e-3, -3.223964580411365e-1, -2.400758277161838,
+    -2.549732539343734, 4.374664141464968, 2.938163982698783];
+  const d = [7.784695709041462e-3, 3.224671290700398e-1, 2.445134137142996,
+    3.754408661907416];
+  const q = 1 - p; // lower-tail probability
+  if (q <= 0) return Infinity;
+  if (q >= 1) return -Infinity;
+  const low = 0.02425;
+  if (q < low || q > 1 - low) {
+    const r = Math.sqrt(-2 * Math.log(q < low ? q : 1 - q));
+    const x = (((((c[0] * r + c[1]) * r + c[2]) * r + c[3]) * r + c[4]) * r + c[5]) /
+      ((((d[0] * r + d[1]) * r + d[2]) * r + d[3]) * r + 1);
+    return q < low ? x : -x;
+  }
+  const u = q - 0.5;
+  const r = u * u;
+  return (((((a[0] * r + a[1]) * r + a[2]) * r + a[3]) * r + a[4]) * r + a[5]) * u /
+    (((((b[0] * r + b[1]) * r + b[2]) * r + b[3]) * r + b[4]) * r + 1);
+}
+
+// P(Z > z), via the complementary error function (fractional error < 1.2e-7).
+export function normalSf(z: number): number {
+  const x = z / Math.SQRT2;
+  const ax = Math.abs(x);
+  const t = 1 / (1 + 0.5 * ax);
+  const erfc = t * Math.exp(-ax * ax - 1.26551223 + t * (1.00002368 + t * (0.37409196 +
+    t * (0.09678418 + t * (-0.18628806 + t * (0.27886807 + t * (-1.13520398 +
+    t * (1.48851587 + t * (-0.82215223 + t * 0.17087277)))))))));
+  return 0.5 * (x >= 0 ? erfc : 2 - erfc);
+}
+
+// np.interp: xs ascending, clamped at both ends
+function interp(x: number, xs: number[], ys: number[]): number {
+  const n = xs.length;
+  if (x <= xs[0]) return ys[0];
+  if (x >= xs[n - 1]) return ys[n - 1];
+  let lo = 0;
+  let hi = n - 1;
+  while (hi - lo > 1) {
+    const mid = (lo + hi) >> 1;
+    if (xs[mid] <= x) lo = mid;
+    else hi = mid;
+  }
+  const w = (x - xs[lo]) / (xs[hi] - xs[lo]);
+  return ys[lo] * (1 - w) + ys[hi] * w;
+}
+
+function interpRows(x: number, xs: number[], rows: number[][], f = (v: number) => v): number[] {
+  let i = 0;
+  while (i < xs.length - 2 && xs[i + 1] < x) i++;
+  const w = Math.min(Math.max((x - xs[i]) / (xs[i + 1] - xs[i]), 0), 1);
+  return rows[i].map((v, j) => f(v) * (1 - w) + f(rows[i + 1][j]) * w);
+}
+
+function row(tbl: RawTables, dist: Distribution, df?: number): number[] {
+  if (dist === 'z' || (dist === 't' && (df === undefined || !isFinite(df)))) return tbl.z;
+  if (dist === 't') {
+    // ascending 1/df, with the z row at 1/df = 0
+    const xs = [0, ...tbl.t.df.map((v) => 1 / v).reverse()];
+    const rows = [tbl.z, ...[...tbl.t.upper].reverse()];
+    return interpRows(1 / df!, xs, rows, Math.asinh).map(Math.sinh);
+  }
+  const dfs = tbl.chi2.df;
+  if (df! > dfs[dfs.length - 1]) {
+    // Wilson-Hilferty
+    const k = 2 / (9 * df!);
+    return tbl.z.map((z) => df! * (1 - k + z * Math.sqrt(k)) ** 3);
+  }
+  return interpRows(df!, dfs, tbl.chi2.upper);
+}
+
+function requireTables(): RawTables {
+  if (!tables) throw new Error('Critical tables not loaded. Call loadCriticalTables() first.');
+  return tables;
+}
+
+// Upper-tail critical value: P(X > value) = alpha.
+export function upperCritical(dist: Distribution, alpha: number, df?: number): number {
+  const tbl = requireTables();
+  const r = row(tbl, dist, df);
+  return interp(normalIsf(alpha), [...tbl.z].reverse(), [...r].reverse());
+}
+
+// Same tail_type convention as stats_code.py: 1=left, 2=right, 3=two-tailed
+// (returns the positive bound of ±crit); chi-square is always right-tailed, so
+// only upper quantiles are tabulated and a left tail is an error.
+export function criticalValue(dist: Distribution, alpha: number, tailType = 3, df?: number): number {
+  if (dist === 'chi2' && tailType === 1) {
+    throw new Error('Chi-square critical values are right-tailed only (tail type 2 or 3).');
+  }
+  if (dist === 'chi2' || tailType === 2) return upperCritical(dist, alpha, df);
+  if (tailType === 1) return -upperCritical(dist, alpha, df);
+  return upperCritical(dist, alpha / 2, df);
+}
+
+// P(X > stat), clipped to the tabulated alpha range at the extremes.
+export function tailProbability(dist: Distribution, stat: number, df?: number): number {
+  const tbl = requireTables();
+  const r = [...row(tbl, dist, df)].reverse();
+  const z = [...tbl.z].reverse();
+  if (dist === 'chi2') return normalSf(interp(stat, r, z));
+  const p = normalSf(interp(Math.abs(stat), r, z));
+  return stat < 0 ? 1 - p : p;
+}
+
+export function pValue(dist: Distribution, stat: number, tailType = 3, df?: number): number {
+  const upper = tailProbability(dist, stat, df);
+  if (dist === 'chi2' || tailType === 2) return upper;
+  if (tailType === 1) return 1 - upper;
+  return Math.min(1, 2 * tailProbability(dist, Math.abs(stat), df));
+}
+
+// Live critical value for a form; null until the tables are loaded or while
+// the inputs are out of range.
+export function useCriticalValue(
+  dist: Distribution,
+  alpha: number,
+  tailType = 3,
+  df?: number
+): number | null {
+  const [ready, setReady] = useState(criticalTablesReady());
+  useEffect(() => {
+    if (!ready) loadCriticalTables().then(() => setReady(true));
+  }, [ready]);
+  if (!ready || !(alpha > 0 && alpha < 1)) return null;
+  if (dist !== 'z' && !(df !== undefined && df > 0)) return null;
+  if (dist === 'chi2' && tailType === 1) return null;
+  return criticalValue(dist, alpha, tailType, df);
+}
@@ -1,15 +1,26 @@
 // src/pyodideLoader.ts
 let pyodide: any = null;
+let pyodidePromise: Promise<any> | null = null;
 
-export async function initPyodide() {
-  if (pyodide) return pyodide;
+// When set (e.g. VITE_STATS_API_URL=http://127.0.0.1:8765), tests are run by
+// analysis/stats_server.py instead of downloading Pyodide in the browser.
+const STATS_API_URL: string | undefined = import.meta.env.VITE_STATS_API_URL;
 
+// Safe to call from several components: the download starts once and every
+// caller awaits the same promise.
+export function initPyodide(): Promise<any> {
+  if (STATS_API_URL) return Promise.resolve(null);
+  if (!pyodidePromise) pyodidePromise = loadPyodideWithStats();
+  return pyodidePromise;
+}
+
+async function loadPyodideWithStats() {
   const w = window as any;
-  pyodide = await w.loadPyodide({
+  const py = await w.loadPyodide({
     indexURL: 'https://cdn.jsdelivr.net/pyodide/v0.23.4/full/',
   });
 
-  await pyodide.loadPackage(['numpy', 'scipy', 'matplotlib']);
+  await py.loadPackage(['numpy', 'scipy', 'matplotlib']);
 
 
   // caches
@@ -29,7 +40,8 @@ export async function initPyodide() {
   //bypass caching
   const resp = await fetch(`/stats_code.py?ts=${Date.now()}`, { cache: 'no-store' });
   const code = await resp.text();
-  await pyodide.runPythonAsync(code);
+  await py.runPythonAsync(code);
+  pyodide = py;
 
   try {
     const proxy = pyodide.runPython('list(TESTS.keys())');
@@ -47,7 +59,19 @@ export async function runTestFunction(
   fnName: string,
   args: Record<string, any>
 ) {
-  if (!pyodide) throw new Error('Pyodide not initialized. Call initPyodide() first.');
+  if (STATS_API_URL) {
+    const resp = await fetch(`${STATS_API_URL}/tests/${fnName}?mode=render`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify(args),
+    });
+    const payload = await resp.json();
+    if (!resp.ok) throw new Error(payload.error);
+    return payload.image;
+  }
+
+  // forms are usable while Pyodide loads; a submit waits for it here
+  await initPyodide();
 
   pyodide.globals.set('args_json', JSON.stringify(args));
   pyodide.globals.set('fnName', fnName);
@@ -61,3 +85,46 @@ res
 
   return pyodide.runPython(code);
 }
+
+// Per-stage timings recorded by _wrap_test_function (stats_code.py).
+export function getLastProfile(): Record<string, any> {
+  if (!pyodide) return {};
+  return JSON.parse(pyodide.runPython('import json; json.dumps(LAST_PROFILE)'));
+}
+
+export function getProfileSummary(): Record<string, any> {
+  if (!pyodide) return {};
+  return JSON.parse(pyodide.runPython('import json; json.dumps(profile_summary())'));
+}
+
+export function getProfileHistogram(stage = 'total', bins = 20): Record<string, any> {
+  if (!pyodide) return {};
+  pyodide.globals.set('hist_args_json', JSON.stringify({ stage, bins }));
+  return JSON.parse(
+    pyodide.runPython('import json; json.dumps(profile_histogram(**json.loads(hist_args_json)))')
+  );
+}
+
+// Intervals for every level in one call (confidence_intervals in stats_code.py).
+export async function getConfidenceIntervals(
+  fnName: string,
+  levels: number[],
+  args: Record<string, any>
+): Promise<Record<string, any>> {
+  if (STATS_API_URL) {
+    const resp = await fetch(`${STATS_API_URL}/tests/${fnName}?mode=compute`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ ...args, ci_levels: levels }),
+    });
+    const payload = await resp.json();
+    if (!resp.ok) throw new Error(payload.error);
+    return payload.confidence_intervals;
+  }
+
+  await initPyodide();
+  pyodide.globals.set('ci_args_json', JSON.stringify({ ...args, name: fnName, levels }));
+  return JSON.parse(
+    pyodide.runPython('import json; json.dumps(confidence_intervals(**json.loads(ci_args_json)))')
+  );
+}